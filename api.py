@@ -0,0 +1,220 @@
+# api.py
+# HTTP/JSON interface to the chat engine (engine.py), next to the Streamlit UI. The
+# service keeps nothing between requests: every turn loads its session from the
+# session store by token, runs, and writes it back before replying, so any worker of
+# any replica can serve any turn (point SESSION_STORE_URL at Redis for several hosts).
+#   WEB_CONCURRENCY=4 uvicorn api:app   # 4 workers
+#   LLM_BACKEND=fake uvicorn api:app   # local stand-in model (fake_llm.py), no key needed
+# Each worker has its own rate-limit scheduler (scheduler.py) and takes a 1/N share of
+# GROQ_RPM and GROQ_TPM, with N taken from WEB_CONCURRENCY (uvicorn's default for
+# --workers, so set the worker count there). With several replicas on one Groq account,
+# set GROQ_RPM and GROQ_TPM to each replica's share of the quota.
+#
+#   POST /sessions                          -> {"sid", "reply": screening intro, ...}
+#   GET  /sessions/{sid}                    -> state and the three transcripts
+#   POST /sessions/{sid}/{mode}             {"message": "...", "stream": false}
+#        mode: screening | mock | roadmap   -> {"reply", "local", "phase", "candidate_data", ...}
+#        with "stream": true the reply is NDJSON: {"part", "delta"} lines, then the
+#        final object with "done": true. A part is one block of the reply (a mock turn
+#        streams the verdict, the separator, the heading and the next question).
+#   POST /sessions/{sid}/mock/report        -> the graded mock interview (grading.py)
+# Every session view includes "usage": the session's LLM calls, tokens and cost
+# (tokens.py). A message too long for the mode's prompt limit gets a local reply.
+#   GET  /stats                             -> this worker's scheduler, routing and store stats
+#   GET  /metrics, /metrics.json            -> this worker's turn metrics (metrics.py)
+# A session's turns are meant to be sequential (each waits for the previous reply);
+# two concurrent turns on one session both run and the last one written wins.
+import json
+import os
+from collections import deque
+from dataclasses import asdict
+
+from dotenv import load_dotenv
+
+load_dotenv()  # before the imports below read LLM_BACKEND, GROQ_* and the store settings
+
+from starlette.applications import Starlette  # noqa: E402
+from starlette.concurrency import run_in_threadpool  # noqa: E402
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+import llm_client  # noqa: E402
+import metrics  # noqa: E402
+from engine import (HISTORY_MODES, SYSTEM_PROMPTS, Engine, SessionState, open_history, persist,  # noqa: E402
+                    record_screening, restore, session_meta)
+from prompt_builder import detect_phase  # noqa: E402
+from router import route_stats  # noqa: E402
+from session_store import encode_message, get_session_store  # noqa: E402
+
+WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+llm_client.split_quota(WORKERS)
+
+# URL name -> (engine mode, history key)
+MODES = {"screening": ("screening", "messages"), "mock": ("mock", "mock_messages"), "roadmap": ("role_insight", "role_messages")}
+HISTORY_NAMES = {history_key: name for name, (_, history_key) in MODES.items()}
+
+engine = Engine(api_key=os.getenv("GROQ_API_KEY"), spans=metrics.TurnSpan)
+
+
+def _error(status, message):
+    return JSONResponse({"error": message}, status_code=status)
+
+
+def _view(state):
+    return {
+        "sid": state.sid,
+        "mode": state.mode,
+        "phase": detect_phase(state.candidate_data, state.screening_closed),
+        "candidate_data": state.candidate_data,
+        "screening_closed": state.screening_closed,
+        "sentiment": state.sentiment.label,
+        "usage": state.usage.totals(),
+    }
+
+
+def load_session(sid):
+    # -> (state, stored history lengths), or None for an unknown token.
+    stored = get_session_store().load(sid)
+    if stored is None:
+        return None
+    state = SessionState(sid=sid)
+    restore(state, stored)
+    return state, {key: len(state[key]) for key in SYSTEM_PROMPTS}
+
+
+def save_session(state, persisted):
+    store = get_session_store()
+    persist(store, state, persisted)
+    store.save_meta(state.sid, session_meta(state))
+    store.flush()  # written before the reply: the next turn may land on another worker
+
+
+def start_turn(state, name, message):
+    mode, history_key = MODES[name]
+    state.mode = mode
+    open_history(state, history_key)
+    return engine.turn(state, mode, message)
+
+
+def play(state, persisted, turn):
+    # Runs a turn's parts in order, yielding each chunk, then commits and saves it. A
+    # client that disconnects mid-stream closes this generator and nothing is saved.
+    outputs = []
+    try:
+        for index, part in enumerate(turn.parts):
+            if not callable(part):
+                outputs.append(part)
+                yield {"part": index, "delta": part}
+                continue
+            text = []
+            with turn.span.stage("llm"):  # includes waiting on a slow client
+                value = part()
+                chunks = [value] if isinstance(value, str) else value
+                try:
+                    for chunk in chunks:
+                        text.append(chunk)
+                        yield {"part": index, "delta": chunk}
+                finally:
+                    if hasattr(chunks, "close"):
+                        chunks.close()
+            outputs.append("".join(text))
+        reply = turn.commit(outputs)
+    finally:
+        if state.mock_speculation is not None:
+            state.mock_speculation.discard()  # the state ends with this request
+    if turn.history_key == "messages" and not turn.local and state.screening_closed:
+        record_screening(state)
+    save_session(state, persisted)
+    yield {"done": True, "reply": reply, "local": turn.local, **_view(state)}
+
+
+def _ndjson(events):
+    for event in events:
+        yield json.dumps(event, ensure_ascii=False) + "\n"
+
+
+async def create_session(request):
+    state = SessionState()
+    reply = open_history(state, "messages")
+    await run_in_threadpool(save_session, state, {key: 0 for key in SYSTEM_PROMPTS})
+    return JSONResponse({"reply": reply, **_view(state)}, status_code=201)
+
+
+async def get_session(request):
+    loaded = await run_in_threadpool(load_session, request.path_params["sid"])
+    if loaded is None:
+        return _error(404, "Unknown session")
+    state, _ = loaded
+    histories = {
+        HISTORY_NAMES[key]: [dict(zip(("role", "content"), encode_message(msg))) for msg in state[key][1:]]
+        for key in HISTORY_MODES
+    }
+    return JSONResponse({**_view(state), "histories": histories})
+
+
+async def post_turn(request):
+    name = request.path_params["mode"]
+    if name not in MODES:
+        return _error(404, f"Unknown mode {name!r}; expected one of {', '.join(MODES)}")
+    try:
+        body = await request.json()
+    except ValueError:
+        return _error(400, "Body must be JSON")
+    message = body.get("message") if isinstance(body, dict) else None
+    if not isinstance(message, str) or not message.strip():
+        return _error(400, "'message' must be a non-empty string")
+    loaded = await run_in_threadpool(load_session, request.path_params["sid"])
+    if loaded is None:
+        return _error(404, "Unknown session")
+    state, persisted = loaded
+    metrics.registry.touch_session(state.sid)
+    turn = await run_in_threadpool(start_turn, state, name, message)
+    events = play(state, persisted, turn)
+    if body.get("stream"):
+        return StreamingResponse(_ndjson(events), media_type="application/x-ndjson")
+    final = await run_in_threadpool(lambda: deque(events, maxlen=1)[0])
+    del final["done"]
+    return JSONResponse(final)
+
+
+async def mock_report(request):
+    loaded = await run_in_threadpool(load_session, request.path_params["sid"])
+    if loaded is None:
+        return _error(404, "Unknown session")
+    state, persisted = loaded
+    report = await run_in_threadpool(engine.grade, state)
+    if report is None:
+        return _error(409, "Answer at least one mock question before asking for the report")
+    await run_in_threadpool(save_session, state, persisted)  # the grading calls' usage
+    report["grades"] = [asdict(g) for g in report["grades"]]
+    return JSONResponse(report)
+
+
+async def stats(request):
+    return JSONResponse({
+        "pid": os.getpid(),
+        "workers": WORKERS,
+        "scheduler": llm_client.scheduler.stats(),
+        "coalescing": llm_client.coalescer.stats(),
+        "routes": route_stats.snapshot(),
+        "session_store": get_session_store().stats(),
+    })
+
+
+async def prometheus(request):
+    return PlainTextResponse(metrics.prometheus_text(), media_type="text/plain; version=0.0.4")
+
+
+async def metrics_json(request):
+    return JSONResponse(metrics.snapshot())
+
+
+app = Starlette(routes=[
+    Route("/sessions", create_session, methods=["POST"]),
+    Route("/sessions/{sid}", get_session, methods=["GET"]),
+    Route("/sessions/{sid}/mock/report", mock_report, methods=["POST"]),
+    Route("/sessions/{sid}/{mode}", post_turn, methods=["POST"]),
+    Route("/stats", stats, methods=["GET"]),
+    Route("/metrics", prometheus, methods=["GET"]),
+    Route("/metrics.json", metrics_json, methods=["GET"]),
+])
@@ -1,35 +1,32 @@
 import streamlit as st
+import hmac
 import os
-import re
-from langchain_groq import ChatGroq
+import time
+import uuid
+from collections import deque
+from streamlit.errors import StreamlitAPIException
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
-from prompts import SYSTEM_PROMPT
 from dotenv import load_dotenv
-from textblob import TextBlob
-
-# --- PROMPTS ---
-MOCK_INTERVIEW_PROMPT = """
-You are "TalentCoach," a strict but helpful Technical Interviewer.
-1. Ask the candidate for their **Job Role** and **Tech Stack**.
-2. Once you have that, ask ONE relevant, challenging technical question.
-3. Wait for their answer.
-4. Provide brief feedback (Strong/Weak) and then ask the NEXT technical question immediately.
-Keep it strictly technical and professional.
-"""
-
-CAREER_GUIDE_PROMPT = """
-You are "CareerGuide," an expert Tech Career Counselor.
-1. The user will ask about a specific **Job Role** (e.g., "DevOps Engineer").
-2. You must provide:
-   - 📋 **Job Description**: A concise summary of what they do.
-   - 🛠️ **Required Tech Stack**: The essential tools/languages to learn.
-   - 🗺️ **Learning Path**: A step-by-step guide (Beginner -> Advanced).
-3. Be structured, encouraging, and highly detailed.
-"""
+load_dotenv() # <--- THIS LOADS YOUR LOCAL .ENV FILE (before the modules below read it)
+from llm_client import BACKEND, coalescer, connection_stats, scheduler
+from router import model_for, route_stats
+from history import HistoryCompactor
+from phase1 import Phase1Engine
+from sentiment import SentimentTracker
+from roadmap_cache import cache_key, get_roadmap_cache, normalize_role
+from mock_interview import speculation_stats
+from question_bank import get_question_bank
+from grading import grading_stats
+from candidates import RECENT, RELEVANCE, get_candidate_index
+from skills import RoleProfile, normalize_stack, profile_from_roadmap
+from session_store import get_session_store, new_token
+from tokens import SessionUsage, tokenizer_name
+import metrics
+from assets import capture_cards, greeting, sizes as asset_sizes, static_html, style_block, vibe_card
+from engine import (CAREER_GUIDE_PROMPT, HISTORY_MODES, SYSTEM_PROMPT, SYSTEM_PROMPTS, Engine, init_state, open_history,
+                    persist, record_screening, restore, session_meta)
 
 # 1. Setup & Config
-load_dotenv() # <--- THIS LOADS YOUR LOCAL .ENV FILE
-
 st.set_page_config(
     page_title="TalentScout AI", 
     page_icon="✨", 
@@ -45,326 +42,393 @@ try:
 except:
     api_key = os.getenv("GROQ_API_KEY")
 
-if not api_key:
+if not api_key and BACKEND == "groq":
     st.error("Groq API Key missing. Please check your .env file.")
     st.stop()
 
 # 2. THE GEMINI UI STYLING
-st.markdown("""
-    <style>
-    /* GLOBAL THEME */
-    .stApp {
-        background-color: #131314; 
-        color: #E3E3E3;
-    }
-    
-    /* SIDEBAR STYLING */
-    [data-testid="stSidebar"] {
-        background-color: #1E1F20 !important; 
-        border-right: 1px solid #333;
-    }
-
-    /* FIX: SAFER SIDEBAR SPACING */
-    section[data-testid="stSidebar"] .block-container {
-        padding-top: 1rem !important;
-        padding-bottom: 1rem !important;
-    }
-    
-    /* CHAT INPUT */
-    .stChatInputContainer {
-        padding-bottom: 20px;
-        background-color: transparent !important;
-    }
-    
-    .stChatInputContainer textarea {
-        background-color: #282A2C !important; 
-        color: white !important;
-        border: 1px solid #363739 !important;
-        border-radius: 40px !important; 
-        padding: 15px 25px !important;
-    }
-    
-    .stChatInputContainer textarea:focus {
-        border: 1px solid #555 !important;
-        box-shadow: none !important;
-    }
-
-    /* WELCOME SCREEN TYPOGRAPHY */
-    .welcome-text {
-        font-family: 'Google Sans', sans-serif;
-        background: -webkit-linear-gradient(45deg, #4285F4, #9B72CB);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        font-weight: bold;
-        font-size: 3.5rem;
-    }
-    
-    .sub-text {
-        color: #6d6e70;
-        font-size: 2rem;
-        font-weight: 500;
-    }
-
-    /* CHAT BUBBLES */
-    div[data-testid="stChatMessage"]:nth-child(even) div[data-testid="stChatMessageContent"] {
-        background-color: #282A2C !important;
-        border-radius: 20px;
-        color: #E3E3E3;
-    }
-
-    div[data-testid="stChatMessage"]:nth-child(odd) div[data-testid="stChatMessageContent"] {
-        background-color: transparent !important;
-        color: #E3E3E3;
-    }
-
-    /* --- BUTTON STYLING (BIGGER FOR MAIN SCREEN) --- */
-    .stButton button {
-        background-color: #282A2C !important; 
-        color: #E3E3E3 !important;
-        border: 1px solid #363739 !important;
-        border-radius: 15px !important;
-        padding: 15px 30px !important; 
-        font-size: 18px !important;    
-        font-weight: 600 !important;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }
-    
-    .stButton button:hover {
-        background-color: #4285F4 !important; 
-        color: white !important;
-        border-color: #4285F4 !important;
-        transform: translateY(-2px);
-    }
-
-    /* --- SIDEBAR/TOP BUTTON OVERRIDE (KEEP SMALL) --- */
-    [data-testid="stSidebar"] .stButton button, 
-    div[data-testid="stHorizontalBlock"] .stButton button {
-        padding: 8px 15px !important;
-        font-size: 14px !important;
-        border-radius: 10px !important;
-    }
-
-    /* METRIC CARDS IN SIDEBAR */
-    .info-box {
-        background-color: #282A2C;
-        padding: 12px 15px;
-        border-radius: 12px;
-        border-left: 4px solid #4285F4; 
-        margin-bottom: 10px;
-        transition: transform 0.2s;
-    }
-    .info-box:hover {
-        transform: translateX(5px);
-    }
-    .info-label { 
-        font-size: 11px; 
-        text-transform: uppercase; 
-        color: #888; 
-        margin-bottom: 4px; 
-        font-weight: 600;
-        letter-spacing: 0.5px;
-    }
-    .info-value { 
-        font-size: 14px; 
-        font-weight: 500; 
-        color: #fff; 
-        white-space: nowrap;
-        overflow: hidden;
-        text-overflow: ellipsis;
-    }
-
-    /* --- REVIEW CARD HOVER EFFECTS --- */
-    .review-card {
-        background-color: #1E1F20;
-        padding: 25px;
-        border-radius: 16px;
-        border: 1px solid #333;
-        flex: 1;
-        min-width: 280px;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        transition: all 0.3s ease;
-    }
-    
-    .review-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 10px 20px rgba(0,0,0,0.4);
-        border-color: #4285F4;
-    }
-
-    /* PULSING DOT ANIMATION */
-    @keyframes pulse {
-        0% { opacity: 1; }
-        50% { opacity: 0.4; }
-        100% { opacity: 1; }
-    }
-    .live-dot {
-        height: 8px;
-        width: 8px;
-        background-color: #4ade80; /* Green */
-        border-radius: 50%;
-        display: inline-block;
-        margin-right: 6px;
-        animation: pulse 2s infinite;
-    }
-    
-    /* Custom Headers */
-    .mode-header {
-        font-family: 'Google Sans', sans-serif;
-        font-size: 28px;
-        font-weight: bold;
-        background: -webkit-linear-gradient(45deg, #4ade80, #3b82f6);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom: 20px;
-        text-align: center;
-    }
-    .mock-header {
-        font-family: 'Google Sans', sans-serif;
-        font-size: 28px;
-        font-weight: bold;
-        background: -webkit-linear-gradient(45deg, #4ade80, #3b82f6);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom: 20px;
-        text-align: center;
-    }
-
-    /* --- HEADER VISIBILITY FIX --- */
-    header[data-testid="stHeader"] {
-        background-color: transparent !important;
-    }
-    
-    footer {visibility: hidden;}
-    </style>
-""", unsafe_allow_html=True)
-
-# 3. Logic: Context-Aware Data Extraction (FIXED)
-def extract_info(user_text):
-    # Regex checks (Higher priority, independent of context)
-    email_match = re.search(r'[\w\.-]+@[\w\.-]+', user_text)
-    phone_match = re.search(r'\b\d{10}\b', user_text)
-    
-    # Update Email only if it's currently pending
-    if email_match and st.session_state.candidate_data['Email'] == "Pending...":
-        st.session_state.candidate_data['Email'] = email_match.group(0)
-        
-    # Update Phone only if it's currently pending
-    if phone_match and st.session_state.candidate_data['Phone'] == "Pending...":
-        st.session_state.candidate_data['Phone'] = phone_match.group(0)
-    
-    # Context-based checks (Dependent on what the AI just asked)
-    if len(st.session_state.messages) >= 1:
-        last_msg = st.session_state.messages[-1]
-        if isinstance(last_msg, AIMessage):
-            last_ai_msg = last_msg.content.lower()
-            
-            # Update Name only if pending
-            if "name" in last_ai_msg and len(user_text) < 50 and st.session_state.candidate_data['Name'] == "Pending...":
-                 st.session_state.candidate_data['Name'] = user_text.strip()
-            
-            # Update Role only if pending
-            if any(x in last_ai_msg for x in ["role", "position", "job", "applying"]) and len(user_text) < 100 and st.session_state.candidate_data['Role'] == "Pending...":
-                 st.session_state.candidate_data['Role'] = user_text.strip()
-            
-            # Update Stack only if pending
-            if any(x in last_ai_msg for x in ["stack", "technologies", "language", "tools"]) and len(user_text) < 150 and st.session_state.candidate_data['Stack'] == "Pending...":
-                 st.session_state.candidate_data['Stack'] = user_text.strip()
-
-# --- UPGRADED SENTIMENT ENGINE ---
-def get_sentiment(text):
-    text_lower = text.lower()
-    nervous_triggers = ["maybe", "i think", "not sure", "i guess", "probably", "um", "uh", "sort of", "little bit", "struggle", "confused"]
-    confident_triggers = ["expert", "led", "built", "deployed", "highly proficient", "mastered", "definitely", "absolutely", "specialist", "managed", "created"]
+# Minified once per process from assets/styles.css (see assets.py)
+st.markdown(style_block(), unsafe_allow_html=True)
+
+# 3. Logic: the turn pipeline lives in engine.py; this file only renders it.
+# Clients are pooled per model, shared across reruns & sessions. Every turn is timed
+# stage by stage (metrics.py); METRICS_PORT serves the Prometheus endpoint.
+engine = Engine(api_key=api_key, spans=metrics.TurnSpan)
+metrics.serve()
+
+# --- STREAMING RESPONSES ---
+def token_stream(stream):
+    # Yields text chunks as they arrive. Time to first token is recorded per LLM call
+    # by llm_client (metrics.py llm_ttft_seconds, shown in the admin panel).
+    try:
+        yield from stream
+    finally:
+        # A newer chat_input submission interrupts the script mid-stream; detach from
+        # the shared stream right away (it is cancelled once nobody is reading it).
+        if hasattr(stream, "close"):
+            stream.close()
+
+def play_turn(turn, avatar, user_avatar):
+    # Shows a turn's parts as they stream, then commits it. The user message and the
+    # reply are committed together once the stream completes, so a turn cancelled by
+    # a rerun never leaves a dangling HumanMessage in the history.
+    if turn.local:
+        return turn.commit(turn.parts)  # shown by the rerun that follows
+    turn_id = uuid.uuid4().hex
+    st.session_state.active_turn = turn_id
+
+    with st.chat_message("user", avatar=user_avatar):
+        st.write(turn.user_input)
+    with st.chat_message("assistant", avatar=avatar):
+        outputs = []
+        for part in turn.parts:
+            if not callable(part):
+                st.markdown(part)
+                outputs.append(part)
+                continue
+            with turn.span.stage("llm"):
+                value = part()
+                if isinstance(value, str):
+                    st.markdown(value)
+                    outputs.append(value)
+                else:
+                    outputs.append(st.write_stream(token_stream(value)))
+
+    if st.session_state.get("active_turn") != turn_id:
+        return None
+    reply = turn.commit(outputs)
+    st.session_state.active_turn = None
+    return reply
+
+# --- TRANSCRIPT RENDERING ---
+# Each chat pane and the sidebar capture panel is a fragment, so a chat turn only
+# reruns the pane it happened in. Only the newest PAGE_SIZE messages are rendered;
+# older ones sit behind a "show earlier" button, which keeps the cost of a turn flat
+# as the transcript grows.
+PAGE_SIZE = 12
+RENDER_SAMPLES = 50
+
+def record_render(scope, seconds):
+    samples = st.session_state.render_times.setdefault(scope, deque(maxlen=RENDER_SAMPLES))
+    samples.append(seconds)
+    metrics.registry.observe("render_seconds", seconds, {"scope": scope})
+
+def render_stats():
+    out = {}
+    for scope, samples in st.session_state.render_times.items():
+        ordered = sorted(samples)
+        out[scope] = {
+            "renders": len(ordered),
+            "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+        }
+    return out
+
+def show_earlier(history_key):
+    st.session_state.visible_messages[history_key] += PAGE_SIZE
+
+def render_history(history_key, avatar, user_avatar):
+    persist_session((history_key,))  # chat fragments rerun without the script top
+    start = time.perf_counter()
+    history = st.session_state[history_key]
+    window = st.session_state.visible_messages[history_key]
+    hidden = max(0, len(history) - 1 - window)  # history[0] is the system prompt
+    if hidden:
+        st.button(f"⬆️ Show earlier messages ({hidden})", key=f"earlier_{history_key}",
+                  on_click=show_earlier, args=(history_key,))
+    for msg in history[1 + hidden:]:
+        if isinstance(msg, AIMessage):
+            with st.chat_message("assistant", avatar=avatar):
+                st.write(msg.content)
+        elif isinstance(msg, HumanMessage):
+            with st.chat_message("user", avatar=user_avatar):
+                st.write(msg.content)
+    record_render(history_key, time.perf_counter() - start)
+
+def capture_signature():
+    # What the sidebar capture panel shows: the captured fields and the vibe card. The
+    # per-message sentiment chart is left out (every screening message adds a point),
+    # so it catches up on the next full-app rerun rather than forcing one per turn.
+    return tuple(st.session_state.candidate_data.values()), st.session_state.sentiment.label
+
+def rerun_chat(signature_before):
+    # A turn that changed what the sidebar shows needs a full-app rerun; otherwise
+    # only the chat fragment reruns.
+    if capture_signature() == signature_before:
+        try:
+            st.rerun(scope="fragment")
+        except StreamlitAPIException:
+            pass  # the fragment is running as part of a full-app rerun
+    st.rerun()
+
+@st.fragment
+def capture_panel():
+    start = time.perf_counter()
+    st.markdown("""
+        <div style="display: flex; align-items: center; margin-bottom: 10px; color: #888; font-size: 12px; font-weight: 600; letter-spacing: 1px;">
+            <span class="live-dot"></span> LIVE DATA CAPTURE
+        </div>
+    """, unsafe_allow_html=True)
     
-    if any(word in text_lower for word in nervous_triggers): return "Nervous 😟"
-    if any(word in text_lower for word in confident_triggers): return "Confident 🚀"
+    st.markdown(capture_cards(st.session_state.candidate_data), unsafe_allow_html=True)
 
-    blob = TextBlob(text)
-    if blob.sentiment.polarity > 0.15: return "Confident 🚀"
-    elif blob.sentiment.polarity < 0.0: return "Nervous 😟"
-    return "Neutral 😐"
-
-# Initialize LLM with the API key from Secrets/Env
-llm = ChatGroq(temperature=0.5, model_name="llama-3.3-70b-versatile", groq_api_key=api_key)
+    st.markdown("<br>", unsafe_allow_html=True)
 
-# Initialize Session States
-if "mode" not in st.session_state: st.session_state.mode = "screening"
+    st.markdown("""
+        <div style="margin-bottom: 10px; color: #888; font-size: 12px; font-weight: 600; letter-spacing: 1px;">
+            🤖 AI ANALYSIS
+        </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown(vibe_card(st.session_state.sentiment.label), unsafe_allow_html=True)
+    if len(st.session_state.sentiment.scores) > 1:
+        # Per-message score in [-1, 1]; the card above shows the smoothed trend
+        st.line_chart(list(st.session_state.sentiment.scores), height=80)
+    record_render("capture_panel", time.perf_counter() - start)
+
+# --- CHAT PANES ---
+@st.fragment
+def screening_chat():
+    render_history("messages", "✨", "👤")
+    with st.bottom:
+        user_input = st.chat_input("Message TalentScout...")
+    if user_input:
+        before = capture_signature()
+        turn = engine.screening_turn(st.session_state, user_input)
+        reply = play_turn(turn, "✨", "👤")
+        if reply is not None and not turn.local and st.session_state.screening_closed:
+            record_screening(st.session_state)
+        rerun_chat(before)
+
+@st.fragment
+def mock_chat():
+    render_history("mock_messages", "🎓", "👨‍💻")
+    # Start on the next question while the candidate reads this one and types
+    engine.prefetch(st.session_state)
+    with st.bottom:
+        user_input = st.chat_input("Enter your answer...")
+    if user_input:
+        before = capture_signature()
+        play_turn(engine.mock_turn(st.session_state, user_input), "🎓", "👨‍💻")
+        rerun_chat(before)
+
+@st.fragment
+def role_chat():
+    render_history("role_messages", "🧭", "👤")
+    with st.bottom:
+        user_input = st.chat_input("Enter a Job Role (e.g. Data Scientist)...")
+    if user_input:
+        before = capture_signature()
+        play_turn(engine.role_turn(st.session_state, user_input), "🧭", "👤")
+        rerun_chat(before)
+
+def end_interview():
+    # Grades every answer at once (see grading.py); kept until the transcript grows.
+    history = st.session_state.mock_messages
+    with st.spinner("Grading your answers..."):
+        report = engine.grade(st.session_state)
+    st.session_state.mock_report = (len(history), report)
+
+def interview_report():
+    length, report = st.session_state.mock_report or (None, None)
+    if length != len(st.session_state.mock_messages):
+        return
+    if report is None:
+        st.info("Answer at least one question before ending the interview.")
+        return
+    overall = f"{report['overall']}/10" if report["overall"] is not None else "—"
+    st.markdown(f"#### 🏁 Interview report · {overall}")
+    st.caption(f"{report['graded']} answers graded in {report['elapsed_s']} s"
+               + (f" · {report['failed']} couldn't be graded" if report["failed"] else ""))
+    st.dataframe(
+        [{"topic": t["topic"], "score": t["score"], "questions": t["questions"],
+          "strengths": "; ".join(t["strengths"]), "weaknesses": "; ".join(t["weaknesses"])} for t in report["topics"]],
+        use_container_width=True, hide_index=True,
+    )
+    with st.expander("Answer by answer"):
+        for i, g in enumerate(report["grades"], 1):
+            grade = f"{g.verdict or ''} {g.score:g}/10" if g.score is not None else "not graded"
+            st.markdown(f"**{i}. [{g.topic}] {grade}** — {g.question}")
+            if g.weaknesses:
+                st.caption("Missed: " + "; ".join(g.weaknesses))
+
+# --- SESSION PERSISTENCE ---
+# Every session has a token in the URL (?sid=...). Histories and candidate data are
+# written behind to the session store, so reopening the link on any replica, or
+# after a restart, picks the session up where it left off.
+def start_session(sid):
+    st.session_state.sid = sid
+    st.session_state.persisted = {key: 0 for key in SYSTEM_PROMPTS}
+    st.session_state.persisted_meta = None
+    st.query_params["sid"] = sid
+
+def resume_session(sid):
+    stored = get_session_store().load(sid)
+    if stored is None:
+        return False
+    start_session(sid)
+    restore(st.session_state, stored)
+    st.session_state.persisted = {key: len(st.session_state[key]) for key in SYSTEM_PROMPTS}
+    st.session_state.persisted_meta = stored.meta
+    return True
+
+def persist_session(history_keys=tuple(SYSTEM_PROMPTS)):
+    # Queues whatever changed since the last call; the store batches the writes.
+    store = get_session_store()
+    persist(store, st.session_state, st.session_state.persisted, history_keys)
+    meta = session_meta(st.session_state)
+    if meta != st.session_state.persisted_meta:
+        store.save_meta(st.session_state.sid, meta)
+        st.session_state.persisted_meta = meta
+
+# --- STAFF ACCESS ---
+# The recruiter dashboard (?recruiter=1) and the admin panel (?admin=1) hold every
+# candidate's contact details and transcript, so each is unlocked with its own
+# password: RECRUITER_PASSWORD / ADMIN_PASSWORD, from Streamlit Secrets or the env.
+# A view whose password isn't configured stays closed.
+def config_value(name):
+    try:
+        return st.secrets[name]
+    except Exception:
+        return os.getenv(name)
+
+def staff_unlocked(view):
+    secret = config_value(f"{view.upper()}_PASSWORD")
+    if not secret or st.query_params.get(view) != "1":
+        return False
+    if st.session_state.get(f"{view}_unlocked"):
+        return True
+    entered = st.text_input(f"{view.title()} password", type="password", key=f"{view}_password")
+    if entered and hmac.compare_digest(entered.encode(), str(secret).encode()):
+        st.session_state[f"{view}_unlocked"] = True
+        return True
+    if entered:
+        st.error("Wrong password.")
+    return False
+
+if "sid" not in st.session_state:
+    sid = st.query_params.get("sid")
+    if not (sid and resume_session(sid)):
+        start_session(new_token())
+
+@st.fragment
+def recruiter_search():
+    index = get_candidate_index()
+    query = st.text_input("Search candidates", placeholder="Kubernetes AND Go, 3+ years")
+    order = RELEVANCE if st.toggle("Sort by relevance") else RECENT
+    start = time.perf_counter()
+    try:
+        results = index.search(query, order=order)
+    except ValueError as exc:
+        st.warning(str(exc))
+        return
+    elapsed = time.perf_counter() - start
+    st.caption(f"{len(results)} shown of {index.count()} candidates · {elapsed * 1000:.1f} ms")
+    st.dataframe(results, use_container_width=True, hide_index=True)
+
+    st.markdown("#### Rank by role fit")
+    target = st.text_input("Role or required skills", placeholder="DevOps Engineer  —or—  Go, Kubernetes, Terraform")
+    if not target:
+        return
+    # A role with a cached CareerGuide roadmap uses that roadmap's tech stack;
+    # anything else is read as a list of required skills.
+    role = normalize_role(target)
+    roadmap = get_roadmap_cache().get(cache_key(role, CAREER_GUIDE_PROMPT, model_for("role_insight", "roadmap"))) if role else None
+    profile = profile_from_roadmap(roadmap) if roadmap else RoleProfile(required=tuple(normalize_stack(target)))
+    start = time.perf_counter()
+    ranked = index.match_role(profile)
+    elapsed = time.perf_counter() - start
+    source = f"the cached {role} roadmap" if roadmap else "the skills above"
+    st.caption(f"Required: {', '.join(profile.required) or '—'} (from {source}) · {elapsed * 1000:.1f} ms")
+    st.dataframe(ranked, use_container_width=True, hide_index=True)
+
+# Initialize Session States (the chat pipeline's in engine.py, plus the UI's own)
+init_state(st.session_state)
 if "show_home" not in st.session_state: st.session_state.show_home = True
-if "messages" not in st.session_state: st.session_state.messages = [SystemMessage(content=SYSTEM_PROMPT)]
-if "mock_messages" not in st.session_state: st.session_state.mock_messages = [SystemMessage(content=MOCK_INTERVIEW_PROMPT)]
-if "role_messages" not in st.session_state: st.session_state.role_messages = [SystemMessage(content=CAREER_GUIDE_PROMPT)]
-if "sentiment" not in st.session_state: st.session_state.sentiment = "Neutral 😐"
-if "candidate_data" not in st.session_state:
-    st.session_state.candidate_data = {
-        "Name": "Pending...", "Email": "Pending...", "Phone": "Pending...", "Role": "Pending...", "Stack": "Pending..."
-    }
+if "mock_report" not in st.session_state: st.session_state.mock_report = None
+if "active_turn" not in st.session_state: st.session_state.active_turn = None
+if "visible_messages" not in st.session_state:
+    st.session_state.visible_messages = {key: PAGE_SIZE for key in HISTORY_MODES}
+if "render_times" not in st.session_state: st.session_state.render_times = {}
+metrics.registry.touch_session(st.session_state.sid)
+persist_session()
 
 # ==========================================
 # 4. SIDEBAR (ALWAYS RENDER FIRST)
 # ==========================================
 with st.sidebar:
-    st.markdown("""
-        <div style="display: flex; align-items: center; gap: 12px; margin-bottom: 25px; margin-top: 10px;">
-            <div style="background: linear-gradient(135deg, #4285F4, #9B72CB); padding: 8px; border-radius: 10px;">
-                <svg width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="white" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                    <rect x="2" y="7" width="20" height="14" rx="2" ry="2"></rect>
-                    <path d="M16 21V5a2 2 0 0 0-2-2h-4a2 2 0 0 0-2 2v16"></path>
-                </svg>
-            </div>
-            <div>
-                <h1 style="margin: 0; font-size: 22px; font-weight: 700; color: white; line-height: 1.0;">TalentScout</h1>
-                <p style="margin: 0; margin-top: -4px; font-size: 11px; color: #888; letter-spacing: 1px;">AI RECRUITER</p>
-            </div>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(static_html("sidebar_brand.html"), unsafe_allow_html=True)
     
     if st.button("➕ Start New Session", use_container_width=True):
         st.session_state.mode = "screening"
         st.session_state.show_home = True
         st.session_state.messages = [SystemMessage(content=SYSTEM_PROMPT)]
         st.session_state.candidate_data = {k: "Pending..." for k in st.session_state.candidate_data}
-        st.session_state.sentiment = "Neutral 😐"
+        st.session_state.sentiment = SentimentTracker()
+        st.session_state.screening_closed = False
+        st.session_state.phase1 = Phase1Engine()
+        st.session_state.question_plan = None
+        st.session_state.usage = SessionUsage()
+        st.session_state.compactors["screening"] = HistoryCompactor("screening")
+        st.session_state.visible_messages["messages"] = PAGE_SIZE
+        start_session(new_token())
         st.rerun() 
     
     if st.button("🎓 Mock Interview", use_container_width=True):
         st.session_state.mode = "mock"
         st.session_state.show_home = False 
-        if len(st.session_state.mock_messages) == 1:
-            # EXPLANATORY INTRO FOR MOCK INTERVIEW
-            st.session_state.mock_messages.append(AIMessage(content="**Welcome to the Technical Interview Simulator!** ⚔️\n\nIn this mode, I will act as a strict technical coach. I'll ask you challenging questions specific to your stack to test your knowledge.\n\nTo begin, please tell me the **Job Role** you are targeting and your **Tech Stack**."))
+        open_history(st.session_state, "mock_messages")  # EXPLANATORY INTRO FOR MOCK INTERVIEW
         st.rerun()
 
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    st.markdown("""
-        <div style="display: flex; align-items: center; margin-bottom: 10px; color: #888; font-size: 12px; font-weight: 600; letter-spacing: 1px;">
-            <span class="live-dot"></span> LIVE DATA CAPTURE
-        </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown(f"""
-        <div class="info-box"><div class="info-label">CANDIDATE NAME</div><div class="info-value">{st.session_state.candidate_data['Name']}</div></div>
-        <div class="info-box"><div class="info-label">EMAIL ADDRESS</div><div class="info-value">{st.session_state.candidate_data['Email']}</div></div>
-        <div class="info-box"><div class="info-label">PHONE NUMBER</div><div class="info-value">{st.session_state.candidate_data['Phone']}</div></div>
-        <div class="info-box"><div class="info-label">TARGET ROLE</div><div class="info-value">{st.session_state.candidate_data['Role']}</div></div>
-        <div class="info-box"><div class="info-label">TECH STACK</div><div class="info-value">{st.session_state.candidate_data['Stack']}</div></div>
-    """, unsafe_allow_html=True)
+    # --- RECRUITER DASHBOARD (open the app with ?recruiter=1, see STAFF ACCESS) ---
+    if staff_unlocked("recruiter"):
+        if st.button("🔎 Recruiter Dashboard", use_container_width=True):
+            st.session_state.mode = "recruiter"
+            st.session_state.show_home = False
+            st.rerun()
 
     st.markdown("<br>", unsafe_allow_html=True)
-
-    st.markdown("""
-        <div style="margin-bottom: 10px; color: #888; font-size: 12px; font-weight: 600; letter-spacing: 1px;">
-            🤖 AI ANALYSIS
-        </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown(f"""
-        <div style="background: linear-gradient(135deg, rgba(66, 133, 244, 0.1), rgba(155, 114, 203, 0.1)); border: 1px solid rgba(66, 133, 244, 0.2); border-radius: 12px; padding: 15px; text-align: center;">
-            <div style="font-size: 11px; color: #aaa; text-transform: uppercase; margin-bottom: 5px;">Candidate Vibe</div>
-            <div style="font-size: 18px; font-weight: 700; color: #fff;">{st.session_state.sentiment}</div>
-        </div>
-    """, unsafe_allow_html=True)
+    capture_panel()
+
+    # --- ADMIN PANEL (open the app with ?admin=1, see STAFF ACCESS) ---
+    if staff_unlocked("admin"):
+        st.markdown("<br>", unsafe_allow_html=True)
+        with st.expander("🛠️ Admin"):
+            st.caption("Groq connection pool")
+            st.json(connection_stats())
+            st.caption("Sentiment timeline (this session)")
+            st.json(st.session_state.sentiment.summary())
+            st.caption("Phase 1 engine (this session)")
+            st.json(st.session_state.phase1.stats())
+            st.caption(f"Token usage (this session, {tokenizer_name()} tokenizer)")
+            st.json(st.session_state.usage.totals())
+            st.caption("Turn metrics (this process)")
+            st.json(metrics.snapshot(), expanded=False)
+            st.download_button("Prometheus metrics", metrics.prometheus_text(), file_name="metrics.txt")
+            st.caption("Model routing")
+            st.json(route_stats.snapshot())
+            st.caption("Question bank")
+            st.json(get_question_bank().stats())
+            st.caption("Mock interview grading")
+            st.json(grading_stats())
+            st.caption("Mock question speculation")
+            st.json(speculation_stats.snapshot())
+            st.caption("Groq scheduler")
+            st.json(scheduler.stats())
+            st.caption("Request coalescing")
+            st.json(coalescer.stats())
+            st.caption("Session store")
+            st.json(get_session_store().stats())
+            st.caption("Candidate index")
+            st.json(get_candidate_index().stats())
+            st.caption("Roadmap cache")
+            st.json(get_roadmap_cache().stats())
+            st.caption("Render time per rerun (this session)")
+            st.json(render_stats())
+            st.caption("Static assets: (raw, minified) bytes")
+            st.json({name: [raw, minified] for name, raw, minified in asset_sizes()})
+            st.caption("History compaction (this session)")
+            st.json([c.stats() for c in st.session_state.compactors.values()])
 
 # ==========================================
 # 5. MAIN CONTENT
@@ -381,12 +445,7 @@ if st.session_state.mode == "screening":
              first_name = current_name.split()[0]
              greeting_text = f"Hey, {first_name} :)"
 
-        st.markdown(f"""
-            <div style='text-align: left; padding-left: 10%; margin-top: 20px;'>
-                <span class='welcome-text'>{greeting_text}</span><br>
-                <span class='sub-text' style='color: #444746;'>Ready to validate your technical skills?</span>
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(greeting(greeting_text), unsafe_allow_html=True)
         st.markdown("<br><br>", unsafe_allow_html=True)
 
         col1, col2, col3 = st.columns(3, gap="medium")
@@ -394,10 +453,7 @@ if st.session_state.mode == "screening":
         with col1: 
             if st.button("🚀 Start Screening", use_container_width=True):
                 st.session_state.show_home = False 
-                if len(st.session_state.messages) == 1:
-                    # EXPLANATORY INTRO FOR SCREENING
-                    greeting = "**Welcome to Screening Mode!** 🕵️\n\nIn this mode, I will act as a recruiter to gather your details and validate your background.\n\nTo get started, could you please provide your **Full Name**?"
-                    st.session_state.messages.append(AIMessage(content=greeting))
+                open_history(st.session_state, "messages")  # EXPLANATORY INTRO FOR SCREENING
                 st.rerun()
 
         with col2: 
@@ -410,54 +466,11 @@ if st.session_state.mode == "screening":
             if st.button("ℹ️ Curate Roadmap", use_container_width=True):
                 st.session_state.mode = "role_insight"
                 st.session_state.show_home = False
-                if len(st.session_state.role_messages) == 1:
-                    # EXPLANATORY INTRO FOR ROADMAP
-                    st.session_state.role_messages.append(AIMessage(content="**Welcome to Career Roadmap Mode!** 🗺️\n\nIn this mode, I will help you define a clear learning path. Tell me the **Job Role** you are interested in (e.g., 'Full Stack Developer'), and I will generate a Job Description, Tech Stack, and Learning Path for you."))
+                open_history(st.session_state, "role_messages")  # EXPLANATORY INTRO FOR ROADMAP
                 st.rerun()
         
         # --- SOCIAL PROOF SECTION ---
-        st.markdown("""
-<hr style="border-color: #333; margin-top: 60px; margin-bottom: 40px; opacity: 0.3;">
-<div style="text-align: center; margin-bottom: 40px;">
-    <h3 style="color: #E3E3E3; font-family: 'Google Sans', sans-serif; font-weight: 500; margin-bottom: 8px; text-decoration: underline; text-decoration-thickness: 1px; text-underline-offset: 4px;">Trusted by millions across the globe in their job search and prep 🌍</h3>
-    <p style="color: #888; font-size: 14px; margin: 0;">Join the community acing their technical interviews.</p>
-</div>
-<div style="display: flex; flex-wrap: wrap; gap: 20px; justify-content: center;">
-    <div class="review-card">
-        <div style="color: #FFD700; font-size: 18px; margin-bottom: 12px;">★★★★★</div>
-        <p style="color: #CCCCCC; font-size: 14px; line-height: 1.6; font-style: italic; margin-bottom: 20px;">"The mock interview mode is brutal but necessary. It actually prepared me for the curveball questions I got at Amazon."</p>
-        <div style="display: flex; align-items: center; gap: 12px;">
-            <div style="width: 35px; height: 35px; background: linear-gradient(135deg, #4285F4, #2b5cbf); border-radius: 50%; display: flex; align-items: center; justify-content: center; font-weight: bold; color: white;">A</div>
-            <div>
-                <div style="color: #FFF; font-size: 13px; font-weight: 600;">Harsh Thakur</div>
-                <div style="color: #777; font-size: 11px;">Backend Dev</div>
-            </div>
-        </div>
-    </div>
-    <div class="review-card">
-        <div style="color: #FFD700; font-size: 18px; margin-bottom: 12px;">★★★★★</div>
-        <p style="color: #CCCCCC; font-size: 14px; line-height: 1.6; font-style: italic; margin-bottom: 20px;">"I love the career path feature. It gave me a clear roadmap for moving from Junior to Senior Data Scientist."</p>
-        <div style="display: flex; align-items: center; gap: 12px;">
-            <div style="width: 35px; height: 35px; background: linear-gradient(135deg, #9B72CB, #6a4c9c); border-radius: 50%; display: flex; align-items: center; justify-content: center; font-weight: bold; color: white;">P</div>
-            <div>
-                <div style="color: #FFF; font-size: 13px; font-weight: 600;">Priya S.</div>
-                <div style="color: #777; font-size: 11px;">Data Scientist</div>
-            </div>
-        </div>
-    </div>
-    <div class="review-card">
-        <div style="color: #FFD700; font-size: 18px; margin-bottom: 12px;">★★★★★</div>
-        <p style="color: #CCCCCC; font-size: 14px; line-height: 1.6; font-style: italic; margin-bottom: 20px;">"Finally, a recruiter bot that doesn't feel robotic. The vibe analysis helped me realize I sounded too nervous."</p>
-        <div style="display: flex; align-items: center; gap: 12px;">
-            <div style="width: 35px; height: 35px; background: linear-gradient(135deg, #4ade80, #2b9e58); border-radius: 50%; display: flex; align-items: center; justify-content: center; font-weight: bold; color: white;">M</div>
-            <div>
-                <div style="color: #FFF; font-size: 13px; font-weight: 600;">Sargun Madan</div>
-                <div style="color: #777; font-size: 11px;">Full Stack</div>
-            </div>
-        </div>
-    </div>
-</div>
-""", unsafe_allow_html=True)
+        st.markdown(static_html("home.html"), unsafe_allow_html=True)
 
     else:
         top_c1, top_c2 = st.columns([6, 1])
@@ -465,47 +478,22 @@ if st.session_state.mode == "screening":
             if st.button("🏠 Home", use_container_width=True):
                 st.session_state.show_home = True
                 st.rerun()
-        
-        for msg in st.session_state.messages:
-            if isinstance(msg, AIMessage):
-                with st.chat_message("assistant", avatar="✨"):
-                    st.write(msg.content)
-            elif isinstance(msg, HumanMessage):
-                with st.chat_message("user", avatar="👤"):
-                    st.write(msg.content)
-
-        if user_input := st.chat_input("Message TalentScout..."):
-            extract_info(user_input)
-            st.session_state.sentiment = get_sentiment(user_input)
-            st.session_state.messages.append(HumanMessage(content=user_input))
-            
-            with st.spinner("Analyzing..."):
-                response = llm.invoke(st.session_state.messages)
-                st.session_state.messages.append(AIMessage(content=response.content))
-            st.rerun()
+
+        screening_chat()
 
 elif st.session_state.mode == "mock":
     st.markdown("<div class='mock-header'>🎓 Technical Interview Simulator</div>", unsafe_allow_html=True)
     
-    if st.button("🏠 Back to Home"):
+    home, end = st.columns(2)
+    if home.button("🏠 Back to Home"):
         st.session_state.mode = "screening"
         st.session_state.show_home = True
         st.rerun()
+    if end.button("🏁 End Interview"):
+        end_interview()
+    interview_report()
 
-    for msg in st.session_state.mock_messages:
-        if isinstance(msg, AIMessage):
-            with st.chat_message("assistant", avatar="🎓"): 
-                st.write(msg.content)
-        elif isinstance(msg, HumanMessage):
-            with st.chat_message("user", avatar="👨‍💻"): 
-                st.write(msg.content)
-
-    if user_input := st.chat_input("Enter your answer..."):
-        st.session_state.mock_messages.append(HumanMessage(content=user_input))
-        with st.spinner("Coach is analyzing..."):
-            response = llm.invoke(st.session_state.mock_messages)
-            st.session_state.mock_messages.append(AIMessage(content=response.content))
-        st.rerun()
+    mock_chat()
 
 elif st.session_state.mode == "role_insight":
     st.markdown("<div class='mode-header'>🗺️ Career Path & Role Insights</div>", unsafe_allow_html=True)
@@ -515,18 +503,7 @@ elif st.session_state.mode == "role_insight":
         st.session_state.show_home = True
         st.rerun()
 
-    for msg in st.session_state.role_messages:
-        if isinstance(msg, AIMessage):
-            with st.chat_message("assistant", avatar="🧭"): st.write(msg.content)
-        elif isinstance(msg, HumanMessage):
-            with st.chat_message("user", avatar="👤"): st.write(msg.content)
-            
-    if user_input := st.chat_input("Enter a Job Role (e.g. Data Scientist)..."):
-        st.session_state.role_messages.append(HumanMessage(content=user_input))
-        with st.spinner("Generating Career Roadmap..."):
-            response = llm.invoke(st.session_state.role_messages)
-            st.session_state.role_messages.append(AIMessage(content=response.content))
-        st.rerun()
+    role_chat()
 
 elif st.session_state.mode == "profile":
     st.markdown("<div class='mode-header'>📝 Update Candidate Profile</div>", unsafe_allow_html=True)
@@ -536,7 +513,9 @@ elif st.session_state.mode == "profile":
         new_name = st.text_input("Full Name", value=st.session_state.candidate_data['Name'])
         new_email = st.text_input("Email Address", value=st.session_state.candidate_data['Email'])
         new_phone = st.text_input("Phone Number", value=st.session_state.candidate_data['Phone'])
+        new_experience = st.text_input("Years of Experience", value=st.session_state.candidate_data['Experience'])
         new_role = st.text_input("Target Role", value=st.session_state.candidate_data['Role'])
+        new_location = st.text_input("Location", value=st.session_state.candidate_data['Location'])
         new_stack = st.text_input("Tech Stack", value=st.session_state.candidate_data['Stack'])
         
         submitted = st.form_submit_button("💾 Save Changes")
@@ -545,8 +524,12 @@ elif st.session_state.mode == "profile":
             st.session_state.candidate_data['Name'] = new_name
             st.session_state.candidate_data['Email'] = new_email
             st.session_state.candidate_data['Phone'] = new_phone
+            st.session_state.candidate_data['Experience'] = new_experience
             st.session_state.candidate_data['Role'] = new_role
+            st.session_state.candidate_data['Location'] = new_location
             st.session_state.candidate_data['Stack'] = new_stack
+            if st.session_state.screening_closed:
+                record_screening(st.session_state)
             st.success("Profile Updated Successfully!")
             st.session_state.mode = "screening"
             st.session_state.show_home = True
@@ -556,3 +539,13 @@ elif st.session_state.mode == "profile":
         st.session_state.mode = "screening"
         st.session_state.show_home = True
         st.rerun()
+
+elif st.session_state.mode == "recruiter" and st.session_state.get("recruiter_unlocked"):
+    st.markdown("<div class='mode-header'>🔎 Recruiter Dashboard</div>", unsafe_allow_html=True)
+
+    if st.button("← Back to Home"):
+        st.session_state.mode = "screening"
+        st.session_state.show_home = True
+        st.rerun()
+
+    recruiter_search()
@@ -0,0 +1,75 @@
+# assets.py
+# Static CSS/HTML for the UI. Files under assets/ are read and minified once per
+# process, then shared by every session and rerun instead of being rebuilt as
+# Python strings each time. Per-render pieces (sidebar cards, home greeting) are
+# precompiled string.Template objects filled with HTML-escaped values.
+import html
+import os
+import re
+from functools import lru_cache
+from string import Template
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_PUNCT = re.compile(r"\s*([{};,])\s*")
+_CSS_COLON = re.compile(r":\s+")  # only after ':' - a space before one is a descendant selector
+_HTML_GAP = re.compile(r">\s+<")
+_SPACE = re.compile(r"\s+")
+
+# Sidebar capture cards, in display order: (label, candidate_data key).
+CAPTURE_FIELDS = [
+    ("CANDIDATE NAME", "Name"), ("EMAIL ADDRESS", "Email"), ("PHONE NUMBER", "Phone"),
+    ("EXPERIENCE", "Experience"), ("TARGET ROLE", "Role"), ("LOCATION", "Location"), ("TECH STACK", "Stack"),
+]
+
+
+def minify_css(text):
+    text = _SPACE.sub(" ", _CSS_COMMENT.sub("", text))
+    text = _CSS_COLON.sub(":", _CSS_PUNCT.sub(r"\1", text))
+    return text.replace(";}", "}").strip()
+
+
+def minify_html(text):
+    return _SPACE.sub(" ", _HTML_GAP.sub("><", text)).strip()
+
+
+def _read(name):
+    with open(os.path.join(ASSETS_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def style_block():
+    return f"<style>{minify_css(_read('styles.css'))}</style>"
+
+
+@lru_cache(maxsize=None)
+def static_html(name):
+    return minify_html(_read(name))
+
+
+@lru_cache(maxsize=None)
+def template(name):
+    return Template(static_html(name))
+
+
+def capture_cards(candidate_data):
+    card = template("info_card.html")
+    return "".join(card.substitute(label=label, value=html.escape(candidate_data[key])) for label, key in CAPTURE_FIELDS)
+
+
+def vibe_card(label):
+    return template("vibe_card.html").substitute(label=html.escape(label))
+
+
+def greeting(text):
+    return template("greeting.html").substitute(greeting=html.escape(text))
+
+
+def sizes():
+    # (asset, raw bytes, minified bytes) for the static pieces sent on a rerun.
+    out = [("styles.css", len(_read("styles.css").encode()), len(style_block().encode()))]
+    for name in ("home.html", "sidebar_brand.html"):
+        out.append((name, len(_read(name).encode()), len(static_html(name).encode())))
+    return out
@@ -0,0 +1,99 @@
+# benchmarks/bench_api.py
+# Throughput of the HTTP API (api.py) as uvicorn workers are added. Each run starts
+# `uvicorn api:app --workers N` on the local stand-in model (fake_llm.py) and a fresh
+# SQLite session store, then replays the recorded screenings as --sessions concurrent
+# clients. With no model latency a turn is engine and store CPU work, so throughput
+# should grow with workers up to the number of cores (os.cpu_count() is printed).
+#   python -m benchmarks.bench_api [--workers 1 2 4] [--sessions 32] [--latency 0] [--tokens-per-s 0]
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRANSCRIPTS = os.path.join(ROOT, "benchmarks", "transcripts", "screening.jsonl")
+
+
+def load_conversations():
+    with open(TRANSCRIPTS, encoding="utf-8") as f:
+        return [[turn["user"] for turn in json.loads(line)["turns"]] for line in f if line.strip()]
+
+
+def start_server(workers, port, tmp, latency, tokens_per_second):
+    env = dict(
+        os.environ, LLM_BACKEND="fake", FAKE_LLM_LATENCY=str(latency), FAKE_LLM_TOKENS_PER_S=str(tokens_per_second),
+        GROQ_RPM="100000", GROQ_TPM="100000000",  # the fake model has no quota
+        WEB_CONCURRENCY=str(workers),  # each worker's share of the quota
+        SESSION_STORE_PATH=os.path.join(tmp, "sessions.sqlite3"),
+        CANDIDATE_INDEX_PATH=os.path.join(tmp, "candidates.sqlite3"),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/stats", timeout=1)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def client(http, turns, latencies):
+    sid = (await http.post("/sessions")).json()["sid"]
+    for message in turns:
+        start = time.perf_counter()
+        response = await http.post(f"/sessions/{sid}/screening", json={"message": message})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+
+async def drive(port, conversations, sessions):
+    latencies = []
+    limits = httpx.Limits(max_connections=sessions)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=120) as http:
+        await client(http, conversations[0], [])  # warm up every import and cache
+        start = time.perf_counter()
+        await asyncio.gather(*(client(http, conversations[i % len(conversations)], latencies) for i in range(sessions)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return len(latencies) / elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.0, help="fake model seconds to the first token")
+    parser.add_argument("--tokens-per-s", type=float, default=0.0, help="fake model streaming rate (0: no delay)")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    conversations = load_conversations()
+    print(f"{args.sessions} concurrent screenings, {os.cpu_count()} CPUs,"
+          f" fake model {args.latency} s + {args.tokens_per_s or '∞'} tokens/s")
+    base = None
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as tmp:
+            server = start_server(workers, args.port, tmp, args.latency, args.tokens_per_s)
+            try:
+                rate, p50, p95 = asyncio.run(drive(args.port, conversations, args.sessions))
+            finally:
+                server.terminate()
+                server.wait()
+        base = base or rate / workers
+        print(f"  workers {workers}: {rate:7.1f} turns/s  p50 {p50 * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms"
+              f"  ({rate / (base * workers):.0%} of linear)")
+
+
+if __name__ == "__main__":
+    main()
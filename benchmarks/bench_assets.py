@@ -0,0 +1,44 @@
+# benchmarks/bench_assets.py
+# Bytes the app sends to the browser per script rerun (serialized element protos),
+# for the home screen and for a screening chat with a filled-in sidebar. Offline.
+#   python -m benchmarks.bench_assets
+import os
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.dirname(__file__)), "app.py")
+
+
+def proto_bytes(node):
+    total = node.proto.ByteSize() if getattr(node, "proto", None) is not None else 0
+    children = getattr(node, "children", None) or {}
+    return total + sum(proto_bytes(child) for child in children.values())
+
+
+def rerun_bytes(**state):
+    at = AppTest.from_file(APP, default_timeout=60)
+    for key, value in state.items():
+        at.session_state[key] = value
+    at.run()
+    at.run()  # measure a steady-state rerun, not the first one
+    return proto_bytes(at._tree)
+
+
+def main():
+    os.environ.setdefault("GROQ_API_KEY", "offline")
+    chat = [SystemMessage(content="screening"), AIMessage(content="What's your full name?"), HumanMessage(content="Priya Sharma")]
+    home = rerun_bytes()
+    screening = rerun_bytes(show_home=False, messages=chat)
+    print(f"home screen rerun:      {home:>7,} bytes")
+    print(f"screening chat rerun:   {screening:>7,} bytes")
+    try:
+        import assets
+    except ImportError:
+        return
+    for name, raw, minified in assets.sizes():
+        print(f"{name:<22} {raw:>7,} -> {minified:>6,} bytes minified")
+
+
+if __name__ == "__main__":
+    main()
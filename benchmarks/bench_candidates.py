@@ -0,0 +1,82 @@
+# benchmarks/bench_candidates.py
+# Recruiter search latency over a synthetic candidate pool (100k by default).
+#   python -m benchmarks.bench_candidates [--candidates 100000]
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import summarize
+from candidates import RECENT, RELEVANCE, CandidateIndex
+
+FIRST = ["Priya", "Arjun", "Sam", "Maria", "Chen", "Fatima", "Lucas", "Aisha", "Noah", "Elena", "Ravi", "Yuki"]
+LAST = ["Sharma", "Lee", "Garcia", "Wang", "Khan", "Silva", "Okafor", "Novak", "Patel", "Ito", "Meyer", "Rossi"]
+ROLES = ["Backend Developer", "Frontend Developer", "Full Stack Developer", "DevOps Engineer", "Data Scientist",
+         "Machine Learning Engineer", "Site Reliability Engineer", "Mobile Developer", "QA Engineer", "Cloud Engineer"]
+CITIES = ["Pune", "Bengaluru", "Berlin", "Lisbon", "Toronto", "Austin", "Singapore", "London", "Remote"]
+SKILLS = ["Python", "Go", "Rust", "Java", "Kotlin", "TypeScript", "React", "Node.js", "Django", "FastAPI", "Kubernetes",
+          "Docker", "Terraform", "AWS", "GCP", "Azure", "PostgreSQL", "Redis", "Kafka", "Spark", "PyTorch", "C++", "C#"]
+SENTENCES = [
+    "I led the migration of our monolith to {a} services running on {b}.",
+    "Most of my day-to-day work is in {a}, with some {b} for tooling.",
+    "I built a streaming pipeline with {a} and {b} that handles peak traffic.",
+    "I'm still learning {a}, but I've shipped two projects with {b}.",
+    "We used {a} for the API layer and {b} for storage.",
+]
+QUERIES = [
+    "Kubernetes AND Go, 3+ years",
+    "stack:rust OR stack:go",
+    "kube* NOT intern",
+    "\"machine learning\" PyTorch",
+    "C++ AND Kafka, 5+ years",
+    "role:devops Terraform",
+    "Berlin React",
+    "at least 8 years",
+]
+
+
+def synthetic_rows(count, seed=7):
+    rng = random.Random(seed)
+    for i in range(count):
+        stack = rng.sample(SKILLS, rng.randint(3, 6))
+        transcript = " ".join(
+            rng.choice(SENTENCES).format(a=rng.choice(stack), b=rng.choice(stack)) for _ in range(rng.randint(3, 6))
+        )
+        experience = str(rng.randint(0, 15))
+        candidate = {
+            "Name": f"{rng.choice(FIRST)} {rng.choice(LAST)}", "Email": f"candidate{i}@example.com",
+            "Phone": f"+1555{i:07d}", "Experience": experience, "Role": rng.choice(ROLES),
+            "Location": rng.choice(CITIES), "Stack": ", ".join(stack),
+        }
+        yield CandidateIndex._row(f"sid-{i}", candidate, transcript, "Neutral 😐")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = CandidateIndex(os.path.join(tmp, "candidates.sqlite3"))
+        start = time.perf_counter()
+        rows = list(synthetic_rows(args.candidates))
+        for i in range(0, len(rows), 10_000):
+            index.record_many(rows[i:i + 10_000])
+        print(f"indexed {index.count():,} candidates in {time.perf_counter() - start:.1f} s")
+
+        for order in (RECENT, RELEVANCE):
+            print(f"order={order}")
+            for query in QUERIES:
+                samples = []
+                for _ in range(args.runs):
+                    t = time.perf_counter()
+                    results = index.search(query, order=order)
+                    samples.append(time.perf_counter() - t)
+                s = summarize(samples)
+                print(f"  {query!r:<34} {len(results):>3} hits  p50 {s['p50'] * 1000:6.2f} ms  p95 {s['p95'] * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/bench_extractor.py
+# Accuracy on the labeled corpus and per-call cost of extractor.extract.
+#   python -m benchmarks.bench_extractor
+import json
+import os
+import timeit
+
+from extractor import extract
+
+CORPUS = os.path.join(os.path.dirname(__file__), "extractor_corpus.jsonl")
+
+
+def load_corpus():
+    with open(CORPUS, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def score(corpus):
+    # Per field: true positives, false positives (wrong or spurious value), misses.
+    counts = {}
+    exact = 0
+    for case in corpus:
+        got = extract(case["text"], case["assistant"]).updates()
+        expected = case["expected"]
+        exact += got == expected
+        for field in set(got) | set(expected):
+            c = counts.setdefault(field, {"tp": 0, "fp": 0, "fn": 0})
+            if got.get(field) == expected.get(field):
+                c["tp"] += 1
+            else:
+                if field in got:
+                    c["fp"] += 1
+                if field in expected:
+                    c["fn"] += 1
+    return counts, exact
+
+
+def main():
+    corpus = load_corpus()
+    counts, exact = score(corpus)
+    print(f"cases: {len(corpus)}  exact-match: {exact}/{len(corpus)} ({exact / len(corpus):.1%})")
+    for field, c in sorted(counts.items()):
+        precision = c["tp"] / (c["tp"] + c["fp"]) if c["tp"] + c["fp"] else 0.0
+        recall = c["tp"] / (c["tp"] + c["fn"]) if c["tp"] + c["fn"] else 0.0
+        print(f"  {field:<11} precision {precision:.2f}  recall {recall:.2f}")
+
+    runs = 2000
+    seconds = timeit.timeit(lambda: [extract(c["text"], c["assistant"]) for c in corpus], number=runs)
+    print(f"per call: {seconds / (runs * len(corpus)) * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
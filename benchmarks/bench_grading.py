@@ -0,0 +1,52 @@
+# benchmarks/bench_grading.py
+# End-of-interview grading of a 15-answer mock session: one call after another vs.
+# the concurrent pool in grading.py. Uses a local fake model with a fixed streaming
+# rate, so the result shows the overlap, not Groq.
+#   python -m benchmarks.bench_grading [--answers 15]
+import argparse
+import os
+import time
+
+os.environ.setdefault("GROQ_RPM", "100000")  # the fake model has no quota
+os.environ.setdefault("GROQ_TPM", "100000000")
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel  # noqa: E402
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage  # noqa: E402
+
+from grading import Grade, _grade, build_report, grade_interview  # noqa: E402
+from mock_interview import answered_questions, format_reply  # noqa: E402
+
+REPLY = '{"score": 6, "verdict": "Good", "strengths": ["clear example"], "weaknesses": ["no mention of trade-offs"]}'
+CHAR_SECONDS = 0.004  # ~0.4 s per grading call
+
+
+def transcript(answers):
+    history = [SystemMessage(content="mock"), HumanMessage(content="Backend developer, Go, PostgreSQL and Kubernetes")]
+    for n in range(1, answers + 1):
+        history.append(AIMessage(content=format_reply("**Good.**" if n > 1 else None, n, f"Question {n} about Go?")))
+        history.append(HumanMessage(content=f"My answer to question {n}, with an example."))
+    return history
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--answers", type=int, default=15)
+    args = parser.parse_args()
+
+    llm = FakeListChatModel(responses=[REPLY], sleep=CHAR_SECONDS)
+    history = transcript(args.answers)
+
+    start = time.perf_counter()
+    serial = [_grade(llm, Grade(q, a, "go")) for q, a in answered_questions(history)]
+    serial_report = build_report(serial, time.perf_counter() - start)
+
+    report = grade_interview(llm, history)
+    single = serial_report["serial_s"] / args.answers
+    print(f"answers: {args.answers}, one grading call ≈ {single:.2f} s")
+    print(f"serial:     {serial_report['elapsed_s']:6.2f} s")
+    print(f"concurrent: {report['elapsed_s']:6.2f} s  ({serial_report['elapsed_s'] / report['elapsed_s']:.1f}x)"
+          f"  overall {report['overall']}/10, {report['graded']} graded")
+
+
+if __name__ == "__main__":
+    main()
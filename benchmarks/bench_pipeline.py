@@ -0,0 +1,128 @@
+# benchmarks/bench_pipeline.py
+# Per-stage latency of the real turn pipeline (engine.py): the recorded screening,
+# mock and roadmap transcripts are replayed against the local stand-in model
+# (fake_llm.py, fixed first-token latency and token rate), and every turn is split
+# into extraction, sentiment, prompt assembly, LLM wait and state update. "overhead"
+# is the turn minus the LLM wait: what the app itself costs. Results are written as
+# JSON; --compare prints the change against an earlier run.
+#   python -m benchmarks.bench_pipeline [--latency 0.25] [--tokens-per-s 250] [--repeat 3]
+#       [--out .cache/bench_pipeline.json] [--compare baseline.json]
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+TMP = tempfile.mkdtemp(prefix="bench-pipeline-")
+os.environ.setdefault("GROQ_RPM", "100000")  # the fake model has no quota
+os.environ.setdefault("GROQ_TPM", "100000000")
+os.environ.setdefault("ROADMAP_CACHE_PATH", os.path.join(TMP, "roadmaps.sqlite3"))  # cold cache per run
+
+from benchmarks.common import load_transcripts, summarize  # noqa: E402
+from engine import HISTORY_KEYS, MODES, Engine, SessionState, open_history  # noqa: E402
+from fake_llm import FakeChatModel  # noqa: E402
+from router import model_for  # noqa: E402
+
+TRANSCRIPTS = ("screening", "mock", "roadmap")
+STAGES = ("extraction", "sentiment", "prompt", "llm", "state", "overhead", "total")
+
+
+class StageSpan:
+    # Engine spans hook: adds up the time of each stage of one turn.
+    def __init__(self, mode):
+        self.stages = defaultdict(float)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - start
+
+    def finish(self, turn):
+        pass
+
+
+def replay(engine, conversation, samples):
+    mode = MODES[conversation["mode"]]
+    state = SessionState(mode=mode)
+    open_history(state, HISTORY_KEYS[mode])
+    for recorded in conversation["turns"]:
+        start = time.perf_counter()
+        turn = engine.turn(state, mode, recorded["user"])
+        turn.run()
+        total = time.perf_counter() - start
+        turn = turn.span.stages
+        turn["total"] = total
+        turn["overhead"] = total - turn["llm"]
+        for stage in STAGES:
+            samples[mode][stage].append(turn[stage] * 1000)
+    if state.mock_speculation is not None:
+        state.mock_speculation.discard()
+
+
+def report(results, baseline=None):
+    for mode, stages in results["modes"].items():
+        print(f"{mode} ({stages['total']['n']} turns)")
+        for stage in (s for s in STAGES if s in stages):
+            s = stages[stage]
+            line = f"  {stage:<11} p50 {s['p50']:9.3f}  p95 {s['p95']:9.3f}  p99 {s['p99']:9.3f} ms"
+            old = (baseline or {}).get("modes", {}).get(mode, {}).get(stage)
+            if old and old["p50"] and old["p95"]:
+                line += f"   p50 {s['p50'] / old['p50'] - 1:+7.1%}  p95 {s['p95'] / old['p95'] - 1:+7.1%}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.25, help="fake model seconds to the first token")
+    parser.add_argument("--tokens-per-s", type=float, default=250.0, help="fake model streaming rate (0: no delay)")
+    parser.add_argument("--repeat", type=int, default=3, help="replays of each transcript")
+    parser.add_argument("--out", default=os.path.join(".cache", "bench_pipeline.json"))
+    parser.add_argument("--compare", help="earlier --out file to compare against")
+    args = parser.parse_args()
+
+    models = {}
+
+    def llm_for(mode, route):
+        model = model_for(mode, route)
+        if model not in models:
+            models[model] = FakeChatModel(model_name=model, latency=args.latency, tokens_per_second=args.tokens_per_s)
+        return models[model]
+
+    engine = Engine(llm_for=llm_for, spans=StageSpan)
+    samples = defaultdict(lambda: defaultdict(list))
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for name in TRANSCRIPTS:
+            for conversation in load_transcripts(name):
+                replay(engine, conversation, samples)
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "config": {"latency": args.latency, "tokens_per_s": args.tokens_per_s, "repeat": args.repeat},
+        "elapsed_s": round(time.perf_counter() - start, 2),
+        "modes": {
+            mode: {stage: {k: round(v, 4) for k, v in summarize(values).items()}
+                   for stage, values in stages.items() if any(values)}  # e.g. no extraction in mock turns
+            for mode, stages in samples.items()
+        },
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    report(results, baseline)
+    if os.path.dirname(args.out):
+        os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"wrote {args.out} ({results['elapsed_s']} s)")
+
+
+if __name__ == "__main__":
+    main()
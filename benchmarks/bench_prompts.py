@@ -0,0 +1,73 @@
+# benchmarks/bench_prompts.py
+# Compares the full SYSTEM_PROMPT against the phase-aware prompt on recorded screenings.
+#   python -m benchmarks.bench_prompts            (token counts only, offline)
+#   python -m benchmarks.bench_prompts --live     (also times Groq calls; needs GROQ_API_KEY)
+import argparse
+import os
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from benchmarks.common import load_transcripts, summarize
+from prompt_builder import PENDING, PHASE1_FIELDS, build_system_prompt, is_closing_reply
+from prompts import SYSTEM_PROMPT
+from tokens import messages_tokens
+
+
+def replay(session):
+    # Yields (full_request, phase_request) for every user turn of a recorded session.
+    candidate_data = {f: PENDING for f in PHASE1_FIELDS}
+    closed = False
+    history = []
+    for turn in session["turns"]:
+        candidate_data.update(turn.get("captured", {}))
+        user = HumanMessage(content=turn["user"])
+        full = [SystemMessage(content=SYSTEM_PROMPT)] + history + [user]
+        phased = [build_system_prompt(candidate_data, closed)] + history + [user]
+        yield full, phased
+        history += [user, AIMessage(content=turn["assistant"])]
+        closed = closed or is_closing_reply(turn["assistant"])
+
+
+def time_calls(llm, requests):
+    latencies = []
+    for request in requests:
+        start = time.perf_counter()
+        llm.invoke(request)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true", help="time real Groq calls for both prompt variants")
+    parser.add_argument("--max-turns", type=int, default=20, help="turns to send per variant with --live")
+    args = parser.parse_args()
+
+    full_requests, phased_requests = [], []
+    for session in load_transcripts("screening"):
+        for full, phased in replay(session):
+            full_requests.append(full)
+            phased_requests.append(phased)
+
+    full_tokens = [messages_tokens(r) for r in full_requests]
+    phased_tokens = [messages_tokens(r) for r in phased_requests]
+    full_stats, phased_stats = summarize(full_tokens), summarize(phased_tokens)
+    drop = 1 - sum(phased_tokens) / sum(full_tokens)
+    print(f"turns replayed:            {len(full_tokens)}")
+    print(f"prompt tokens/turn (full):  mean {full_stats['mean']:.0f}  p50 {full_stats['p50']}")
+    print(f"prompt tokens/turn (phase): mean {phased_stats['mean']:.0f}  p50 {phased_stats['p50']}")
+    print(f"prompt token drop:          {drop:.1%}")
+
+    if args.live:
+        from llm_client import get_llm
+        llm = get_llm(os.environ["GROQ_API_KEY"])
+        n = args.max_turns
+        full_lat = time_calls(llm, full_requests[:n])
+        phased_lat = time_calls(llm, phased_requests[:n])
+        print(f"p50 latency (full):  {full_lat['p50'] * 1000:.0f} ms")
+        print(f"p50 latency (phase): {phased_lat['p50'] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_question_bank.py
+# Question bank startup and lookup costs: loading the compiled .bin vs. parsing the
+# JSONL source, and selecting a screening's questions for a stack. Also runs against
+# a synthetic bank (--synthetic N questions) to show how both scale.
+#   python -m benchmarks.bench_question_bank [--synthetic 50000]
+import argparse
+import os
+import tempfile
+import time
+import timeit
+
+from question_bank import BANK_PATH, SOURCE_PATH, TIERS, QuestionBank, compile_bank, read_source
+from skills import SKILLS
+
+STACKS = [["python", "react"], ["java", "spring", "aws"], ["go", "kubernetes", "docker"], ["typescript", "node", "sql"]]
+
+
+def time_it(fn, number):
+    return timeit.timeit(fn, number=number) / number
+
+
+def report(name, bin_path, source_records):
+    source_load = time_it(lambda: QuestionBank(compile_bank(source_records)), 5)
+    bin_load = time_it(lambda: QuestionBank.load(bin_path), 50)
+    bank = QuestionBank.load(bin_path)
+    select = time_it(lambda: [bank.select(stack, tier, 4, seed="sid") for stack in STACKS for tier in range(3)], 2000)
+    select /= len(STACKS) * 3
+    asked = [bank.text(i) for i in bank.select(STACKS[0], 1, 3, seed="sid")]
+    lookup = time_it(lambda: bank.select(STACKS[0], 1, 1, exclude=[bank.id_of(q) for q in asked], seed="sid"), 2000)
+    print(f"{name}: {len(bank):,} questions, {os.path.getsize(bin_path):,} bytes on disk")
+    print(f"  load, compile source:        {source_load * 1000:8.2f} ms")
+    print(f"  load, compiled .bin:         {bin_load * 1000:8.2f} ms")
+    print(f"  select 4 for a stack:        {select * 1e6:8.2f} µs")
+    print(f"  next mock question:          {lookup * 1e6:8.2f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--synthetic", type=int, default=50_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records = read_source(SOURCE_PATH)
+    print(f"read {len(records)} source records in {(time.perf_counter() - start) * 1000:.2f} ms")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = BANK_PATH
+        if not os.path.exists(path):
+            path = os.path.join(tmp, "seed.bin")
+            with open(path, "wb") as f:
+                f.write(compile_bank(records))
+        report("seed bank", path, records)
+
+        synthetic = [
+            {"skill": SKILLS[i % len(SKILLS)], "tier": TIERS[i // len(SKILLS) % 3],
+             "question": f"Walk me through scenario {i} and the trade-offs you would weigh in it."}
+            for i in range(args.synthetic)
+        ]
+        path = os.path.join(tmp, "synthetic.bin")
+        with open(path, "wb") as f:
+            f.write(compile_bank(synthetic))
+        report("synthetic bank", path, synthetic)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_render.py
+# Script-run time of the mock interview pane as the transcript grows, rendering every
+# message (the old loop) vs. the paginated window. Offline; no Groq calls are made.
+#   python -m benchmarks.bench_render
+import os
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.common import summarize
+
+APP = os.path.join(os.path.dirname(os.path.dirname(__file__)), "app.py")
+SIZES = (10, 40, 160)
+RUNS = 15
+
+
+def transcript(size):
+    messages = [SystemMessage(content="mock")]
+    for i in range(size // 2):
+        messages.append(AIMessage(content=f"**Question {i}.** Explain how a hash map handles collisions, and when you would pick open addressing."))
+        messages.append(HumanMessage(content=f"Answer {i}: chaining keeps a list per bucket; open addressing probes for the next free slot."))
+    return messages
+
+
+def time_runs(size, visible):
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.session_state["mode"] = "mock"
+    at.session_state["show_home"] = False
+    at.session_state["mock_messages"] = transcript(size)
+    at.run()  # warm-up: imports, session init
+    if visible is not None:
+        at.session_state["visible_messages"] = {"messages": visible, "mock_messages": visible, "role_messages": visible}
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def main():
+    os.environ.setdefault("GROQ_API_KEY", "offline")
+    print(f"{'messages':>8}  {'all rendered p50':>17}  {'paginated p50':>14}")
+    for size in SIZES:
+        full = time_runs(size, visible=10 ** 6)
+        paged = time_runs(size, visible=None)
+        print(f"{size:>8}  {full['p50'] * 1000:>14.1f} ms  {paged['p50'] * 1000:>11.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_sentiment.py
+# Per-message latency and import cost of sentiment.py vs the original get_sentiment.
+#   python -m benchmarks.bench_sentiment
+import subprocess
+import sys
+import timeit
+
+from benchmarks.common import load_transcripts
+from sentiment import CONFIDENT_TRIGGERS, NERVOUS_TRIGGERS, SentimentTracker, get_sentiment, score_transcript, trigger_counts
+
+
+def legacy_sentiment(text):
+    # The pre-sentiment.py implementation from app.py, kept for comparison.
+    from textblob import TextBlob
+    text_lower = text.lower()
+    if any(word in text_lower for word in NERVOUS_TRIGGERS): return "Nervous 😟"
+    if any(word in text_lower for word in CONFIDENT_TRIGGERS): return "Confident 🚀"
+    blob = TextBlob(text)
+    if blob.sentiment.polarity > 0.15: return "Confident 🚀"
+    elif blob.sentiment.polarity < 0.0: return "Nervous 😟"
+    return "Neutral 😐"
+
+
+def legacy_scan(text):
+    text_lower = text.lower()
+    return any(w in text_lower for w in NERVOUS_TRIGGERS), any(w in text_lower for w in CONFIDENT_TRIGGERS)
+
+
+def import_seconds(statement, runs=5):
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    times = [float(subprocess.check_output([sys.executable, "-c", code], text=True)) for _ in range(runs)]
+    return min(times)
+
+
+def main():
+    messages = [t["user"] for s in load_transcripts("screening") for t in s["turns"]]
+    legacy_sentiment(messages[0])
+    get_sentiment(messages[0])  # warm both backends
+
+    runs = 2000
+    scan_legacy = timeit.timeit(lambda: [legacy_scan(m) for m in messages], number=runs)
+    scan_current = timeit.timeit(lambda: [trigger_counts(m) for m in messages], number=runs)
+    per = runs * len(messages)
+    print(f"messages: {len(messages)}")
+    print(f"trigger scan, 22 substring checks: {scan_legacy / per * 1e6:6.1f} µs/message")
+    print(f"trigger scan, compiled regex:      {scan_current / per * 1e6:6.1f} µs/message")
+
+    runs = 200
+    legacy = timeit.timeit(lambda: [legacy_sentiment(m) for m in messages], number=runs)
+    current = timeit.timeit(lambda: [get_sentiment(m) for m in messages], number=runs)
+    batch = timeit.timeit(lambda: score_transcript(messages), number=runs)
+    per = runs * len(messages)
+    print(f"legacy get_sentiment:  {legacy / per * 1e6:8.1f} µs/message")
+    print(f"sentiment.get_sentiment: {current / per * 1e6:6.1f} µs/message")
+    print(f"score_transcript:      {batch / per * 1e6:8.1f} µs/message")
+
+    # Tracker updates must stay flat as the session grows.
+    tracker = SentimentTracker()
+    for size in (10, 1000, 10000):
+        while len(tracker.scores) < size:
+            tracker.update(messages[len(tracker.scores) % len(messages)], "phase2")
+        t = timeit.timeit(lambda: tracker.update(messages[0], "phase2"), number=200)
+        print(f"tracker.update at {size:>5} messages: {t / 200 * 1e6:6.1f} µs")
+
+    print(f"import textblob:  {import_seconds('import textblob') * 1000:.0f} ms")
+    print(f"import sentiment: {import_seconds('import sentiment') * 1000:.0f} ms")
+
+    misfires = [m for m in ["maximum", "album", "premium plan", "forum post"] if legacy_sentiment(m) != get_sentiment(m)]
+    print(f"substring misfires fixed: {misfires}")
+
+
+if __name__ == "__main__":
+    main()
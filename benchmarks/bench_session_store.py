@@ -0,0 +1,75 @@
+# benchmarks/bench_session_store.py
+# Session store costs: appending messages with one commit each vs. write-behind
+# batches, and resuming a 50-message session. Uses a temporary SQLite file and the
+# in-memory Redis stand-in.
+#   python -m benchmarks.bench_session_store
+import os
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.common import summarize
+from session_store import InMemoryRedis, RedisSessionStore, SQLiteSessionStore, new_token
+
+SESSIONS = 200
+MESSAGES = 50
+
+
+def fill(store, tokens):
+    for token in tokens:
+        store.save_meta(token, {"mode": "screening", "candidate_data": {"Name": "Priya Sharma"}, "screening_closed": False})
+        for index in range(1, MESSAGES + 1):
+            store.append(token, "messages", index, "human" if index % 2 else "ai", f"message {index} " + "lorem ipsum " * 20)
+    store.flush()
+
+
+def per_append_commits(path, tokens):
+    # What a naive store does: one INSERT + COMMIT per message.
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("CREATE TABLE m (token TEXT, idx INTEGER, role TEXT, content TEXT, PRIMARY KEY (token, idx)) WITHOUT ROWID")
+    for token in tokens:
+        for index in range(1, MESSAGES + 1):
+            db.execute("INSERT INTO m VALUES (?, ?, ?, ?)", (token, index, "human", f"message {index} " + "lorem ipsum " * 20))
+            db.commit()
+
+
+def resume_times(store, tokens):
+    samples = []
+    for token in tokens:
+        start = time.perf_counter()
+        session = store.load(token)
+        samples.append(time.perf_counter() - start)
+        assert len(session.histories["messages"]) == MESSAGES
+    return summarize(samples)
+
+
+def main():
+    tokens = [new_token() for _ in range(SESSIONS)]
+    appends = SESSIONS * MESSAGES
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        per_append_commits(os.path.join(tmp, "naive.sqlite3"), tokens)
+        naive = time.perf_counter() - start
+
+        sqlite_store = SQLiteSessionStore(os.path.join(tmp, "sessions.sqlite3"), flush_interval=3600)
+        start = time.perf_counter()
+        fill(sqlite_store, tokens)
+        batched = time.perf_counter() - start
+        print(f"appends: {appends}")
+        print(f"sqlite, commit per append: {naive / appends * 1e6:7.1f} µs/append")
+        print(f"sqlite, write-behind:      {batched / appends * 1e6:7.1f} µs/append")
+
+        client = InMemoryRedis()
+        redis_store = RedisSessionStore(client, flush_interval=3600)
+        fill(redis_store, tokens)
+        for name, store in (("sqlite", sqlite_store), ("redis stand-in", redis_store)):
+            s = resume_times(store, tokens)
+            print(f"resume {MESSAGES} messages, {name:<14} p50 {s['p50'] * 1000:.3f} ms  p95 {s['p95'] * 1000:.3f} ms")
+        before = client.round_trips
+        redis_store.load(tokens[0])
+        print(f"redis round trips per resume: {client.round_trips - before}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/bench_skills.py
+# Skill normalization throughput, and ranking N candidates against a role profile:
+# one NumPy pass over bit-packed vectors vs. a per-candidate Python set loop.
+#   python -m benchmarks.bench_skills [--candidates 100000]
+import argparse
+import random
+import time
+import timeit
+
+from benchmarks.bench_candidates import SKILLS as STACK_WORDS
+from skills import NICE_TO_HAVE_WEIGHT, RoleProfile, SkillMatrix, normalize_stack, pack
+
+ALIASES = {"Kubernetes": ["k8s", "Kubernetes", "kube"], "React": ["ReactJS", "React", "react.js"], "Go": ["golang", "Go"]}
+PROFILE = RoleProfile(required=("go", "kubernetes", "terraform", "aws"), optional=("prometheus", "python", "docker"))
+
+
+def stacks(count, seed=11):
+    rng = random.Random(seed)
+    for _ in range(count):
+        words = [rng.choice(ALIASES.get(w, [w])) for w in rng.sample(STACK_WORDS, rng.randint(3, 7))]
+        yield ", ".join(words[:-1]) + " and " + words[-1]
+
+
+def python_rank(skill_sets, profile, top_k=50):
+    required, optional = set(profile.required), set(profile.optional)
+    scored = []
+    for i, skills in enumerate(skill_sets):
+        score = len(skills & required) / len(required) + NICE_TO_HAVE_WEIGHT * len(skills & optional) / len(optional)
+        if score > 0:
+            scored.append((score, i))
+    scored.sort(reverse=True)
+    return scored[:top_k]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=100_000)
+    args = parser.parse_args()
+
+    texts = list(stacks(args.candidates))
+    start = time.perf_counter()
+    normalized = [normalize_stack(t) for t in texts]
+    per = (time.perf_counter() - start) / len(texts)
+    print(f"normalize_stack: {per * 1e6:.1f} µs/stack  e.g. {texts[0]!r} -> {normalized[0]}")
+
+    matrix = SkillMatrix()
+    for i, skills in enumerate(normalized):
+        matrix.set(i, pack(skills))
+    skill_sets = [set(s) for s in normalized]
+    print(f"candidates: {len(matrix):,}  ({len(matrix) * matrix._rows.shape[1] / 1024:.0f} KiB of packed vectors)")
+
+    runs = 10
+    vectorized = timeit.timeit(lambda: matrix.rank(PROFILE), number=runs) / runs
+    loop = timeit.timeit(lambda: python_rank(skill_sets, PROFILE), number=3) / 3
+    print(f"rank, python set loop: {loop * 1000:8.2f} ms")
+    print(f"rank, numpy packed:    {vectorized * 1000:8.2f} ms  ({loop / vectorized:.0f}x)")
+    top_numpy = [score for _, score in matrix.rank(PROFILE, 10)]
+    top_python = [score for score, _ in python_rank(skill_sets, PROFILE, 10)]
+    assert all(abs(a - b) < 1e-5 for a, b in zip(top_numpy, top_python)), (top_numpy, top_python)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_speculation.py
+# Time from submitting a mock interview answer to having verdict + next question,
+# generating the question after the verdict vs. speculatively while the candidate
+# types. Uses a local fake model that streams at a fixed character rate, so only the
+# overlap is measured, not Groq.
+#   python -m benchmarks.bench_speculation [--turns 5]
+import argparse
+import os
+import time
+
+os.environ.setdefault("GROQ_RPM", "100000")  # the fake model has no quota
+os.environ.setdefault("GROQ_TPM", "100000000")
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel  # noqa: E402
+
+from benchmarks.common import summarize  # noqa: E402
+from llm_client import stream_text  # noqa: E402
+from mock_interview import Speculation, feedback_request, question_request, speculation_stats  # noqa: E402
+
+PROFILE = "Backend developer / Go, Kubernetes and PostgreSQL"
+ASKED = ["How would you find a goroutine leak in production?"]
+QUESTION = "Walk me through how a Kubernetes rolling update keeps a Go service available. " * 2
+FEEDBACK = "**Good.** You named pprof, but missed runtime.NumGoroutine trends."
+CHAR_SECONDS = 0.002  # ~0.33 s per question, ~0.13 s per verdict
+TYPING = (0.0, 0.1, 0.25, 0.5)  # seconds the candidate spends on the answer
+
+
+def models():
+    return (
+        FakeListChatModel(responses=[QUESTION], sleep=CHAR_SECONDS),
+        FakeListChatModel(responses=[FEEDBACK], sleep=CHAR_SECONDS),
+    )
+
+
+def sequential(question_llm, feedback_llm, typing):
+    time.sleep(typing)
+    start = time.perf_counter()
+    "".join(stream_text(feedback_llm, feedback_request(ASKED[-1], "pprof"), "mock", "feedback"))
+    "".join(stream_text(question_llm, question_request(PROFILE, ASKED), "mock", "question"))
+    return time.perf_counter() - start
+
+
+def speculative(question_llm, feedback_llm, typing):
+    speculation = Speculation(question_llm, PROFILE, ASKED)
+    time.sleep(typing)
+    start = time.perf_counter()
+    "".join(stream_text(feedback_llm, feedback_request(ASKED[-1], "pprof"), "mock", "feedback"))
+    assert speculation.take(PROFILE, ASKED)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+
+    question_llm, feedback_llm = models()
+    print(f"{'typing':>8}  {'sequential p50':>15}  {'speculative p50':>16}")
+    for typing in TYPING:
+        before = summarize([sequential(question_llm, feedback_llm, typing) for _ in range(args.turns)])
+        after = summarize([speculative(question_llm, feedback_llm, typing) for _ in range(args.turns)])
+        print(f"{typing:7.2f}s  {before['p50'] * 1000:12.0f} ms  {after['p50'] * 1000:13.0f} ms")
+    print(speculation_stats.snapshot())
+
+
+if __name__ == "__main__":
+    main()
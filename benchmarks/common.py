@@ -0,0 +1,30 @@
+# benchmarks/common.py
+import json
+import os
+import statistics
+
+TRANSCRIPTS_DIR = os.path.join(os.path.dirname(__file__), "transcripts")
+
+
+def load_transcripts(name):
+    # Recorded sessions: one JSON object per line with "id", "mode" and "turns".
+    with open(os.path.join(TRANSCRIPTS_DIR, f"{name}.jsonl"), encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(values):
+    return {
+        "n": len(values),
+        "mean": statistics.fmean(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+    }
@@ -0,0 +1,319 @@
+# candidates.py
+# Completed screenings, stored as structured candidate records and searchable from
+# the recruiter dashboard. Records live in SQLite with an FTS5 index over name,
+# role, stack, location, transcript text and canonical skills (so "kubernetes" finds
+# a candidate who typed "k8s"), kept in sync by triggers. Experience
+# is stored as a number so "3+ years" is an indexed range filter, not text.
+# Results come newest first by default, which lets FTS5 stop after the first page
+# of matches; ranking by relevance (bm25) has to score every match, so it is
+# opt-in.
+#   "Kubernetes AND Go, 3+ years"    both terms, at least 3 years
+#   "stack:rust OR stack:go"         column-scoped terms
+#   "kube* NOT intern"               prefix match, exclusion
+# Each record also carries the candidate's canonical skills (see skills.py) as a
+# bit-packed vector, which match_role() ranks in one vectorized pass.
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from skills import SKILL_INDEX, SKILL_LAYOUT, SkillMatrix, normalize_stack, pack
+
+INDEX_PATH = os.getenv("CANDIDATE_INDEX_PATH", os.path.join(".cache", "candidates.sqlite3"))
+SEARCH_LIMIT = 50
+FTS_COLUMNS = ("name", "role", "stack", "location", "transcript", "skills")
+RECENT, RELEVANCE = "recent", "relevance"
+
+_YEARS = re.compile(r"(\d{1,2}(?:\.\d)?)")
+_EXPERIENCE_FILTER = re.compile(
+    r"(?:\b(?:at least|min(?:imum)?)\s+)?(?<![\w.])(?P<years>\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\b"
+    r"(?:\s+(?:of\s+)?(?:experience|exp)\b)?",
+    re.I,
+)
+# Parentheses, quoted phrases, column:term pairs and bare terms. Commas separate
+# terms like whitespace does, and adjacent terms are ANDed by FTS5.
+_QUERY_TOKEN = re.compile(r'[()]|"[^"]*"|[^\s(),"]+')
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    match: str = None           # FTS5 MATCH expression, None for "everything"
+    min_experience: float = None
+
+
+def experience_years(value):
+    # "3", "3.5", "about 4 years" -> float; "Pending..." or free text -> None.
+    match = _YEARS.search(value or "")
+    return float(match.group(1)) if match else None
+
+
+def _quote(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def parse_query(text):
+    min_experience = None
+    for match in _EXPERIENCE_FILTER.finditer(text):
+        min_experience = float(match.group("years"))
+    text = _EXPERIENCE_FILTER.sub(" ", text)
+
+    parts = []
+    for token in _QUERY_TOKEN.findall(text):
+        if token in "()":
+            parts.append(token)
+        elif token.upper() in _OPERATORS:
+            parts.append(token.upper())
+        else:
+            column, sep, term = token.partition(":")
+            if not sep or column.lower() not in FTS_COLUMNS:
+                column, term = None, token
+            prefix = term.endswith("*") and len(term) > 1
+            term = term.rstrip("*").strip('"').lower()
+            if not term:
+                continue
+            expr = _quote(term) + (" *" if prefix else "")
+            parts.append(f"{column.lower()} : {expr}" if column else expr)
+    return SearchQuery(match=" ".join(_well_formed(parts)) or None, min_experience=min_experience)
+
+
+def _well_formed(parts):
+    # FTS5 operators are all binary and parentheses must balance, so drop operators
+    # with nothing on their left ("NOT go", "(OR go") or right (left dangling by
+    # removed pieces: "Go AND 3+ years" -> "Go"), stray ")" and empty "()", and
+    # close any "(" left open. "AND NOT" is FTS5's "NOT", and a group next to a term
+    # needs an explicit AND.
+    out, depth = [], 0
+    for part in parts:
+        if part in _OPERATORS:
+            if out and out[-1] not in _OPERATORS and out[-1] != "(":
+                out.append(part)
+            elif part == "NOT" and out and out[-1] == "AND":
+                out[-1] = part
+        elif part == ")":
+            while out and out[-1] in _OPERATORS:
+                out.pop()
+            if not depth:
+                continue
+            depth -= 1
+            if out[-1] == "(":
+                out.pop()
+            else:
+                out.append(part)
+        else:
+            if out and out[-1] not in _OPERATORS and out[-1] != "(" and (part == "(" or out[-1] == ")"):
+                out.append("AND")
+            depth += part == "("
+            out.append(part)
+    while out and (out[-1] in _OPERATORS or out[-1] == "("):
+        depth -= out.pop() == "("
+    return out + [")"] * depth
+
+
+class CandidateIndex:
+    def __init__(self, path=INDEX_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.search_seconds = 0.0
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS candidates (
+                id INTEGER PRIMARY KEY,
+                sid TEXT UNIQUE,
+                name TEXT, email TEXT, phone TEXT,
+                experience TEXT, experience_years REAL,
+                role TEXT, location TEXT, stack TEXT,
+                transcript TEXT, sentiment TEXT,
+                completed REAL NOT NULL,
+                skills TEXT, skill_vector BLOB
+            );
+            CREATE INDEX IF NOT EXISTS candidates_experience ON candidates (experience_years);
+            """
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(candidates)")}
+        for column, kind in (("skills", "TEXT"), ("skill_vector", "BLOB")):
+            if column not in columns:  # index files created before skill vectors
+                self._db.execute(f"ALTER TABLE candidates ADD COLUMN {column} {kind}")
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != SKILL_LAYOUT:
+            self._rebuild_vectors()
+        self._db.commit()
+        fts_columns = tuple(row[1] for row in self._db.execute("PRAGMA table_info(candidates_fts)"))
+        if fts_columns != FTS_COLUMNS:  # new file, or an index built before skills were searchable
+            self._rebuild_fts()
+        self._matrix = None  # loaded on the first match_role()
+
+    def _rebuild_fts(self):
+        self._db.executescript(
+            """
+            BEGIN;
+            DROP TRIGGER IF EXISTS candidates_ai;
+            DROP TRIGGER IF EXISTS candidates_ad;
+            DROP TRIGGER IF EXISTS candidates_au;
+            DROP TABLE IF EXISTS candidates_fts;
+            CREATE VIRTUAL TABLE candidates_fts USING fts5(
+                name, role, stack, location, transcript, skills,
+                content='candidates', content_rowid='id',
+                tokenize="unicode61 tokenchars '+#'"
+            );
+            CREATE TRIGGER candidates_ai AFTER INSERT ON candidates BEGIN
+                INSERT INTO candidates_fts (rowid, name, role, stack, location, transcript, skills)
+                VALUES (new.id, new.name, new.role, new.stack, new.location, new.transcript, new.skills);
+            END;
+            CREATE TRIGGER candidates_ad AFTER DELETE ON candidates BEGIN
+                INSERT INTO candidates_fts (candidates_fts, rowid, name, role, stack, location, transcript, skills)
+                VALUES ('delete', old.id, old.name, old.role, old.stack, old.location, old.transcript, old.skills);
+            END;
+            CREATE TRIGGER candidates_au AFTER UPDATE ON candidates BEGIN
+                INSERT INTO candidates_fts (candidates_fts, rowid, name, role, stack, location, transcript, skills)
+                VALUES ('delete', old.id, old.name, old.role, old.stack, old.location, old.transcript, old.skills);
+                INSERT INTO candidates_fts (rowid, name, role, stack, location, transcript, skills)
+                VALUES (new.id, new.name, new.role, new.stack, new.location, new.transcript, new.skills);
+            END;
+            INSERT INTO candidates_fts (candidates_fts) VALUES ('rebuild');
+            COMMIT;
+            """
+        )
+
+    def _rebuild_vectors(self):
+        # The skill list changed since the vectors were written (skills.SKILL_LAYOUT):
+        # re-pack them from the stored skill names, dropping any that no longer exist.
+        rows = self._db.execute("SELECT id, skills, stack FROM candidates").fetchall()
+        updates = []
+        for candidate_id, skills, stack in rows:
+            names = skills.split(", ") if skills is not None else normalize_stack(stack)
+            names = [name for name in names if name in SKILL_INDEX]
+            updates.append((", ".join(names), pack(names).tobytes(), candidate_id))
+        self._db.executemany("UPDATE candidates SET skills = ?, skill_vector = ? WHERE id = ?", updates)
+        self._db.execute(f"PRAGMA user_version = {SKILL_LAYOUT}")
+
+    @staticmethod
+    def _row(sid, candidate_data, transcript, sentiment=None, completed=None):
+        skills = normalize_stack(candidate_data.get("Stack"))
+        return (
+            sid, candidate_data.get("Name"), candidate_data.get("Email"), candidate_data.get("Phone"),
+            candidate_data.get("Experience"), experience_years(candidate_data.get("Experience")),
+            candidate_data.get("Role"), candidate_data.get("Location"), candidate_data.get("Stack"),
+            transcript, sentiment, completed or time.time(), ", ".join(skills), pack(skills).tobytes(),
+        )
+
+    def record(self, sid, candidate_data, transcript, sentiment=None):
+        # Re-recording the same session (e.g. after a profile edit) updates its row.
+        self.record_many([self._row(sid, candidate_data, transcript, sentiment)])
+
+    def record_many(self, rows):
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO candidates (sid, name, email, phone, experience, experience_years, role, location,"
+                " stack, transcript, sentiment, completed, skills, skill_vector)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(sid) DO UPDATE SET name = excluded.name, email = excluded.email, phone = excluded.phone,"
+                " experience = excluded.experience, experience_years = excluded.experience_years, role = excluded.role,"
+                " location = excluded.location, stack = excluded.stack, transcript = excluded.transcript,"
+                " sentiment = excluded.sentiment, completed = excluded.completed, skills = excluded.skills,"
+                " skill_vector = excluded.skill_vector",
+                rows,
+            )
+            if self._matrix is not None:
+                for row in rows:
+                    candidate_id, vector = self._db.execute(
+                        "SELECT id, skill_vector FROM candidates WHERE sid = ?", (row[0],)
+                    ).fetchone()
+                    self._matrix.set(candidate_id, vector)
+
+    def match_role(self, profile, top_k=SEARCH_LIMIT):
+        # Ranks every stored candidate against a skills.RoleProfile in one pass.
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = SkillMatrix()
+                for candidate_id, vector, stack in self._db.execute("SELECT id, skill_vector, stack FROM candidates"):
+                    self._matrix.set(candidate_id, vector if vector is not None else pack(normalize_stack(stack)))
+            ranked = self._matrix.rank(profile, top_k)
+            if not ranked:
+                return []
+            rows = self._db.execute(
+                "SELECT id, name, role, experience, location, skills, email, phone, sentiment FROM candidates"
+                f" WHERE id IN ({', '.join('?' * len(ranked))})",
+                [candidate_id for candidate_id, _ in ranked],
+            ).fetchall()
+        by_id = {row["id"]: dict(row) for row in rows}
+        results = []
+        for candidate_id, score in ranked:
+            row = by_id.pop(candidate_id)
+            del row["id"]
+            results.append({"fit": round(score, 3), **row})
+        return results
+
+    def search(self, text, limit=SEARCH_LIMIT, order=RECENT):
+        query = parse_query(text)
+        where, params = [], []
+        if query.min_experience is not None:
+            where.append("c.experience_years >= ?")
+            params.append(query.min_experience)
+        if query.match:
+            ranking = "bm25(candidates_fts)" if order == RELEVANCE else "candidates_fts.rowid DESC"
+            sql = (
+                "SELECT c.name, c.role, c.experience, c.location, c.stack, c.skills, c.email, c.phone, c.sentiment,"
+                " snippet(candidates_fts, 4, '**', '**', '…', 10) AS excerpt"
+                " FROM candidates_fts JOIN candidates c ON c.id = candidates_fts.rowid"
+                " WHERE candidates_fts MATCH ?" + "".join(f" AND {w}" for w in where) +
+                f" ORDER BY {ranking} LIMIT ?"
+            )
+            params = [query.match] + params
+        else:
+            sql = (
+                "SELECT c.name, c.role, c.experience, c.location, c.stack, c.skills, c.email, c.phone, c.sentiment,"
+                " '' AS excerpt FROM candidates c" + (" WHERE " + " AND ".join(where) if where else "") +
+                " ORDER BY c.id DESC LIMIT ?"
+            )
+        start = time.perf_counter()
+        with self._lock:
+            try:
+                rows = self._db.execute(sql, params + [limit]).fetchall()
+            except sqlite3.OperationalError as exc:
+                raise ValueError(f"Couldn't read that search: {exc}") from exc
+            self.searches += 1
+            self.search_seconds += time.perf_counter() - start
+        return [dict(row) for row in rows]
+
+    def top_skills(self, n):
+        # The n canonical skills most candidates list (used to seed the question bank).
+        counts = Counter()
+        with self._lock:
+            for (skills,) in self._db.execute("SELECT skills FROM candidates WHERE skills != ''"):
+                counts.update(skills.split(", "))
+        return [skill for skill, _ in counts.most_common(n)]
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def stats(self):
+        count = self.count()
+        with self._lock:
+            return {
+                "candidates": count,
+                "searches": self.searches,
+                "avg_search_ms": round(self.search_seconds / self.searches * 1000, 3) if self.searches else 0.0,
+            }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_candidate_index():
+    # One index per process, shared by every Streamlit session.
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CandidateIndex()
+    return _index
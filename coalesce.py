@@ -0,0 +1,150 @@
+# coalesce.py
+# Single-flight for streamed LLM calls. Identical requests that arrive while one is
+# already in flight subscribe to that call's chunks instead of issuing their own.
+# The upstream stream runs in its own thread, so it keeps going if the session that
+# started it reruns, and is cancelled once no session is reading it any more.
+import hashlib
+import json
+import threading
+
+
+def request_key(messages, model, temperature):
+    payload = json.dumps(
+        [model, temperature, [(type(m).__name__, m.content) for m in messages]],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Flight:
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.subscribers = 0
+        self.cancelled = False
+        self.cond = threading.Condition()
+
+    def publish(self, chunk):
+        with self.cond:
+            self.chunks.append(chunk)
+            self.cond.notify_all()
+
+    def finish(self, error=None):
+        with self.cond:
+            self.done = True
+            self.error = error
+            self.cond.notify_all()
+
+    def attach(self):
+        # Registered eagerly (not when the reader is first iterated) so a flight can't
+        # be cancelled between a caller joining it and starting to read.
+        with self.cond:
+            if self.cancelled:
+                return None
+            self.subscribers += 1
+            return Reader(self)
+
+    def detach(self):
+        with self.cond:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done:
+                self.cancelled = True
+
+    def _read(self):
+        index = 0
+        while True:
+            with self.cond:
+                while index >= len(self.chunks) and not self.done:
+                    self.cond.wait()
+                pending = self.chunks[index:]
+                finished, error = self.done, self.error
+            index += len(pending)
+            yield from pending
+            if finished and index >= len(self.chunks):
+                if error is not None:
+                    raise error
+                return
+
+
+class Reader:
+    # One subscriber's iterator over a flight. The subscription is taken in attach(),
+    # so it is released however the reader ends: exhausted, failed, closed, or dropped
+    # without ever being iterated (a generator that never started skips its finally).
+    def __init__(self, flight):
+        self._flight = flight
+        self._chunks = flight._read()
+        self._attached = True
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        self._chunks.close()
+        if self._attached:
+            self._attached = False
+            self._flight.detach()
+
+    def __del__(self):
+        self.close()
+
+
+class SingleFlight:
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.issued = 0
+        self.coalesced = 0
+
+    def stream(self, key, producer):
+        # producer() returns an iterator of text chunks; it is only called by the
+        # first caller for a key.
+        with self._lock:
+            flight = self._flights.get(key)
+            reader = flight.attach() if flight is not None else None
+            if reader is not None:
+                self.coalesced += 1
+                return reader
+            flight = Flight()
+            reader = flight.attach()
+            self._flights[key] = flight
+            self.issued += 1
+        threading.Thread(target=self._run, args=(key, flight, producer), daemon=True).start()
+        return reader
+
+    def _run(self, key, flight, producer):
+        error = None
+        chunks = None
+        try:
+            chunks = producer()
+            for chunk in chunks:
+                if flight.cancelled:
+                    break
+                flight.publish(chunk)
+        except Exception as exc:
+            error = exc
+        finally:
+            if chunks is not None and hasattr(chunks, "close"):
+                chunks.close()
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.finish(error)
+
+    def stats(self):
+        with self._lock:
+            total = self.issued + self.coalesced
+            return {
+                "issued": self.issued,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+                "coalesced_ratio": round(self.coalesced / total, 3) if total else 0.0,
+            }
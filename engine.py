@@ -0,0 +1,536 @@
+# engine.py
+# The chat turn pipeline without Streamlit: sentiment, the Phase 1 engine, field
+# extraction, routing, prompt assembly and history compaction, the LLM call and the
+# state update. State lives in any mapping with attribute access: app.py passes
+# st.session_state and renders each turn's parts as they stream; the CLI below uses
+# SessionState and replays recorded conversations headless, across a process pool,
+# e.g. to reprocess transcripts after a prompt change or to load-test.
+#   python -m engine replay benchmarks/transcripts/screening.jsonl --out results.jsonl --workers 8
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from contextlib import nullcontext
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+import llm_client
+from candidates import get_candidate_index
+from extractor import extract
+from grading import grade_interview
+from history import MODE_BUDGETS, HistoryCompactor
+from llm_client import get_llm, stream_text
+from mock_interview import (asked_questions, feedback_request, format_reply, interview_profile, question_heading,
+                            question_request, speculate, take_question)
+from phase1 import Phase1Engine
+from prompt_builder import PENDING, build_system_prompt, detect_phase, is_closing_reply, with_question_plan
+from prompts import SYSTEM_PROMPT
+from question_bank import asked_questions as asked_planned, get_question_bank, next_question, phase2_opening, screening_plan
+from roadmap_cache import cache_key, get_roadmap_cache, iter_chunks, normalize_role
+from router import classify_turn, model_for
+from sentiment import SentimentTracker
+from session_store import decode_message, encode_message, new_token
+from tokens import PromptTooLarge, SessionUsage, clip_text, estimate_tokens, fit
+
+# --- PROMPTS ---
+MOCK_INTERVIEW_PROMPT = """
+You are "TalentCoach," a strict but helpful Technical Interviewer.
+1. Ask the candidate for their **Job Role** and **Tech Stack**.
+2. Once you have that, ask ONE relevant, challenging technical question.
+3. Wait for their answer.
+4. Provide brief feedback (Strong/Weak) and then ask the NEXT technical question immediately.
+Keep it strictly technical and professional.
+"""
+
+CAREER_GUIDE_PROMPT = """
+You are "CareerGuide," an expert Tech Career Counselor.
+1. The user will ask about a specific **Job Role** (e.g., "DevOps Engineer").
+2. You must provide:
+   - 📋 **Job Description**: A concise summary of what they do.
+   - 🛠️ **Required Tech Stack**: The essential tools/languages to learn.
+   - 🗺️ **Learning Path**: A step-by-step guide (Beginner -> Advanced).
+3. Be structured, encouraging, and highly detailed.
+"""
+
+SYSTEM_PROMPTS = {"messages": SYSTEM_PROMPT, "mock_messages": MOCK_INTERVIEW_PROMPT, "role_messages": CAREER_GUIDE_PROMPT}
+# Which chat mode each history list belongs to (selects the compaction budget).
+HISTORY_MODES = {"messages": "screening", "mock_messages": "mock", "role_messages": "role_insight"}
+HISTORY_KEYS = {mode: key for key, mode in HISTORY_MODES.items()}
+CANDIDATE_FIELDS = ("Name", "Email", "Phone", "Experience", "Role", "Location", "Stack")
+
+# The first bot message of each mode, shown when the mode is opened.
+INTROS = {
+    "messages": "**Welcome to Screening Mode!** 🕵️\n\nIn this mode, I will act as a recruiter to gather your details and validate your background.\n\nTo get started, could you please provide your **Full Name**?",
+    "mock_messages": "**Welcome to the Technical Interview Simulator!** ⚔️\n\nIn this mode, I will act as a strict technical coach. I'll ask you challenging questions specific to your stack to test your knowledge.\n\nTo begin, please tell me the **Job Role** you are targeting and your **Tech Stack**.",
+    "role_messages": "**Welcome to Career Roadmap Mode!** 🗺️\n\nIn this mode, I will help you define a clear learning path. Tell me the **Job Role** you are interested in (e.g., 'Full Stack Developer'), and I will generate a Job Description, Tech Stack, and Learning Path for you.",
+}
+# Reply to a message that can't fit in the mode's prompt limit (history.MODE_BUDGETS).
+TOO_LONG_REPLY = ("That message is too long for me to read in one go (about {tokens} tokens; the limit is {limit}). "
+                  "Could you send a shorter version, or split it into parts?")
+CLIPPED_TOKENS = 500  # how much of a refused message is kept in the transcript
+
+STATE_DEFAULTS = {
+    "mode": lambda: "screening",
+    "messages": lambda: [SystemMessage(content=SYSTEM_PROMPT)],
+    "mock_messages": lambda: [SystemMessage(content=MOCK_INTERVIEW_PROMPT)],
+    "role_messages": lambda: [SystemMessage(content=CAREER_GUIDE_PROMPT)],
+    "candidate_data": lambda: {field: PENDING for field in CANDIDATE_FIELDS},
+    "sentiment": SentimentTracker,
+    "screening_closed": lambda: False,
+    "phase1": Phase1Engine,
+    "compactors": lambda: {mode: HistoryCompactor(mode) for mode in HISTORY_MODES.values()},
+    "question_plan": lambda: None,
+    "mock_speculation": lambda: None,
+    "usage": SessionUsage,
+}
+
+
+def init_state(state):
+    # Fills in whatever the state doesn't have yet (a resumed session keeps the rest).
+    for name, default in STATE_DEFAULTS.items():
+        if name not in state:
+            state[name] = default()
+
+
+def open_history(state, history_key):
+    # Adds the mode's intro to a history that has nothing but its system prompt.
+    if len(state[history_key]) == 1:
+        state[history_key].append(AIMessage(content=INTROS[history_key]))
+    return state[history_key][-1].content
+
+
+# --- PERSISTENCE (session_store.py) ---
+def session_meta(state):
+    return {
+        "mode": state.mode,
+        "candidate_data": dict(state.candidate_data),
+        "screening_closed": state.screening_closed,
+        "usage": state.usage.totals(),
+    }
+
+
+def restore(state, stored):
+    # Loads a StoredSession into state and rebuilds the in-memory helpers from the
+    # transcript; anything not stored starts fresh.
+    for key, prompt in SYSTEM_PROMPTS.items():
+        records = stored.histories.get(key, [])
+        state[key] = [SystemMessage(content=prompt)] + [decode_message(role, content) for role, content in records]
+    state.mode = stored.meta["mode"]
+    state.candidate_data = dict(stored.meta["candidate_data"])
+    state.screening_closed = stored.meta["screening_closed"]
+    state.usage = SessionUsage(**stored.meta.get("usage", {}))  # sessions stored before usage was tracked
+    tracker = SentimentTracker()
+    for msg in state.messages[1:]:
+        if isinstance(msg, HumanMessage):
+            tracker.update(msg.content)
+    state.sentiment = tracker
+    phase1 = Phase1Engine()
+    if len(state.messages) > 1 and isinstance(state.messages[-1], AIMessage):
+        phase1.sync(state.messages[-1].content, state.candidate_data)
+    state.phase1 = phase1
+    init_state(state)
+
+
+def persist(store, state, persisted, history_keys=tuple(SYSTEM_PROMPTS)):
+    # Queues the messages added since `persisted` (history key -> stored length).
+    for key in history_keys:
+        history = state[key]
+        for index in range(max(persisted[key], 1), len(history)):
+            store.append(state.sid, key, index, *encode_message(history[index]))
+        persisted[key] = len(history)
+
+
+def record_screening(state):
+    # A closed screening becomes a searchable candidate record (recruiter dashboard).
+    # Re-recording the same session updates its record.
+    transcript = "\n".join(
+        ("Candidate: " if isinstance(msg, HumanMessage) else "TalentScout: ") + msg.content
+        for msg in state.messages[1:]
+    )
+    get_candidate_index().record(state.sid, state.candidate_data, transcript, state.sentiment.label)
+
+
+class SessionState(dict):
+    # Headless stand-in for st.session_state: a dict with attribute access.
+    def __init__(self, sid=None, **values):
+        super().__init__(sid=sid or new_token(), **values)
+        init_state(self)
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+
+# Instrumentation hook: Engine(spans=...) is called with the mode at the start of every
+# turn and returns a span. span.stage(name) wraps each stage of the turn ("sentiment",
+# "extraction", "prompt", "llm", "state"); span.finish(turn) runs once it is committed.
+# See metrics.TurnSpan, and benchmarks/bench_pipeline.py.
+class NullSpan:
+    def stage(self, name):
+        return nullcontext()
+
+    def finish(self, turn):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Turn:
+    # One chat exchange. `parts` are shown in order: text, or a zero-argument callable
+    # returning text or a chunk iterator to stream. Callables run only when reached,
+    # e.g. the next mock question is taken once the verdict has streamed. commit()
+    # gets each part's final text and records the exchange in the history.
+    def __init__(self, history_key, user_input, parts, finish, local=False, span=NULL_SPAN):
+        self.history_key = history_key
+        self.user_input = user_input
+        self.parts = parts
+        self.local = local  # answered without an LLM call
+        self._finish = finish
+        self.span = span
+
+    def commit(self, outputs):
+        with self.span.stage("state"):
+            reply = self._finish(outputs)
+        self.span.finish(self)
+        return reply
+
+    def run(self):
+        # Headless: read every stream to the end, then commit.
+        outputs = []
+        for part in self.parts:
+            if callable(part):
+                with self.span.stage("llm"):
+                    value = part()
+                    outputs.append(value if isinstance(value, str) else "".join(value))
+            else:
+                outputs.append(part)
+        return self.commit(outputs)
+
+
+class Engine:
+    def __init__(self, api_key=None, llm_for=None, spans=None):
+        # llm_for(mode, route) -> chat model; by default the pooled clients (llm_client.py).
+        self.llm_for = llm_for or (lambda mode, route: get_llm(api_key, model_for(mode, route)))
+        self.spans = spans or (lambda mode: NULL_SPAN)
+
+    def fit(self, state, mode, messages):
+        # -> (messages, prompt tokens) within the mode's hard limit, counted locally
+        # before anything is queued or sent. Raises PromptTooLarge.
+        try:
+            messages, tokens, dropped = fit(messages, MODE_BUDGETS[mode]["limit"])
+        except PromptTooLarge:
+            state.usage.count("refused")
+            raise
+        if dropped:
+            state.usage.count("trimmed")
+        return messages, tokens
+
+    def stream(self, state, mode, route, messages):
+        messages, tokens = self.fit(state, mode, messages)
+        chunks = stream_text(self.llm_for(mode, route), messages, mode, route)
+        return self._metered(state, model_for(mode, route), tokens, chunks)
+
+    @staticmethod
+    def _metered(state, model, prompt_tokens, chunks):
+        # Adds the call to the session's usage once the reply ends, or is abandoned.
+        text = []
+        try:
+            for chunk in chunks:
+                text.append(chunk)
+                yield chunk
+        finally:
+            chunks.close()
+            if text:
+                state.usage.add(model, prompt_tokens, estimate_tokens("".join(text)))
+
+    # --- SCREENING ---
+    def extract_info(self, state, user_text):
+        # Only fills fields that are still pending; the AI's last question gives context.
+        last_ai_msg = None
+        if state.messages and isinstance(state.messages[-1], AIMessage):
+            last_ai_msg = state.messages[-1].content
+        for field, value in extract(user_text, last_ai_msg).updates().items():
+            if state.candidate_data.get(field) == PENDING:
+                state.candidate_data[field] = value
+
+    def question_plan(self, state):
+        # Phase 2 questions from the prebuilt bank, picked once Phase 1 is complete. The
+        # pick is seeded by the session token, so a resumed session gets the same ones.
+        if state.question_plan is None and detect_phase(state.candidate_data) == "phase2":
+            state.question_plan = screening_plan(state.candidate_data, state.sid)
+        return state.question_plan or []
+
+    def build_request(self, state, history_key, user_msg):
+        # Older turns are folded into a rolling summary once the mode's token budget is hit.
+        mode = HISTORY_MODES[history_key]
+        history = state[history_key]
+        pinned = None
+        if mode == "screening":
+            # Send only the SYSTEM_PROMPT sections for the current phase / pending fields.
+            system = build_system_prompt(state.candidate_data, state.screening_closed, state.phase1.handoffs)
+            plan = self.question_plan(state)
+            if plan and detect_phase(state.candidate_data, state.screening_closed) == "phase2":
+                bot_messages = [m.content for m in history if isinstance(m, AIMessage)]
+                system = with_question_plan(system, plan, asked_planned(plan, bot_messages))
+            history = [system] + history[1:]
+            pinned = {k: v for k, v in state.candidate_data.items() if v != PENDING}
+        return state.compactors[mode].compact(history + [user_msg], pinned)
+
+    def llm_turn(self, state, history_key, user_input, span, route=None, cached=None, on_commit=None):
+        # One LLM reply (or a cached one, replayed as a stream) to the history so far.
+        # The user message and the reply are committed together, so a turn that never
+        # finishes doesn't leave a dangling HumanMessage in the history.
+        user_msg = HumanMessage(content=user_input)
+        if cached is not None:
+            parts = [lambda: iter_chunks(cached)]
+        else:
+            # Each turn goes to the fast or the 70B model depending on its route.
+            mode = HISTORY_MODES[history_key]
+            route = route or classify_turn(mode, state.candidate_data, state.screening_closed)
+            with span.stage("prompt"):
+                try:
+                    request, _ = self.fit(state, mode, self.build_request(state, history_key, user_msg))
+                except PromptTooLarge as exc:
+                    return self.refusal_turn(state, history_key, user_input, exc, span)
+            parts = [lambda: self.stream(state, mode, route, request)]
+
+        def finish(outputs):
+            reply = outputs[0]
+            state[history_key].extend([user_msg, AIMessage(content=reply)])
+            if history_key == "messages":
+                if is_closing_reply(reply):
+                    state.screening_closed = True
+                state.phase1.sync(reply, state.candidate_data)
+            if on_commit:
+                on_commit(reply)
+            return reply
+
+        return Turn(history_key, user_input, parts, finish, span=span)
+
+    def local_turn(self, state, history_key, user_input, reply, span):
+        def finish(outputs):
+            state[history_key].extend([HumanMessage(content=user_input), AIMessage(content=reply)])
+            return reply
+
+        return Turn(history_key, user_input, [reply], finish, local=True, span=span)
+
+    def refusal_turn(self, state, history_key, user_input, exc, span):
+        # Only the start of the message is kept, so the next turn's prompt still fits.
+        reply = TOO_LONG_REPLY.format(tokens=exc.tokens, limit=exc.limit)
+        return self.local_turn(state, history_key, clip_text(user_input, CLIPPED_TOKENS), reply, span)
+
+    def screening_turn(self, state, user_input):
+        span = self.spans("screening")
+        phase = detect_phase(state.candidate_data, state.screening_closed)
+        with span.stage("sentiment"):
+            state.sentiment.update(user_input, phase)
+        with span.stage("extraction"):
+            result = state.phase1.handle(user_input, state.candidate_data)
+            state.candidate_data.update(result.captured)
+            if not result.reply:
+                self.extract_info(state, user_input)
+        if result.reply:
+            # Scripted Phase 1 turn: answered locally, no LLM round trip
+            return self.local_turn(state, "messages", user_input, result.reply, span)
+        with span.stage("prompt"):
+            plan = self.question_plan(state) if phase == "phase1" else []
+            opening = phase2_opening(state.candidate_data["Stack"], plan[0]) if plan and "?" not in user_input else None
+        if opening:
+            # This answer completed Phase 1: transition and the first bank question, no LLM
+            return self.local_turn(state, "messages", user_input, opening, span)
+        return self.llm_turn(state, "messages", user_input, span)
+
+    # --- MOCK INTERVIEW ---
+    def prefetch(self, state):
+        # Start on the next question while the candidate reads this one and types. The
+        # UI calls this when the mock pane renders; a turn never does, since its own
+        # question would then wait on a call queued at speculative priority.
+        state.mock_speculation = speculate(
+            state.mock_speculation, self.llm_for("mock", "question"), state.mock_messages, state.sid
+        )
+
+    def mock_turn(self, state, user_input):
+        # Until role and stack are known the coach runs on MOCK_INTERVIEW_PROMPT. After
+        # that an answer turn is a short verdict (fast model) followed by the next
+        # question, from the question bank or generated in the background while the
+        # candidate typed (see mock_interview.py).
+        span = self.spans("mock")
+        history = state.mock_messages
+        user_msg = HumanMessage(content=user_input)
+        with span.stage("prompt"):
+            profile = interview_profile(history[1:] + [user_msg])
+            asked = asked_questions(history) if profile is not None else None
+        if profile is None:
+            return self.llm_turn(state, "mock_messages", user_input, span, route="question")
+        number = len(asked) + 1
+        if not asked:
+            # First question: there is no answer to give feedback on, so a bank hit
+            # needs no LLM call at all.
+            with span.stage("prompt"):
+                text = next_question(profile, asked, state.sid)
+            get_question_bank().record(served=text is not None)
+            if text is not None:
+                state.mock_speculation = None
+                return self.local_turn(state, "mock_messages", user_input, format_reply(None, number, text), span)
+
+        def question():
+            # Prebuilt bank first (already tried above for the first question); past
+            # it, the speculated or a live-generated question
+            text = None
+            if asked:
+                text = next_question(profile, asked, state.sid)
+                get_question_bank().record(served=text is not None)
+                if text is None:
+                    speculation = state.mock_speculation
+                    text = take_question(speculation, profile, asked)
+                    if text is not None:
+                        state.usage.add(model_for("mock", "question"), speculation.prompt_tokens, estimate_tokens(text))
+            state.mock_speculation = None
+            return text if text is not None else self.stream(state, "mock", "question", question_request(profile, asked))
+
+        parts = []
+        if asked:
+            with span.stage("prompt"):
+                try:
+                    feedback, _ = self.fit(state, "mock", feedback_request(asked[-1], user_input))
+                except PromptTooLarge as exc:
+                    return self.refusal_turn(state, "mock_messages", user_input, exc, span)
+            parts += [lambda: self.stream(state, "mock", "feedback", feedback), "---"]
+        parts += [question_heading(number), question]
+
+        def finish(outputs):
+            reply = format_reply(outputs[0] if asked else None, number, outputs[-1])
+            history.extend([user_msg, AIMessage(content=reply)])
+            return reply
+
+        return Turn("mock_messages", user_input, parts, finish, span=span)
+
+    def grade(self, state):
+        report = grade_interview(self.llm_for("mock", "grading"), state.mock_messages)
+        for grade in (report or {}).get("grades", []):
+            if grade.completion_tokens:
+                state.usage.add(model_for("mock", "grading"), grade.prompt_tokens, grade.completion_tokens)
+        return report
+
+    # --- CAREER ROADMAPS ---
+    def role_turn(self, state, user_input):
+        # Bare role requests ("Data Scientist") are served from the shared roadmap cache.
+        span = self.spans("role_insight")
+        roadmaps = get_roadmap_cache()
+        with span.stage("prompt"):
+            role = normalize_role(user_input)
+            route = classify_turn("role_insight", is_role_request=bool(role))
+            key = cache_key(role, CAREER_GUIDE_PROMPT, model_for("role_insight", route)) if role else None
+            cached = roadmaps.get(key) if key else None
+        on_commit = (lambda reply: roadmaps.put(key, reply)) if key and cached is None else None
+        return self.llm_turn(state, "role_messages", user_input, span, route=route, cached=cached, on_commit=on_commit)
+
+    def turn(self, state, mode, user_input):
+        if mode == "screening":
+            return self.screening_turn(state, user_input)
+        if mode == "mock":
+            return self.mock_turn(state, user_input)
+        return self.role_turn(state, user_input)
+
+
+# --- BATCH REPLAY ---
+# Input: one conversation per line, {"id", "mode", "turns": [{"user": ...}, ...]}
+# (benchmarks/transcripts/*.jsonl works as is; recorded assistant text is ignored).
+# Output: one result per conversation, written as soon as it finishes.
+MODES = {"screening": "screening", "mock": "mock", "role": "role_insight", "role_insight": "role_insight"}
+
+_engine = None
+
+
+def _init_worker(api_key, workers):
+    # The scheduler is per process, so each worker gets its share of the quota (none
+    # to share with the fake backend, see llm_client).
+    global _engine
+    llm_client.split_quota(workers)
+    _engine = Engine(api_key)
+
+
+def replay(conversation, engine=None):
+    engine = engine or _engine
+    mode = MODES[conversation.get("mode", "screening")]
+    state = SessionState(sid=str(conversation.get("id") or new_token()), mode=mode)
+    open_history(state, HISTORY_KEYS[mode])  # the intro, as the UI shows it
+    turns, error = [], None
+    start = time.perf_counter()
+    for recorded in conversation["turns"]:
+        turn_start = time.perf_counter()
+        try:
+            turn = engine.turn(state, mode, recorded["user"])
+            reply = turn.run()
+        except Exception as exc:  # keep going with the rest of the batch
+            error = f"{type(exc).__name__}: {exc}"
+            break
+        turns.append({
+            "user": recorded["user"], "assistant": reply, "local": turn.local,
+            "seconds": round(time.perf_counter() - turn_start, 4),
+        })
+    if state.mock_speculation is not None:
+        state.mock_speculation.discard()
+    return {
+        "id": conversation.get("id"),
+        "mode": mode,
+        "turns": turns,
+        "candidate_data": state.candidate_data if mode == "screening" else None,
+        "screening_closed": state.screening_closed,
+        "sentiment": state.sentiment.label if mode == "screening" else None,
+        "seconds": round(time.perf_counter() - start, 4),
+        "error": error,
+    }
+
+
+def read_conversations(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m engine")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("replay", help="replay recorded conversations through the turn pipeline")
+    run.add_argument("input", help="JSONL conversations")
+    run.add_argument("--out", help="JSONL results (default: stdout)")
+    run.add_argument("--workers", type=int, default=os.cpu_count(), help="processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    workers = max(1, args.workers)
+    init_args = (os.getenv("GROQ_API_KEY"), workers)
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    done = turns = local = failed = 0
+    start = time.perf_counter()
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=init_args) as pool:
+            for result in pool.imap_unordered(replay, read_conversations(args.input)):
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                done += 1
+                turns += len(result["turns"])
+                local += sum(t["local"] for t in result["turns"])
+                failed += result["error"] is not None
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"{done} conversations, {turns} turns ({local} local) in {elapsed:.2f} s"
+          f" · {turns / elapsed:.1f} turns/s · {failed} failed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# extractor.py
+# Candidate-detail extraction for the screening chat. All patterns are compiled
+# once at import; free-text fields (email, phone, experience, self-introduced name,
+# location) come from a single finditer pass over the combined pattern, and the
+# field the assistant just asked for decides how a bare short answer is read.
+import re
+from dataclasses import dataclass, fields
+
+EMAIL = r"(?<![\w.+-])[A-Za-z0-9](?:[A-Za-z0-9._%+-]{0,62}[A-Za-z0-9])?@(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+[A-Za-z]{2,24}(?![\w-])"
+# Optional +country code, optional (area) code, then digits in groups split by
+# spaces, dots or dashes. Digit count (10-15) and shape (_phone_like) are checked
+# after matching.
+PHONE = r"(?<![\w+])(?:\+\d{1,3}[\s.-]?)?(?:\(\d{1,5}\)[\s.-]?)?\d(?:[\s.-]?\d){5,13}(?![\w@])"
+EXPERIENCE = r"(?i:(?<![\d.])(?P<years>\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\b)"
+FRESHER = r"(?i:\b(?:fresher|fresh graduate|no experience|entry[- ]level)\b)"
+# Words that follow "I am" / "I'm" without being a name ("I am Interested in the Data
+# Scientist role", "I'm Fine thanks"), and words that end a name ("Sam Lee from ...").
+NOT_NAMES = frozenset({
+    "a", "able", "about", "actually", "all", "alright", "also", "an", "applying", "at",
+    "available", "back", "based", "comfortable", "confident", "curious", "currently",
+    "doing", "done", "eager", "excited", "experienced", "familiar", "fine", "for", "from",
+    "glad", "going", "good", "graduating", "great", "happy", "having", "here", "hoping",
+    "in", "interested", "into", "it", "just", "keen", "learning", "looking", "my", "new",
+    "not", "okay", "on", "open", "passionate", "planning", "pleased", "proficient",
+    "ready", "really", "seeking", "so", "sorry", "still", "studying", "sure", "that",
+    "the", "thinking", "thrilled", "to", "trying", "unsure", "very", "well", "what",
+    "willing", "with", "working", "your",
+})
+NAME_BREAKS = frozenset({"and", "but", "or", "i", "i'm", "im", "living", "who", "aged", "age"})
+# The prefix and the name are matched case-insensitively ("my name is john smith");
+# extract() capitalizes names typed in lower case.
+_NAME_WORD = r"(?!(?:%s)\b)[a-z][a-z'-]+" % "|".join(
+    sorted(map(re.escape, NOT_NAMES | NAME_BREAKS), key=len, reverse=True))
+NAME = rf"(?i:\b(?:my name is|my name's|i am|i'm|this is)\s+(?P<name_value>{_NAME_WORD}(?:\s+{_NAME_WORD}){{0,3}}))"
+LOCATION = r"(?i:\b(?:based (?:in|out of)|located in|living in|live in|i'm in|from)\s+)(?P<location_value>[A-Z][\w.-]*(?:,?\s+[A-Z][\w.-]*){0,3})"
+
+_SCAN = re.compile(
+    f"(?P<email>{EMAIL})|(?P<phone>{PHONE})|(?P<experience>{EXPERIENCE})|(?P<fresher>{FRESHER})"
+    f"|(?P<name>{NAME})|(?P<location>{LOCATION})"
+)
+_DIGITS = re.compile(r"\d")
+_PHONE_GROUPS = re.compile(r"[\s.()-]+")
+_PHONE_CONTEXT = re.compile(r"\b(?:phone|mobile|cell|call|whatsapp|tel|contact)\b", re.I)
+_BARE_NUMBER = re.compile(r"^\s*(?:about|around|~)?\s*(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)?\s*\.?\s*$", re.I)
+_BARE_NAME = re.compile(r"^\s*[^\W\d_](?:[^\W\d_]|['.-])*(?:\s+[^\W\d_](?:[^\W\d_]|['.-])*){0,3}\s*$")
+
+# Which field an assistant message asks for. The last match wins, since the ask
+# normally closes the message ("Thanks, Priya! ... what's your email?").
+_ASKED = re.compile(
+    r"(?P<Name>\b(?:full |last |first )?name\b)"
+    r"|(?P<Email>\be-?mail\b)"
+    r"|(?P<Phone>\bphone\b|\bnumber where\b|\bcontact number\b)"
+    r"|(?P<Experience>\byears of experience\b|\bhow many years\b)"
+    r"|(?P<Role>\bposition\b|\brole\b|\bapplying\b)"
+    r"|(?P<Location>\bbased\b|\blocation\b|\bcity or country\b|\bwhere are you\b)"
+    r"|(?P<Stack>\btech stack\b|\btechnologies\b|\bframeworks\b|\blanguages\b)",
+    re.I,
+)
+
+GREETINGS = frozenset({"hi", "hello", "hey", "yo", "ok", "okay", "yes", "no", "sure", "thanks", "thank you"})
+# A short reply is only read as the field just asked for if it isn't a sentence about
+# the candidate ("I work at Microsoft") or a refusal ("I dont know"). Stacks are
+# exempt from the sentence check: skills.normalize_stack reads "I mostly use Go".
+_SENTENCE = re.compile(
+    r"\b(?:i|i'm|im|i've|i'd|i'll|me|my|we|we're|our|am|is|are|was|were|have|has|had|work|"
+    r"worked|working|know|think|live|lived|want|like|use|used|prefer)\b",
+    re.I,
+)
+_REFUSAL = re.compile(
+    r"\b(?:don'?t know|dunno|not sure|no idea|rather not|prefer not|skip|pass|n/a|"
+    r"not telling|none of your business|can'?t say)(?!\w)",
+    re.I,
+)
+CONTEXT_LIMITS = {"Name": 50, "Role": 100, "Location": 100, "Stack": 150}
+
+
+@dataclass(frozen=True)
+class Extraction:
+    name: str = None
+    email: str = None
+    phone: str = None
+    experience: str = None
+    role: str = None
+    location: str = None
+    stack: str = None
+
+    def updates(self):
+        # Keyed like candidate_data, found fields only.
+        return {f.name.capitalize(): getattr(self, f.name) for f in fields(self) if getattr(self, f.name) is not None}
+
+
+def asked_field(assistant_text):
+    if not assistant_text:
+        return None
+    last = None
+    for match in _ASKED.finditer(assistant_text):
+        last = match.lastgroup
+    return last
+
+
+def _phone_like(value, context):
+    # Grouped like a phone number: a +country or (area) code, a last group of 4+
+    # digits ("415.555.0134", not "192.168.100.200"), or pairs ("06 12 34 56 78").
+    # An ungrouped run of digits is only a phone number in a phone context.
+    if not 10 <= len(_DIGITS.findall(value)) <= 15:
+        return False
+    if value.startswith(("+", "(")):
+        return True
+    groups = [group for group in _PHONE_GROUPS.split(value) if group]
+    if len(groups) == 1:
+        return context
+    return len(groups[-1]) >= 4 or all(len(group) == 2 for group in groups)
+
+
+def _capitalized(name):
+    return " ".join(word[:1].upper() + word[1:] if word.islower() else word for word in name.split())
+
+
+def extract(user_text, assistant_text=None):
+    found = {}
+    asked = asked_field(assistant_text)
+    phone_context = asked == "Phone" or _PHONE_CONTEXT.search(user_text) is not None
+    for match in _SCAN.finditer(user_text):
+        kind = match.lastgroup
+        if kind == "phone":
+            value = match.group(kind).strip()
+            if not _phone_like(value, phone_context):
+                continue
+        elif kind == "experience":
+            value = match.group("years")
+        elif kind == "fresher":
+            kind, value = "experience", "0"
+        elif kind in ("name", "location"):
+            value = match.group(kind + "_value").rstrip(",.")
+            if kind == "name":
+                value = _capitalized(value)
+        else:
+            value = match.group(kind)
+        found.setdefault(kind, value)
+
+    text = user_text.strip()
+    if asked and asked.lower() not in found and not ("email" in found or "phone" in found):
+        value = _contextual(asked, text)
+        if value is not None:
+            found[asked.lower()] = value
+    return Extraction(**found)
+
+
+def _contextual(asked, text):
+    if asked == "Experience":
+        bare = _BARE_NUMBER.match(text)
+        return bare.group(1) if bare else None
+    if asked in ("Email", "Phone"):
+        return None
+    if len(text) >= CONTEXT_LIMITS[asked] or text.lower().strip(" .!") in GREETINGS:
+        return None
+    if _REFUSAL.search(text) or (asked != "Stack" and _SENTENCE.search(text)):
+        return None
+    if asked == "Name":
+        # A self-introduction the scan didn't take as a name ("I'm Fine thanks") isn't one.
+        words = [word.lower().strip(",.!") for word in text.split()]
+        if (not _BARE_NAME.match(text) or words[0] in GREETINGS or words[0] in NOT_NAMES
+                or words[0] == "i'm" or words[:2] == ["i", "am"]):
+            return None
+    return text.strip(" .")
@@ -0,0 +1,86 @@
+# fake_llm.py
+# Deterministic local stand-in for the Groq models, selected with LLM_BACKEND=fake
+# (see llm_client.get_llm). The reply is picked by the first marker found in the
+# request's system prompt, so each route gets a plausible canned answer and the same
+# request always gets the same reply. It streams word-sized tokens after a fixed
+# first-token latency at a fixed token rate, and reports token usage on the last
+# chunk like Groq does, so everything above it (scheduler, coalescer, route stats)
+# runs unchanged. This measures the app's own overhead apart from Groq's.
+#   FAKE_LLM_LATENCY=0.25         seconds to the first token
+#   FAKE_LLM_TOKENS_PER_S=250     streaming rate; 0 streams without delay
+#   FAKE_LLM_RESPONSES=path.json  {"marker": "reply", ...}, checked before the defaults
+import json
+import os
+import re
+import time
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import Field
+
+from tokens import estimate_tokens, messages_tokens
+
+LATENCY = float(os.getenv("FAKE_LLM_LATENCY", "0.25"))
+TOKENS_PER_SECOND = float(os.getenv("FAKE_LLM_TOKENS_PER_S", "250"))
+RESPONSES_PATH = os.getenv("FAKE_LLM_RESPONSES", "")
+
+# (marker in the system prompt, reply); the first match wins.
+REPLIES = [
+    ("grading one answer", '{"score": 6, "verdict": "Good", "strengths": ["clear example"], "weaknesses": ["no trade-offs"]}'),
+    ("Grade the candidate's answer", "**Good.** Clear and correct; mention the trade-offs next time."),
+    ("Ask ONE challenging technical question", "How would you design a rate limiter for a public API, and where would you keep its state?"),
+    ("writing a question bank", "Tell me about a bug you tracked down recently.\nWalk me through how you test a change before it ships."),
+    ("CareerGuide", (
+        "📋 **Job Description**: Builds and runs the systems the product depends on.\n\n"
+        "🛠️ **Required Tech Stack**: Python, SQL, Docker, Kubernetes, AWS\n\n"
+        "🗺️ **Learning Path**: 1. Python and SQL basics. 2. Containers. 3. Cloud deployments."
+    )),
+    ("TalentCoach", "Great. First question: how does a hash map handle collisions?"),
+    ("PHASE 1: DATA COLLECTION", "Thanks! Could you share a little more detail on that?"),
+    ("PHASE 2: TECHNICAL SCREENING", "Good answer. Can you walk me through a project where you used that in production?"),
+    ("CLOSING PROTOCOL", "Thank you for your time. That's a wrap! Our team will be in touch soon."),
+]
+DEFAULT_REPLY = "Thanks, noted."
+
+_TOKEN = re.compile(r"\s*\S+")
+
+
+def load_replies(path=RESPONSES_PATH):
+    if not path:
+        return list(REPLIES)
+    with open(path, encoding="utf-8") as f:
+        return list(json.load(f).items()) + REPLIES
+
+
+class FakeChatModel(BaseChatModel):
+    model_name: str = "fake"
+    temperature: float = 0.0
+    latency: float = LATENCY
+    tokens_per_second: float = TOKENS_PER_SECOND
+    replies: list = Field(default_factory=load_replies)
+
+    @property
+    def _llm_type(self):
+        return "fake"
+
+    def reply_for(self, messages):
+        system = messages[0].content if messages and isinstance(messages[0], SystemMessage) else ""
+        return next((reply for marker, reply in self.replies if marker in system), DEFAULT_REPLY)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        reply = self.reply_for(messages)
+        time.sleep(self.latency)
+        for token in _TOKEN.findall(reply):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if self.tokens_per_second:
+                time.sleep(1 / self.tokens_per_second)
+        prompt_tokens, completion_tokens = messages_tokens(messages), estimate_tokens(reply)
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata={
+            "input_tokens": prompt_tokens, "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }))
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        text = "".join(chunk.message.content for chunk in self._stream(messages))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
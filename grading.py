@@ -0,0 +1,159 @@
+# grading.py
+# End-of-interview report for mock sessions. Every (question, answer) pair in the
+# transcript is graded by its own small call, and the calls run concurrently on a
+# bounded pool. They still go through the shared scheduler (mock priority, the
+# account's rate limits), so a 15-answer session costs about one call's latency
+# when there is quota, and queues politely when there isn't. Grades are merged
+# into an overall score plus strengths and weaknesses per topic. The topic is the
+# skill a bank question was filed under, else the first canonical skill (skills.py)
+# the question mentions, else the candidate's first listed skill.
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from llm_client import stream_text
+from mock_interview import answered_questions, interview_profile
+from prompts import MOCK_GRADING_PROMPT
+from question_bank import get_question_bank
+from skills import normalize_stack
+from tokens import estimate_tokens, messages_tokens
+
+GRADING_WORKERS = 16  # one wave for a typical session; under llm_client.POOL_LIMITS
+MAX_POINTS = 3  # strengths/weaknesses kept per topic
+VERDICTS = {"weak": 3, "good": 6, "strong": 9}  # score when the JSON is unusable
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.S)
+_VERDICT = re.compile(r"\b(weak|good|strong)\b", re.I)
+_executor = ThreadPoolExecutor(max_workers=GRADING_WORKERS, thread_name_prefix="mock-grading")
+_stats_lock = threading.Lock()
+_stats = {"reports": 0, "answers": 0, "elapsed_s": 0.0, "serial_s": 0.0}
+
+
+@dataclass
+class Grade:
+    question: str
+    answer: str
+    topic: str
+    score: float = None  # 0-10, None if grading failed
+    verdict: str = None
+    strengths: list = field(default_factory=list)
+    weaknesses: list = field(default_factory=list)
+    seconds: float = 0.0
+    error: str = None
+    prompt_tokens: int = 0  # counted locally (tokens.py); 0 completion tokens if the call failed
+    completion_tokens: int = 0
+
+
+def parse_grade(text):
+    # -> (score, verdict, strengths, weaknesses). Small models sometimes wrap the JSON
+    # in prose or break it; then the verdict word alone sets the score.
+    match = _JSON_OBJECT.search(text)
+    try:
+        data = json.loads(match.group(0)) if match else None
+    except json.JSONDecodeError:
+        data = None
+    if isinstance(data, dict) and isinstance(data.get("score"), (int, float)):
+        score = min(10.0, max(0.0, float(data["score"])))
+        verdict = str(data.get("verdict") or "").title() or None
+        strengths, weaknesses = ([str(p) for p in data.get(key) or [] if str(p).strip()][:2]
+                                 for key in ("strengths", "weaknesses"))
+        return score, verdict, strengths, weaknesses
+    verdict = _VERDICT.search(text)
+    if verdict is None:
+        raise ValueError("No score or verdict in the grading reply")
+    word = verdict.group(1).lower()
+    return float(VERDICTS[word]), word.title(), [], []
+
+
+def grade_request(question, answer):
+    return [
+        SystemMessage(content=MOCK_GRADING_PROMPT),
+        HumanMessage(content=f"Question: {question}\n\nCandidate's answer: {answer}"),
+    ]
+
+
+def _grade(llm, grade):
+    start = time.perf_counter()
+    try:
+        request = grade_request(grade.question, grade.answer)
+        grade.prompt_tokens = messages_tokens(request)
+        text = "".join(stream_text(llm, request, "mock", "grading"))
+        grade.completion_tokens = estimate_tokens(text)
+        grade.score, grade.verdict, grade.strengths, grade.weaknesses = parse_grade(text)
+    except Exception as exc:
+        grade.error = str(exc) or type(exc).__name__
+    grade.seconds = time.perf_counter() - start
+    return grade
+
+
+def _merge(points, new):
+    for point in new:
+        if point.lower() not in {p.lower() for p in points} and len(points) < MAX_POINTS:
+            points.append(point)
+
+
+def build_report(grades, elapsed):
+    graded = [g for g in grades if g.score is not None]
+    topics = {}
+    for g in graded:
+        t = topics.setdefault(g.topic, {"topic": g.topic, "questions": 0, "total": 0.0, "strengths": [], "weaknesses": []})
+        t["questions"] += 1
+        t["total"] += g.score
+        _merge(t["strengths"], g.strengths)
+        _merge(t["weaknesses"], g.weaknesses)
+    by_topic = []
+    for t in topics.values():
+        t["score"] = round(t.pop("total") / t["questions"], 1)
+        by_topic.append(t)
+    by_topic.sort(key=lambda t: t["score"])  # weakest first
+    return {
+        "overall": round(sum(g.score for g in graded) / len(graded), 1) if graded else None,
+        "graded": len(graded),
+        "failed": len(grades) - len(graded),
+        "topics": by_topic,
+        "grades": grades,
+        "elapsed_s": round(elapsed, 2),
+        "serial_s": round(sum(g.seconds for g in grades), 2),  # what one-by-one would have cost
+    }
+
+
+def grade_interview(llm, history):
+    # Grades every answered question in a mock transcript concurrently. Returns the
+    # report dict, or None if nothing has been answered yet.
+    pairs = answered_questions(history)
+    if not pairs:
+        return None
+    bank = get_question_bank()
+    profile_skills = normalize_stack(interview_profile(history) or "")
+    fallback_topic = profile_skills[0] if profile_skills else "general"
+    grades = []
+    for question, answer in pairs:
+        question_id = bank.id_of(question)
+        mentioned = normalize_stack(question)
+        topic = bank.skill_of(question_id) if question_id is not None else None
+        grades.append(Grade(question, answer, topic or (mentioned[0] if mentioned else fallback_topic)))
+    start = time.perf_counter()
+    grades = list(_executor.map(lambda g: _grade(llm, g), grades))
+    report = build_report(grades, time.perf_counter() - start)
+    with _stats_lock:
+        _stats["reports"] += 1
+        _stats["answers"] += len(grades)
+        _stats["elapsed_s"] += report["elapsed_s"]
+        _stats["serial_s"] += report["serial_s"]
+    return report
+
+
+def grading_stats():
+    with _stats_lock:
+        reports = _stats["reports"]
+        return {
+            "reports": reports,
+            "answers": _stats["answers"],
+            "avg_report_s": round(_stats["elapsed_s"] / reports, 2) if reports else 0.0,
+            "avg_speedup": round(_stats["serial_s"] / _stats["elapsed_s"], 1) if _stats["elapsed_s"] else 0.0,
+        }
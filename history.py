@@ -0,0 +1,101 @@
+# history.py
+import re
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from tokens import message_tokens, messages_tokens
+
+# --- PER-MODE BUDGETS ---
+# keep_turns: how many recent user/assistant exchanges are sent verbatim.
+# max_tokens: prompt budget; history is only compacted once it is exceeded.
+# limit: hard ceiling checked before every call (tokens.fit): older messages are
+# dropped, or the turn is refused, rather than sending a prompt that, with its reply,
+# would not fit in one minute of the Groq token quota.
+MODE_BUDGETS = {
+    "screening": {"keep_turns": 6, "max_tokens": 6000, "limit": 8000},
+    "mock": {"keep_turns": 4, "max_tokens": 3500, "limit": 5000},
+    "role_insight": {"keep_turns": 2, "max_tokens": 4000, "limit": 6000},
+}
+
+SUMMARY_LINE_CHARS = 160
+_FIRST_SENTENCE = re.compile(r"^(.+?[.!?])(\s|$)", re.S)
+_SPEAKERS = {HumanMessage: "User", AIMessage: "Assistant"}
+
+
+def _summarize(message):
+    text = " ".join(message.content.split())
+    match = _FIRST_SENTENCE.match(text)
+    if match:
+        text = match.group(1)
+    if len(text) > SUMMARY_LINE_CHARS:
+        text = text[:SUMMARY_LINE_CHARS - 1] + "…"
+    return f"- {_SPEAKERS.get(type(message), 'System')}: {text}"
+
+
+class HistoryCompactor:
+    # Keeps the system prompt and the last N turns verbatim and folds everything
+    # older into a rolling summary. Folded lines are cached, so each turn only
+    # summarizes the messages that just aged out of the verbatim window.
+    def __init__(self, mode):
+        budget = MODE_BUDGETS[mode]
+        self.mode = mode
+        self.keep_turns = budget["keep_turns"]
+        self.max_tokens = budget["max_tokens"]
+        self.folded = 0
+        self.summary_lines = []
+        self.turns_compacted = 0
+        self.tokens_saved = 0
+
+    def _fold_until(self, messages, end):
+        for message in messages[1 + self.folded:end]:
+            self.summary_lines.append(_summarize(message))
+        self.folded = max(self.folded, end - 1)
+
+    def _summary_message(self, pinned, lines):
+        parts = []
+        if pinned:
+            fields = "\n".join(f"- {k}: {v}" for k, v in pinned.items())
+            parts.append(f"Details already captured (do not ask for these again):\n{fields}")
+        if lines:
+            parts.append("Summary of the earlier conversation:\n" + "\n".join(lines))
+        return SystemMessage(content="\n\n".join(parts))
+
+    def compact(self, messages, pinned=None):
+        full = messages_tokens(messages)
+        if full <= self.max_tokens or len(messages) <= 2:
+            return messages
+
+        # Walk back keep_turns user messages to find the start of the verbatim window.
+        start = len(messages)
+        turns = 0
+        while start > 1 and turns < self.keep_turns:
+            start -= 1
+            if isinstance(messages[start], HumanMessage):
+                turns += 1
+        self._fold_until(messages, start)
+
+        system = messages[0]
+        recent = messages[1 + self.folded:]
+        lines = self.summary_lines
+        summary = self._summary_message(pinned, lines)
+
+        # Still over budget: drop the oldest summary lines first, then recent turns.
+        budget = self.max_tokens - message_tokens(system) - messages_tokens(recent)
+        while lines and message_tokens(summary) > budget:
+            lines = lines[len(lines) // 4 + 1:]
+            summary = self._summary_message(pinned, lines)
+        while len(recent) > 1 and messages_tokens([system, summary] + recent) > self.max_tokens:
+            recent = recent[1:]
+
+        compacted = [system, summary] + recent
+        self.turns_compacted += 1
+        self.tokens_saved += full - messages_tokens(compacted)
+        return compacted
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "summary_lines": len(self.summary_lines),
+            "turns_compacted": self.turns_compacted,
+            "prompt_tokens_saved": self.tokens_saved,
+        }
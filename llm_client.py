@@ -0,0 +1,177 @@
+# llm_client.py
+import os
+import threading
+import time
+import weakref
+
+import httpx
+from langchain_groq import ChatGroq
+
+import metrics
+from coalesce import SingleFlight, request_key
+from fake_llm import FakeChatModel
+from scheduler import GroqScheduler, REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE
+from router import route_stats
+from tokens import estimate_tokens, messages_tokens
+
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+DEFAULT_TEMPERATURE = 0.5
+# "groq", or "fake" for the local stand-in model (fake_llm.py): no key, no network.
+BACKEND = os.getenv("LLM_BACKEND", "groq")
+
+# --- CONNECTION POOL ---
+# One keep-alive pool per client, bounded so a burst of sessions can't open
+# an unbounded number of sockets to Groq.
+POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+_clients = {}
+_lock = threading.Lock()
+
+
+class ConnectionStats:
+    # Counts requests and tells new TCP/TLS connections apart from reused ones.
+    # httpcore exposes the underlying socket wrapper as the "network_stream"
+    # response extension, so a stream we've already seen means a reused connection.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seen = weakref.WeakSet()
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+
+    def on_response(self, response):
+        stream = response.extensions.get("network_stream")
+        with self._lock:
+            self.requests += 1
+            if stream is None:
+                return
+            if stream in self._seen:
+                self.reused_connections += 1
+            else:
+                self._seen.add(stream)
+                self.new_connections += 1
+
+    def snapshot(self):
+        with self._lock:
+            reuse = self.reused_connections / self.requests if self.requests else 0.0
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": self.reused_connections,
+                "reuse_ratio": round(reuse, 3),
+            }
+
+
+stats = ConnectionStats()
+
+
+def _http_client():
+    return httpx.Client(
+        limits=POOL_LIMITS,
+        timeout=TIMEOUT,
+        event_hooks={"response": [stats.on_response]},
+    )
+
+
+def get_llm(api_key, model_name=DEFAULT_MODEL, temperature=DEFAULT_TEMPERATURE):
+    # Streamlit re-executes app.py on every interaction, but imported modules stay
+    # loaded, so this dict is shared by every rerun and every session in the process.
+    key = (model_name, temperature)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            if BACKEND == "fake":
+                client = FakeChatModel(model_name=model_name, temperature=temperature)
+            else:
+                client = ChatGroq(
+                    temperature=temperature,
+                    model_name=model_name,
+                    groq_api_key=api_key,
+                    http_client=_http_client(),
+                    max_retries=0,  # the scheduler retries 429s and transient errors
+                )
+            _clients[key] = client
+    return client
+
+
+def connection_stats():
+    snapshot = stats.snapshot()
+    snapshot["clients"] = len(_clients)
+    return snapshot
+
+
+# Rough completion size charged against the tokens/minute bucket up front.
+COMPLETION_ALLOWANCE = 700
+
+# --- SCHEDULING & REQUEST COALESCING ---
+# Every upstream call waits its turn in the shared rate-limit scheduler. The fake
+# backend has no quota: unless GROQ_RPM/GROQ_TPM are set to simulate one, its calls
+# are only ordered by priority.
+FAKE_RPM, FAKE_TPM = 1_000_000, 1_000_000_000
+if BACKEND == "fake" and not (os.getenv("GROQ_RPM") or os.getenv("GROQ_TPM")):
+    scheduler = GroqScheduler(FAKE_RPM, FAKE_TPM)
+else:
+    scheduler = GroqScheduler(REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
+
+
+def split_quota(processes):
+    # The scheduler is per process: when several processes share one Groq account
+    # (uvicorn workers, replay workers), each gets an equal share of the quota.
+    global scheduler
+    if processes > 1:
+        rpm, tpm = int(scheduler.requests.capacity), int(scheduler.tokens.capacity)
+        scheduler = GroqScheduler(max(1, rpm // processes), max(1, tpm // processes))
+
+# Shared by every session, so a burst of identical prompts (e.g. many candidates
+# asking for the same roadmap at once) costs one Groq call.
+coalescer = SingleFlight()
+
+
+def _text_chunks(llm, messages, label):
+    # One upstream call. Groq reports token usage on the final (empty) chunk; if it
+    # is missing the local estimate is used instead.
+    start = time.perf_counter()
+    ttft = None
+    usage = None
+    parts = []
+    for chunk in llm.stream(messages):
+        if chunk.usage_metadata:
+            usage = chunk.usage_metadata
+        if chunk.content:
+            if ttft is None:
+                ttft = time.perf_counter() - start
+            parts.append(chunk.content)
+            yield chunk.content
+    if label:
+        latency = time.perf_counter() - start
+        prompt_tokens = usage["input_tokens"] if usage else messages_tokens(messages)
+        completion_tokens = usage["output_tokens"] if usage else estimate_tokens("".join(parts))
+        model = getattr(llm, "model_name", type(llm).__name__)
+        route_stats.record(label, model, latency, ttft or latency, prompt_tokens, completion_tokens)
+        metrics.record_llm(label, model, latency, ttft or latency, prompt_tokens, completion_tokens)
+
+
+def stream_text(llm, messages, mode=None, route=None, speculative=False, ticket=None):
+    # mode ("screening", "mock", "role_insight") sets the scheduling priority;
+    # mode.route is the label latency and token usage are accounted under.
+    # Speculative calls (nobody is waiting on them yet) queue behind everything else,
+    # and get flights of their own: a live request never waits on one. `ticket`
+    # (scheduler.Ticket) lets the caller withdraw the call while it is still queued.
+    label = f"{mode}.{route}" if mode and route else None
+    key = request_key(
+        messages,
+        getattr(llm, "model_name", type(llm).__name__),
+        getattr(llm, "temperature", None),
+    )
+    if speculative:
+        key = "speculative:" + key
+    est_tokens = messages_tokens(messages) + COMPLETION_ALLOWANCE
+    return coalescer.stream(
+        key, lambda: scheduler.stream(
+            "speculative" if speculative else mode, est_tokens, lambda: _text_chunks(llm, messages, label), ticket
+        )
+    )
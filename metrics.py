@@ -0,0 +1,330 @@
+# metrics.py
+# Hot-path instrumentation for chat turns, per process. Every turn gets a TurnSpan
+# (engine.py creates it through its `spans` hook) that times the turn's stages:
+# sentiment, extraction, prompt assembly, LLM wait and state update. LLM calls add
+# prompt/completion token counts from the response metadata (llm_client.py), and the
+# UI adds its render times. Counters, an active-session gauge and latency histograms
+# are exported two ways:
+#   prometheus_text()   Prometheus text format: GET /metrics on api.py, or
+#                       METRICS_PORT=9100 to serve it from any process (e.g. Streamlit)
+#   snapshot()          JSON with p50/p95/p99 over each series' recent observations
+#                       (GET /metrics.json on api.py, the admin panel in app.py)
+# Opt-in sampling profiler: with METRICS_PROFILE_SLOW_MS=2000, the threads running a
+# turn's stages are sampled every METRICS_PROFILE_INTERVAL_MS, and turns slower than
+# the threshold keep their folded stacks (flamegraph.pl / speedscope input) in the
+# snapshot's "slow_turns".
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = "talentscout"
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+WINDOW = 512  # recent observations per series behind the JSON percentiles
+ACTIVE_WINDOW = 300.0  # a session is active if it had a turn or rerun this recently
+PROFILE_SLOW_MS = float(os.getenv("METRICS_PROFILE_SLOW_MS", "0"))  # 0: profiler off
+PROFILE_INTERVAL = float(os.getenv("METRICS_PROFILE_INTERVAL_MS", "5")) / 1000
+PROFILE_DEPTH = 64
+PROFILE_TOP = 25  # stacks kept per slow turn
+PROFILE_MAX_AGE = 600.0  # seconds; older spans are dropped even if a stage was never closed
+SLOW_TURNS_KEPT = 20
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+# name -> (type, help); names are exported with PREFIX.
+METRICS = {
+    "turns_total": ("counter", "Chat turns by mode; local=true were answered without an LLM call."),
+    "turn_seconds": ("histogram", "Turn latency from its first stage to the committed reply."),
+    "turn_stage_seconds": ("histogram", "Time per turn spent in each of its stages."),
+    "llm_requests_total": ("counter", "Completed LLM calls by route and model."),
+    "llm_prompt_tokens_total": ("counter", "Prompt tokens reported by the model, by route."),
+    "llm_completion_tokens_total": ("counter", "Completion tokens reported by the model, by route."),
+    "llm_seconds": ("histogram", "LLM call latency, first byte to last chunk included."),
+    "llm_ttft_seconds": ("histogram", "LLM time to first token."),
+    "render_seconds": ("histogram", "Streamlit render time per pane rerun."),
+    "active_sessions": ("gauge", f"Sessions with activity in the last {ACTIVE_WINDOW:g} s."),
+    "slow_turns_total": ("counter", "Turns over METRICS_PROFILE_SLOW_MS, by mode."),
+}
+
+
+def _labels(labels):
+    return tuple(sorted((labels or {}).items()))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}" if pairs else ""
+
+
+def _percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=WINDOW)
+
+    def observe(self, value):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)  # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> Histogram
+        self._sessions = {}  # sid -> last activity (monotonic)
+        self._slow_turns = deque(maxlen=SLOW_TURNS_KEPT)
+        self.started = time.time()
+
+    def inc(self, name, labels=None, value=1):
+        with self._lock:
+            self._counters[(name, _labels(labels))] += value
+
+    def observe(self, name, seconds, labels=None):
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def touch_session(self, sid):
+        with self._lock:
+            self._sessions[sid] = time.monotonic()
+
+    def active_sessions(self):
+        cutoff = time.monotonic() - ACTIVE_WINDOW
+        with self._lock:
+            for sid in [sid for sid, seen in self._sessions.items() if seen < cutoff]:
+                del self._sessions[sid]
+            return len(self._sessions)
+
+    def add_slow_turn(self, record):
+        with self._lock:
+            self._slow_turns.append(record)
+
+    def prometheus_text(self):
+        active = self.active_sessions()
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, h.buckets[:], h.count, h.sum) for key, h in self._histograms.items())
+        series = defaultdict(list)
+        for (name, labels), value in counters:
+            series[name].append(f"{PREFIX}_{name}{_label_text(labels)} {value:g}")
+        for (name, labels), buckets, count, total in histograms:
+            cumulative = 0
+            for bound, n in zip(BUCKETS, buckets):
+                cumulative += n
+                series[name].append(f"{PREFIX}_{name}_bucket{_label_text(labels, [('le', f'{bound:g}')])} {cumulative}")
+            series[name].append(f"{PREFIX}_{name}_bucket{_label_text(labels, [('le', '+Inf')])} {count}")
+            series[name].append(f"{PREFIX}_{name}_sum{_label_text(labels)} {total:.6f}")
+            series[name].append(f"{PREFIX}_{name}_count{_label_text(labels)} {count}")
+        series["active_sessions"].append(f"{PREFIX}_active_sessions {active}")
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            if series.get(name):
+                lines += [f"# HELP {PREFIX}_{name} {help_text}", f"# TYPE {PREFIX}_{name} {kind}"] + series[name]
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        active = self.active_sessions()
+        with self._lock:
+            counters = defaultdict(list)
+            for (name, labels), value in sorted(self._counters.items()):
+                counters[name].append({**dict(labels), "value": value})
+            latency = defaultdict(list)
+            for (name, labels), h in sorted(self._histograms.items(), key=lambda item: item[0]):
+                ordered = sorted(h.recent)
+                latency[name].append({
+                    **dict(labels), "count": h.count,
+                    **{f"p{pct}_ms": round(_percentile(ordered, pct) * 1000, 3) for pct in (50, 95, 99)},
+                })
+            slow_turns = list(self._slow_turns)
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "active_sessions": active,
+            "counters": dict(counters),
+            "latency": dict(latency),
+            "slow_turns": slow_turns,
+        }
+
+
+registry = Registry()
+
+
+# --- SLOW-TURN PROFILER ---
+def _folded(frame):
+    names = []
+    while frame is not None and len(names) < PROFILE_DEPTH:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SlowTurnProfiler:
+    # One daemon thread samples the stacks of every thread that is inside a stage
+    # of a watched span; it sleeps while no turn is running. A span is watched only
+    # while one of its stages is open, so a turn abandoned mid-stage (exception,
+    # Streamlit rerun, client disconnect) is unwatched by the stage's finally; a stage
+    # left open in a generator that is never closed ages out after PROFILE_MAX_AGE.
+    def __init__(self, interval=PROFILE_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._spans = set()
+        self._busy = threading.Event()
+        self._thread = None
+
+    def watch(self, span):
+        with self._lock:
+            self._spans.add(span)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="metrics-profiler", daemon=True)
+                self._thread.start()
+        self._busy.set()
+
+    def unwatch(self, span):
+        with self._lock:
+            self._spans.discard(span)
+
+    def _run(self):
+        me = threading.get_ident()
+        while True:
+            self._busy.wait()
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            now = time.perf_counter()
+            with self._lock:
+                self._spans = {span for span in self._spans if now - span.start < PROFILE_MAX_AGE}
+                if not self._spans:
+                    self._busy.clear()
+                    continue
+                for span in self._spans:
+                    for ident in tuple(span.threads):
+                        frame = frames.get(ident)
+                        if frame is not None and ident != me:
+                            span.samples[_folded(frame)] += 1
+
+
+profiler = SlowTurnProfiler() if PROFILE_SLOW_MS > 0 else None
+
+
+# --- TURN SPANS ---
+class TurnSpan:
+    # engine.Engine(spans=TurnSpan): one per turn. stage() may be entered from any
+    # thread (api.py streams a turn across its thread pool); finish() is called once
+    # the turn is committed. A turn that is never committed is not counted.
+    def __init__(self, mode):
+        self.mode = mode
+        self.start = time.perf_counter()
+        self.stages = defaultdict(float)
+        self.threads = Counter()  # thread ident -> open stages on it
+        self.samples = Counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        ident = threading.get_ident()
+        with self._lock:
+            self.threads[ident] += 1
+            if profiler is not None and sum(self.threads.values()) == 1:
+                profiler.watch(self)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.threads[ident] -= 1
+                if not self.threads[ident]:
+                    del self.threads[ident]
+                if profiler is not None and not self.threads:
+                    profiler.unwatch(self)
+                self.stages[name] += elapsed
+
+    def finish(self, turn):
+        # Stages are observed per turn: a mock turn streams two LLM parts, one "llm" total.
+        total = time.perf_counter() - self.start
+        for name, seconds in self.stages.items():
+            registry.observe("turn_stage_seconds", seconds, {"mode": self.mode, "stage": name})
+        registry.observe("turn_seconds", total, {"mode": self.mode})
+        registry.inc("turns_total", {"mode": self.mode, "local": str(turn.local).lower()})
+        if profiler is None:
+            return
+        if total * 1000 >= PROFILE_SLOW_MS:
+            registry.inc("slow_turns_total", {"mode": self.mode})
+            registry.add_slow_turn({
+                "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "mode": self.mode,
+                "total_ms": round(total * 1000, 1),
+                "stages_ms": {stage: round(s * 1000, 2) for stage, s in self.stages.items()},
+                "samples": sum(self.samples.values()),
+                "interval_ms": profiler.interval * 1000,
+                "stacks": [f"{stack} {n}" for stack, n in self.samples.most_common(PROFILE_TOP)],
+            })
+
+
+def record_llm(label, model, latency, ttft, prompt_tokens, completion_tokens):
+    labels = {"route": label, "model": model}
+    registry.inc("llm_requests_total", labels)
+    registry.inc("llm_prompt_tokens_total", labels, prompt_tokens)
+    registry.inc("llm_completion_tokens_total", labels, completion_tokens)
+    registry.observe("llm_seconds", latency, {"route": label})
+    registry.observe("llm_ttft_seconds", ttft, {"route": label})
+
+
+def prometheus_text():
+    return registry.prometheus_text()
+
+
+def snapshot():
+    return registry.snapshot()
+
+
+# --- STANDALONE EXPORTER ---
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scraped every few seconds; keep the app's log clean
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve(port=METRICS_PORT):
+    # Serves GET /metrics from a daemon thread; once per process, no-op if port is 0.
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer(("0.0.0.0", port), _Handler)
+            threading.Thread(target=_server.serve_forever, name="metrics-exporter", daemon=True).start()
+    return _server
@@ -0,0 +1,227 @@
+# mock_interview.py
+# Mock interview answer turns are two calls: a short verdict on the answer
+# (mock.feedback, fast model) and the next question (mock.question, 70B). The next
+# question doesn't depend on the answer, only on the role/stack and the questions
+# already asked, so as soon as those are known it is generated speculatively in a
+# background thread while the candidate is still typing. On submit the verdict
+# streams and the question is usually already waiting. Stacks covered by the
+# prebuilt question bank (question_bank.py) only need the verdict call. A speculation
+# still waiting for quota on submit is withdrawn rather than waited on: it queues at
+# the lowest priority, so the question is asked for again at mock priority.
+# Speculation is tracked per process (hits, misses, waste) so it can be switched off
+# with MOCK_SPECULATION=0 if it doesn't pay for itself.
+import os
+import re
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+import llm_client
+from llm_client import stream_text
+from prompts import MOCK_FEEDBACK_PROMPT, MOCK_QUESTION_PROMPT
+from question_bank import next_question
+from scheduler import Ticket
+from skills import normalize_stack
+from tokens import estimate_tokens, messages_tokens
+
+SPECULATE = os.getenv("MOCK_SPECULATION", "1") != "0"
+SPECULATION_WORKERS = 4
+PROFILE_CHARS = 300
+ASKED_LIMIT = 15   # earlier questions listed in the prompt so they aren't repeated
+ASKED_CHARS = 200
+
+_QUESTION = re.compile(r"\*\*Question (\d+):\*\*\s*(.+)\Z", re.S)
+
+
+def interview_profile(history):
+    # The candidate's own words up to the first message that names a known skill,
+    # e.g. "Backend developer" + "Python, Django and Postgres". None until then.
+    said = []
+    for msg in history:
+        if isinstance(msg, HumanMessage):
+            said.append(" ".join(msg.content.split()))
+            if normalize_stack(msg.content):
+                return " / ".join(said)[:PROFILE_CHARS]
+    return None
+
+
+def asked_questions(history):
+    questions = []
+    for msg in history:
+        if isinstance(msg, AIMessage):
+            match = _QUESTION.search(msg.content)
+            if match:
+                questions.append(match.group(2).strip())
+    return questions
+
+
+def answered_questions(history):
+    # (question, answer) for every bank/LLM question the candidate has replied to.
+    pairs = []
+    pending = None
+    for msg in history:
+        if isinstance(msg, AIMessage):
+            match = _QUESTION.search(msg.content)
+            pending = match.group(2).strip() if match else None
+        elif isinstance(msg, HumanMessage) and pending:
+            pairs.append((pending, msg.content))
+            pending = None
+    return pairs
+
+
+def question_heading(number):
+    return f"**Question {number}:**"
+
+
+def format_reply(feedback, number, question):
+    heading = f"{question_heading(number)} {question.strip()}"
+    return f"{feedback.strip()}\n\n---\n\n{heading}" if feedback else heading
+
+
+def question_request(profile, asked):
+    recent = asked[-ASKED_LIMIT:]
+    listed = "".join(f"- {q[:ASKED_CHARS]}\n" for q in recent)
+    asked_text = f"\nAlready asked (don't repeat or rephrase these):\n{listed}" if recent else ""
+    return [
+        SystemMessage(content=MOCK_QUESTION_PROMPT.format(profile=profile, asked=asked_text)),
+        HumanMessage(content="Next question, please."),
+    ]
+
+
+def feedback_request(question, answer):
+    return [SystemMessage(content=MOCK_FEEDBACK_PROMPT), AIMessage(content=question), HumanMessage(content=answer)]
+
+
+class SpeculationStats:
+    # hit: the speculative question was used. miss: the question had to be generated
+    # on submit (nothing speculated, withdrawn, or it failed). withdrawn: still queued
+    # on submit, so it was never sent. wasted: not used because the context no longer
+    # applied or the session was reset or abandoned (no tokens if it was never sent).
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.failed = 0
+        self.withdrawn = 0
+        self.wasted = 0
+        self.wasted_tokens = 0
+        self.saved_s = 0.0
+        self.waited_s = 0.0
+
+    def record(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def snapshot(self):
+        with self._lock:
+            served = self.hits + self.misses
+            return {
+                "enabled": SPECULATE,
+                "started": self.started,
+                "hits": self.hits,
+                "misses": self.misses,
+                "failed": self.failed,
+                "withdrawn": self.withdrawn,
+                "wasted": self.wasted,
+                "hit_rate": round(self.hits / served, 3) if served else 0.0,
+                "waste_rate": round(self.wasted / self.started, 3) if self.started else 0.0,
+                "wasted_tokens": self.wasted_tokens,
+                "avg_saved_s": round(self.saved_s / self.hits, 3) if self.hits else 0.0,
+                "avg_wait_s": round(self.waited_s / self.hits, 3) if self.hits else 0.0,
+            }
+
+
+speculation_stats = SpeculationStats()
+_executor = ThreadPoolExecutor(max_workers=SPECULATION_WORKERS, thread_name_prefix="mock-speculation")
+
+
+def _generate(llm, messages, ticket):
+    start = time.perf_counter()
+    text = "".join(stream_text(llm, messages, "mock", "question", speculative=True, ticket=ticket))
+    return text, time.perf_counter() - start
+
+
+def _withdraw(future, ticket):
+    # True if the call hadn't been sent yet and now never will be: not started by the
+    # executor, or still waiting in the scheduler.
+    return future.cancel() or llm_client.scheduler.withdraw(ticket)
+
+
+def _waste(future, ticket, prompt_tokens):
+    if _withdraw(future, ticket):
+        speculation_stats.record(wasted=1)
+        return
+    tokens = prompt_tokens
+    if future.done() and future.exception() is None:
+        tokens += estimate_tokens(future.result()[0])
+    speculation_stats.record(wasted=1, wasted_tokens=tokens)
+
+
+class Speculation:
+    # One pending next question for one session, valid for (profile, questions asked).
+    def __init__(self, llm, profile, asked):
+        self.key = (profile, len(asked))
+        messages = question_request(profile, asked)
+        self.prompt_tokens = messages_tokens(messages)
+        self.ticket = Ticket()
+        self.future = _executor.submit(_generate, llm, messages, self.ticket)
+        # A session that is reset or simply closed never takes its question.
+        self._finalizer = weakref.finalize(self, _waste, self.future, self.ticket, self.prompt_tokens)
+        speculation_stats.record(started=1)
+
+    def take(self, profile, asked):
+        # The question if it was speculated for this exact context (waiting for it if
+        # it is already being generated), else None. Either way it is used up.
+        self._finalizer.detach()
+        if self.key != (profile, len(asked)):
+            _waste(self.future, self.ticket, self.prompt_tokens)
+            return None
+        if not self.future.done() and _withdraw(self.future, self.ticket):
+            speculation_stats.record(withdrawn=1)
+            return None
+        start = time.perf_counter()
+        try:
+            text, seconds = self.future.result()
+        except Exception:
+            speculation_stats.record(failed=1)
+            return None
+        waited = time.perf_counter() - start
+        if not text.strip():
+            speculation_stats.record(failed=1)
+            return None
+        speculation_stats.record(hits=1, waited_s=waited, saved_s=max(0.0, seconds - waited))
+        return text
+
+    def discard(self):
+        if self._finalizer.detach():
+            _waste(self.future, self.ticket, self.prompt_tokens)
+
+
+def speculate(current, llm, history, seed):
+    # Called whenever the mock pane renders: keeps exactly one speculation in flight
+    # for the session's current context. Returns the (possibly new) speculation.
+    profile = interview_profile(history)
+    if not SPECULATE or profile is None:
+        return current
+    asked = asked_questions(history)
+    if not asked or next_question(profile, asked, seed) is not None:
+        return current  # asked right after setup, or the question bank has the next one
+    if current is not None:
+        if current.key == (profile, len(asked)):
+            return current
+        current.discard()
+    return Speculation(llm, profile, asked)
+
+
+def take_question(speculation, profile, asked):
+    if speculation is not None:
+        question = speculation.take(profile, asked)
+        if question is not None:
+            return question
+    speculation_stats.record(misses=1)
+    return None
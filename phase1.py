@@ -0,0 +1,261 @@
+# phase1.py
+# Local state machine for Phase 1 (data collection) of the screening. Answers that
+# clearly satisfy or clearly fail a field's validation get the scripted ask/fallback
+# from SYSTEM_PROMPT without an LLM round trip; anything free-form or ambiguous is
+# handed to the LLM, which also owns Phase 2.
+import re
+from dataclasses import dataclass, field
+
+from extractor import asked_field
+from prompt_builder import PENDING, PHASE1_FIELDS
+from prompts import PHASE1_FIELD_SECTIONS
+
+# --- SCRIPTS (parsed from the prompt so the wording lives in one place) ---
+_SCRIPT_LINE = re.compile(r'^\s*- \*(Initial Ask|Fallback|Acceptance|Encouragement):\*.*"([^"]+)"\s*$', re.M)
+
+
+def _parse_scripts():
+    scripts = {}
+    for name, section in PHASE1_FIELD_SECTIONS.items():
+        script = {"ask": None, "fallbacks": [], "accept": None}
+        for kind, text in _SCRIPT_LINE.findall(section):
+            if kind == "Initial Ask":
+                script["ask"] = text
+            elif kind == "Fallback":
+                script["fallbacks"].append(text)
+            else:
+                script["accept"] = text
+        scripts[name] = script
+    return scripts
+
+
+SCRIPTS = _parse_scripts()
+
+# Fallback indexes, in the order they appear in each field's section.
+NAME_SINGLE, NAME_GIBBERISH = 0, 1
+EMAIL_INVALID, EMAIL_ERRORS = 0, 1
+PHONE_LENGTH, PHONE_LETTERS = 0, 1
+EXPERIENCE_VAGUE, EXPERIENCE_UNREALISTIC = 0, 1
+ROLE_VAGUE = 0
+LOCATION_VAGUE = 0
+STACK_GENERIC, STACK_SINGLE, STACK_NON_TECH = 0, 1, 2
+
+# After this many scripted fallbacks on one field the LLM takes over, since the
+# prompt's "if repeated" handling needs judgement.
+MAX_FALLBACKS = 2
+
+# --- VALIDATION ---
+ACCEPT, FALLBACK, HANDOFF = "accept", "fallback", "handoff"
+
+EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}$")
+PHONE_RE = re.compile(r"\+?\(?\d[\d\s().-]{5,}\d")
+NUMBER_RE = re.compile(r"\b(\d{1,3}(?:\.\d+)?)\b")
+NAME_PREFIX_RE = re.compile(r"^(?:my name is|my name's|i am|i'm|im|this is|it's|name:)\s+", re.I)
+NAME_WORD_RE = re.compile(r"^[^\W\d_](?:[^\W\d_]|['.-])*$")
+
+# Zero experience: any of these phrases as whole words, or one of the short answers as
+# the whole reply ("none of your business" is not a zero).
+ZERO_WORDS_RE = re.compile(
+    r"\b(?:fresher|fresh graduate|fresh out of|zero|no (?:prior |professional |work )?experience"
+    r"|entry[ -]level|just starting|recent graduate|graduate)\b"
+)
+ZERO_ANSWERS = {"nil", "none", "none yet", "no", "not yet", "n/a"}
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+    "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fifteen": 15, "twenty": 20,
+}
+ROLE_WORDS = {
+    "developer", "engineer", "engineering", "development", "programmer", "scientist", "analyst",
+    "architect", "devops", "sre", "frontend", "front-end", "backend", "back-end", "fullstack",
+    "full-stack", "stack", "data", "ml", "ai", "mobile", "android", "ios", "cloud", "security",
+    "qa", "tester", "sdet", "dba", "administrator", "platform", "infrastructure", "web", "game",
+    "embedded", "intern", "lead", "manager", "designer", "researcher", "consultant",
+}
+VAGUE_ANSWERS = {
+    "anything", "any", "anywhere", "whatever", "idk", "not sure", "dunno", "tech", "it",
+    "software", "something", "somewhere", "here", "home", "earth", "everything", "job",
+}
+GENERIC_STACK = {"it", "coding", "programming", "software", "computers", "tech", "development", "everything"}
+NON_TECH_STACK = {"microsoft word", "word", "excel", "ms excel", "powerpoint", "ms office", "office", "outlook", "typing"}
+STACK_SPLIT_RE = re.compile(r"\s*(?:,|/|;|\band\b|&|\+|\n)\s*", re.I)
+STACK_FILLER_RE = re.compile(r"\b(?:a (?:little )?bit of|a little|some|mostly|mainly|also|basic)\s+", re.I)
+GREETINGS = {"hi", "hello", "hey", "yo", "hola", "namaste", "good morning", "good evening", "ok", "okay", "yes", "sure"}
+
+
+def _is_question(text):
+    return "?" in text
+
+
+def validate_name(text, state):
+    name = NAME_PREFIX_RE.sub("", text.strip()).strip(" .!")
+    words = name.split()
+    if name.lower() in GREETINGS or "," in name or len(words) > 4:
+        return HANDOFF, None
+    if any(ch.isdigit() for ch in name) or "@" in name or not all(NAME_WORD_RE.match(w) for w in words):
+        return FALLBACK, NAME_GIBBERISH
+    if not words:
+        return FALLBACK, NAME_GIBBERISH
+    if len(words) == 1:
+        if state.partial_name and state.partial_name.lower() != name.lower():
+            return ACCEPT, f"{state.partial_name} {name.title() if name.islower() else name}"
+        state.partial_name = name.title() if name.islower() else name
+        return FALLBACK, NAME_SINGLE
+    return ACCEPT, " ".join(w.title() if w.islower() else w for w in words)
+
+
+def validate_email(text, state):
+    candidate = text.strip().strip(".")
+    tokens = [t.strip("<>.,;") for t in candidate.split() if "@" in t]
+    if len(tokens) == 1 and EMAIL_RE.match(tokens[0]):
+        return ACCEPT, tokens[0]
+    if tokens:
+        return FALLBACK, EMAIL_INVALID
+    if len(candidate.split()) <= 2:
+        return FALLBACK, EMAIL_ERRORS
+    return HANDOFF, None
+
+
+def validate_phone(text, state):
+    match = PHONE_RE.search(text)
+    if not match:
+        if not any(ch.isdigit() for ch in text):
+            return HANDOFF, None
+        if any(ch.isalpha() for ch in text):
+            return FALLBACK, PHONE_LETTERS
+        return FALLBACK, PHONE_LENGTH
+    # Letters glued to the number (e.g. "98765abc21") rather than surrounding words.
+    rest = text.replace(match.group(0), " ")
+    if re.search(r"\d[A-Za-z]|[A-Za-z]\d", text) or len(rest.split()) > 6:
+        return FALLBACK, PHONE_LETTERS
+    digits = re.sub(r"\D", "", match.group(0))
+    if not 10 <= len(digits) <= 15:
+        return FALLBACK, PHONE_LENGTH
+    return ACCEPT, match.group(0).strip()
+
+
+def validate_experience(text, state):
+    lowered = text.lower().strip(" .!")
+    # An explicit number wins over any zero-sounding word ("4 years, mostly refreshing...")
+    numbers = NUMBER_RE.findall(lowered)
+    if not numbers:
+        numbers = [str(NUMBER_WORDS[w]) for w in re.findall(r"[a-z]+", lowered) if w in NUMBER_WORDS]
+    if not numbers and (lowered in ZERO_ANSWERS or ZERO_WORDS_RE.search(lowered)):
+        return ACCEPT, "0"
+    if len(numbers) == 1:
+        years = float(numbers[0])
+        if years > 50:
+            return FALLBACK, EXPERIENCE_UNREALISTIC
+        return ACCEPT, numbers[0]
+    if numbers or len(lowered.split()) > 8:
+        return HANDOFF, None
+    return FALLBACK, EXPERIENCE_VAGUE
+
+
+def validate_role(text, state):
+    role = text.strip(" .!")
+    lowered = role.lower()
+    if lowered in VAGUE_ANSWERS:
+        return FALLBACK, ROLE_VAGUE
+    words = set(re.findall(r"[a-z+#.-]+", lowered))
+    if words & ROLE_WORDS and len(role.split()) <= 6:
+        return ACCEPT, role
+    return HANDOFF, None
+
+
+def validate_location(text, state):
+    location = text.strip(" .!")
+    lowered = location.lower()
+    if lowered in VAGUE_ANSWERS:
+        return FALLBACK, LOCATION_VAGUE
+    words = location.replace(",", " ").split()
+    if 1 <= len(words) <= 5 and all(w.replace("-", "").replace(".", "").isalpha() for w in words):
+        return ACCEPT, location
+    return HANDOFF, None
+
+
+def validate_stack(text, state):
+    stack = text.strip(" .!")
+    lowered = stack.lower()
+    if lowered in GENERIC_STACK:
+        return FALLBACK, STACK_GENERIC
+    if lowered in NON_TECH_STACK:
+        return FALLBACK, STACK_NON_TECH
+    items = [i for i in STACK_SPLIT_RE.split(STACK_FILLER_RE.sub("", stack)) if i]
+    if len(items) == 1 and len(stack.split()) <= 2:
+        return FALLBACK, STACK_SINGLE
+    if len(items) >= 2 and all(len(i.split()) <= 4 for i in items):
+        return ACCEPT, ", ".join(items)
+    return HANDOFF, None
+
+
+VALIDATORS = {
+    "Name": validate_name,
+    "Email": validate_email,
+    "Phone": validate_phone,
+    "Experience": validate_experience,
+    "Role": validate_role,
+    "Location": validate_location,
+    "Stack": validate_stack,
+}
+
+@dataclass
+class Phase1Result:
+    reply: str = None           # scripted text to send; None means hand off to the LLM
+    captured: dict = field(default_factory=dict)
+
+
+class Phase1Engine:
+    def __init__(self):
+        self.expecting = "Name"  # the screening intro asks for the full name
+        self.partial_name = None
+        self.fallbacks = {}
+        self.local_turns = 0
+        self.handoffs = 0
+
+    def _next_pending(self, candidate_data):
+        for name in PHASE1_FIELDS:
+            if candidate_data.get(name, PENDING) == PENDING:
+                return name
+        return None
+
+    def handle(self, text, candidate_data):
+        expecting = self.expecting
+        if expecting is None or candidate_data.get(expecting, PENDING) != PENDING or _is_question(text):
+            return self._handoff()
+
+        status, value = VALIDATORS[expecting](text, self)
+        if status == ACCEPT:
+            captured = {expecting: value}
+            pending = dict(candidate_data, **captured)
+            following = self._next_pending(pending)
+            if following is None:
+                # Last field: Phase 2 starts, which is the LLM's job.
+                self.expecting = None
+                return Phase1Result(captured=captured)
+            reply = SCRIPTS[following]["ask"]
+            if expecting == "Experience" and value == "0":
+                reply = f"{SCRIPTS['Experience']['accept']} {reply}"
+            self.expecting = following
+            self.local_turns += 1
+            return Phase1Result(reply=reply, captured=captured)
+
+        if status == FALLBACK:
+            used = self.fallbacks.get(expecting, 0)
+            if used < MAX_FALLBACKS:
+                self.fallbacks[expecting] = used + 1
+                self.local_turns += 1
+                return Phase1Result(reply=SCRIPTS[expecting]["fallbacks"][value])
+        return self._handoff()
+
+    def _handoff(self):
+        self.handoffs += 1
+        return Phase1Result()
+
+    def sync(self, reply, candidate_data):
+        # After an LLM turn, resume only if the reply clearly asks for a pending field.
+        asked = asked_field(reply)
+        pending = asked is not None and candidate_data.get(asked, PENDING) == PENDING
+        self.expecting = asked if pending else None
+
+    def stats(self):
+        return {"local_turns": self.local_turns, "llm_handoffs": self.handoffs}
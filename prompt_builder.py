@@ -0,0 +1,97 @@
+# prompt_builder.py
+from itertools import combinations
+
+from langchain_core.messages import SystemMessage
+
+from prompts import (
+    CLOSING_SECTION,
+    FALLBACK_SECTION,
+    PERSONA_SECTION,
+    PHASE1_FIELD_SECTIONS,
+    PHASE1_HEADER,
+    PHASE2_PLAN_DONE,
+    PHASE2_PLAN_SECTION,
+    PHASE2_SECTION,
+    TONE_SECTION,
+    TRACKING_SECTION,
+    WELCOME_SECTION,
+)
+
+PENDING = "Pending..."
+PHASE1_FIELDS = tuple(PHASE1_FIELD_SECTIONS)
+
+# The closing message in CLOSING_SECTION opens with this phrase; once the bot has
+# sent it, only the closing protocol is needed for the rest of the session.
+CLOSING_MARKER = "that's a wrap"
+
+# Field capture is heuristic: if it misses fields the candidate did give, Phase 1
+# never ends by itself, so after this many LLM-handled turns Phase 2 rides along.
+PHASE2_AFTER_LLM_TURNS = 3
+
+
+def _assemble(phase, pending, with_phase2=False):
+    parts = [PERSONA_SECTION]
+    if phase == "phase1":
+        if len(pending) == len(PHASE1_FIELDS):
+            parts.append(WELCOME_SECTION)
+        parts.append(PHASE1_HEADER)
+        parts.extend(PHASE1_FIELD_SECTIONS[field] for field in pending)
+        # Near the end of Phase 1 the model may need to transition on this very
+        # turn, and field capture is heuristic, so Phase 2 rides along.
+        if len(pending) <= 1 or with_phase2:
+            parts.append(PHASE2_SECTION)
+        parts.extend([FALLBACK_SECTION, TRACKING_SECTION])
+    elif phase == "phase2":
+        parts.extend([PHASE2_SECTION, FALLBACK_SECTION, CLOSING_SECTION, TRACKING_SECTION])
+    else:
+        parts.append(CLOSING_SECTION)
+    parts.append(TONE_SECTION)
+    return SystemMessage(content="\n" + "".join(parts))
+
+
+def _precompute():
+    variants = {("phase2", (), False): _assemble("phase2", ()), ("closing", (), False): _assemble("closing", ())}
+    for size in range(1, len(PHASE1_FIELDS) + 1):
+        for pending in combinations(PHASE1_FIELDS, size):
+            for with_phase2 in (False, True):
+                variants[("phase1", pending, with_phase2)] = _assemble("phase1", pending, with_phase2)
+    return variants
+
+
+# Every (phase, pending fields, Phase 2 fallback) combination is built once at import
+# (256 variants), so picking the prompt for a turn is a tuple build and a dict lookup.
+_VARIANTS = _precompute()
+
+
+def pending_fields(candidate_data):
+    return tuple(f for f in PHASE1_FIELDS if candidate_data.get(f, PENDING) == PENDING)
+
+
+def detect_phase(candidate_data, closed=False):
+    if closed:
+        return "closing"
+    return "phase1" if pending_fields(candidate_data) else "phase2"
+
+
+def build_system_prompt(candidate_data, closed=False, llm_turns=0):
+    # llm_turns: screening turns the LLM has handled so far (Phase1Engine.handoffs).
+    phase = detect_phase(candidate_data, closed)
+    pending = pending_fields(candidate_data) if phase == "phase1" else ()
+    return _VARIANTS[(phase, pending, phase == "phase1" and llm_turns >= PHASE2_AFTER_LLM_TURNS)]
+
+
+def with_question_plan(system, plan, asked):
+    # Phase 2 with questions from the bank (see question_bank.py): the model asks
+    # the remaining ones verbatim instead of writing its own.
+    remaining = [q for q in plan if q not in asked]
+    if remaining:
+        section = PHASE2_PLAN_SECTION.format(
+            total=len(plan), remaining="\n".join(f"{i}. {q}" for i, q in enumerate(remaining, len(plan) - len(remaining) + 1))
+        )
+    else:
+        section = PHASE2_PLAN_DONE.format(total=len(plan))
+    return SystemMessage(content=system.content + "\n" + section)
+
+
+def is_closing_reply(text):
+    return CLOSING_MARKER in text.lower()
@@ -0,0 +1,333 @@
+# question_bank.py
+# Pre-generated technical questions per (skill, experience tier), so the screening's
+# Phase 2 and the mock coach don't generate the same Python/React/AWS questions live
+# for every candidate. The LLM is left with acknowledgements and follow-ups.
+#
+# assets/question_bank.jsonl is the editable source ({"skill", "tier", "question"}
+# per line, skills are canonical ids from skills.py). It is compiled into
+# assets/question_bank.bin: a small JSON header mapping each skill to its per-tier
+# id ranges, a uint32 offset table and one UTF-8 blob, so loading is a file read and
+# a question is only decoded when it is asked.
+#   python -m question_bank generate --skills "Python, React" --per-group 10
+#   python -m question_bank generate --top 20      # most common skills in the candidate index
+#   python -m question_bank compile
+import argparse
+import json
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from array import array
+from zlib import crc32
+
+from candidates import experience_years
+from prompts import PHASE2_SECTION
+from skills import SKILL_INDEX, normalize_stack
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+SOURCE_PATH = os.path.join(ASSETS_DIR, "question_bank.jsonl")
+BANK_PATH = os.getenv("QUESTION_BANK_PATH", os.path.join(ASSETS_DIR, "question_bank.bin"))
+
+# Experience tiers from PHASE2_SECTION.
+TIERS = ("0-2", "3-5", "6+")
+TIER_GUIDANCE = (
+    "They are early in their career: ask about core concepts and practical scenarios.",
+    "They have solid experience: ask about their approach to real problems, trade-offs and debugging.",
+    "They are senior: ask about architectural and design decisions at scale.",
+)
+DEFAULT_TIER = 1  # mock interviews don't ask for experience
+SCREENING_QUESTIONS = 4  # within the prompt's 3-5
+
+# The model may add a lead-in or trim a question; it counts as asked once most of
+# its distinctive words appear in one bot message.
+ASKED_OVERLAP = 0.6
+_WORD = re.compile(r"[a-z0-9+#.]{5,}")
+_TRANSITION = re.compile(r'\*\*Transition Message:\*\*\s*\n"(.+?)"', re.S)
+_STACK_PLACEHOLDER = "[mention their specific tech stack]"
+_YEARS_MENTION = re.compile(r"(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\b", re.I)
+
+MAGIC = b"TSQB"
+VERSION = 1
+_HEADER = struct.Struct("<4sHI")  # magic, version, JSON header length
+
+
+def tier_for(experience):
+    # "2", "3.5 years", 7 -> tier index; unknown -> DEFAULT_TIER.
+    years = experience if isinstance(experience, (int, float)) else experience_years(experience)
+    if years is None:
+        return DEFAULT_TIER
+    return 0 if years < 3 else 1 if years < 6 else 2
+
+
+def _normalized(text):
+    return " ".join(text.lower().split())
+
+
+def read_source(path=SOURCE_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compile_bank(records):
+    # records: dicts with "skill", "tier" and "question" -> bytes of the .bin format.
+    groups = {}
+    seen = set()
+    for record in records:
+        skill, tier, question = record["skill"], record["tier"], " ".join(record["question"].split())
+        if skill not in SKILL_INDEX:
+            raise ValueError(f"Unknown skill {skill!r} in question bank (see skills.SKILL_ALIASES)")
+        if tier not in TIERS:
+            raise ValueError(f"Unknown tier {tier!r} in question bank, expected one of {TIERS}")
+        if _normalized(question) in seen:
+            continue
+        seen.add(_normalized(question))
+        groups.setdefault(skill, [[] for _ in TIERS])[TIERS.index(tier)].append(question)
+
+    texts, ranges = [], {}
+    for skill in sorted(groups):
+        ranges[skill] = []
+        for questions in groups[skill]:
+            ranges[skill].append([len(texts), len(texts) + len(questions)])
+            texts.extend(questions)
+    encoded = [t.encode("utf-8") for t in texts]
+    offsets = array("I", [0])
+    for chunk in encoded:
+        offsets.append(offsets[-1] + len(chunk))
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    header = json.dumps({"count": len(texts), "skills": ranges}, separators=(",", ":")).encode("utf-8")
+    return _HEADER.pack(MAGIC, VERSION, len(header)) + header + offsets.tobytes() + b"".join(encoded)
+
+
+class QuestionBank:
+    def __init__(self, data):
+        magic, version, header_len = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a question bank file (or an unsupported version)")
+        start = _HEADER.size
+        header = json.loads(data[start:start + header_len])
+        self.count = header["count"]
+        self._groups = {skill: [range(a, b) for a, b in tiers] for skill, tiers in header["skills"].items()}
+        start += header_len
+        self._offsets = array("I")
+        self._offsets.frombytes(data[start:start + 4 * (self.count + 1)])
+        if sys.byteorder == "big":
+            self._offsets.byteswap()
+        self._blob = memoryview(data)[start + 4 * (self.count + 1):]
+        self._ids = None  # text -> id, built on the first lookup
+        self._lock = threading.Lock()
+        self.served = 0
+        self.fallbacks = 0
+
+    @classmethod
+    def load(cls, path=BANK_PATH):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def skills(self):
+        return sorted(self._groups)
+
+    def text(self, question_id):
+        return bytes(self._blob[self._offsets[question_id]:self._offsets[question_id + 1]]).decode("utf-8")
+
+    def id_of(self, text):
+        if self._ids is None:
+            self._ids = {_normalized(self.text(i)): i for i in range(self.count)}
+        return self._ids.get(_normalized(text))
+
+    def skill_of(self, question_id):
+        for skill, tiers in self._groups.items():
+            if any(question_id in ids for ids in tiers):
+                return skill
+        return None
+
+    def group(self, skill, tier):
+        # Ids for (skill, tier), falling back to the nearest tier that has questions.
+        tiers = self._groups.get(skill)
+        if not tiers:
+            return range(0)
+        for t in sorted(range(len(TIERS)), key=lambda t: abs(t - tier)):
+            if tiers[t]:
+                return tiers[t]
+        return range(0)
+
+    def select(self, skills, tier, count, exclude=(), seed=""):
+        # Up to `count` distinct ids, round-robin over the candidate's skills in the
+        # order they listed them. Each skill's group is walked from a seed-dependent
+        # offset, so sessions get different questions but a session (seeded by its
+        # token) always gets the same ones. Already-asked ids are skipped.
+        groups = [(skill, g) for skill in skills if (g := self.group(skill, tier))]
+        if not groups or count <= 0:
+            return []
+        exclude = set(exclude)
+        offsets = [crc32(f"{seed}:{skill}".encode()) % len(g) for skill, g in groups]
+        first = len(exclude) % len(groups)  # successive single picks rotate skills
+        order = groups[first:] + groups[:first]
+        offsets = offsets[first:] + offsets[:first]
+        picked = []
+        for step in range(max(len(g) for _, g in groups)):
+            for (_, g), offset in zip(order, offsets):
+                if step < len(g):
+                    question_id = g[(offset + step) % len(g)]
+                    if question_id not in exclude:
+                        picked.append(question_id)
+                        exclude.add(question_id)
+                        if len(picked) == count:
+                            return picked
+        return picked
+
+    def record(self, served):
+        with self._lock:
+            if served:
+                self.served += 1
+            else:
+                self.fallbacks += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "questions": self.count,
+                "skills": len(self._groups),
+                "served": self.served,
+                "llm_fallbacks": self.fallbacks,
+            }
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank():
+    # One bank per process. A missing or stale .bin is compiled in memory from the
+    # source file (run `python -m question_bank compile` to write it).
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                stale = not os.path.exists(BANK_PATH) or (
+                    os.path.exists(SOURCE_PATH) and os.path.getmtime(SOURCE_PATH) > os.path.getmtime(BANK_PATH)
+                )
+                _bank = QuestionBank(compile_bank(read_source())) if stale else QuestionBank.load()
+    return _bank
+
+
+def screening_plan(candidate_data, seed):
+    # The Phase 2 questions for a candidate, or [] if the bank doesn't cover their stack.
+    bank = get_question_bank()
+    ids = bank.select(normalize_stack(candidate_data.get("Stack")), tier_for(candidate_data.get("Experience")),
+                      SCREENING_QUESTIONS, seed=seed)
+    bank.record(served=bool(ids))
+    return [bank.text(i) for i in ids]
+
+
+def asked_questions(plan, bot_messages):
+    # Which planned questions already appear in the bot's messages.
+    seen = [set(_WORD.findall(m.lower())) for m in bot_messages]
+    asked = []
+    for question in plan:
+        words = set(_WORD.findall(question.lower()))
+        if any(len(words & m) >= ASKED_OVERLAP * len(words) for m in seen):
+            asked.append(question)
+    return asked
+
+
+def phase2_opening(stack, question):
+    # PHASE2_SECTION's transition message followed by the first planned question, so
+    # the turn that completes Phase 1 needs no LLM call.
+    transition = _TRANSITION.search(PHASE2_SECTION).group(1)
+    return f"{transition.replace(_STACK_PLACEHOLDER, stack)}\n\n{question}"
+
+
+def next_question(profile, asked, seed):
+    # The next mock interview question from the bank, or None once it runs out.
+    bank = get_question_bank()
+    exclude = [i for i in (bank.id_of(q) for q in asked) if i is not None]
+    years = _YEARS_MENTION.search(profile)  # free text: "k8s" is not 8 years
+    tier = tier_for(float(years.group(1))) if years else DEFAULT_TIER
+    picked = bank.select(normalize_stack(profile), tier, 1, exclude=exclude, seed=seed)
+    return bank.text(picked[0]) if picked else None
+
+
+# --- OFFLINE BUILD ---
+def generate(skills, per_group, api_key, path=SOURCE_PATH):
+    # One large-model call per (skill, tier); new questions are appended to the source.
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    from llm_client import get_llm, stream_text
+    from prompts import QUESTION_BANK_PROMPT
+    from router import MODEL_TIERS
+
+    llm = get_llm(api_key, MODEL_TIERS["large"])
+    seen = {_normalized(r["question"]) for r in read_source(path)}
+    added = 0
+    with open(path, "a", encoding="utf-8") as out:
+        for skill in skills:
+            for tier, guidance in zip(TIERS, TIER_GUIDANCE):
+                prompt = QUESTION_BANK_PROMPT.format(count=per_group, skill=skill, tier=tier, guidance=guidance)
+                messages = [SystemMessage(content=prompt), HumanMessage(content=f"{skill}, {tier} years")]
+                start = time.perf_counter()
+                text = "".join(stream_text(llm, messages, "role_insight", "question_bank"))
+                new = 0
+                for line in text.splitlines():
+                    question = line.strip().lstrip("-*0123456789.) ").strip()
+                    if len(question) < 20 or _normalized(question) in seen:
+                        continue
+                    seen.add(_normalized(question))
+                    out.write(json.dumps({"skill": skill, "tier": tier, "question": question}, ensure_ascii=False) + "\n")
+                    new += 1
+                added += new
+                print(f"{skill:<16} {tier:<4} +{new:<3} {time.perf_counter() - start:5.1f} s")
+    return added
+
+
+def write_bank(source=SOURCE_PATH, path=BANK_PATH):
+    data = compile_bank(read_source(source))
+    with open(path, "wb") as f:
+        f.write(data)
+    return QuestionBank(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m question_bank")
+    commands = parser.add_subparsers(dest="command", required=True)
+    gen = commands.add_parser("generate", help="pre-generate questions with the LLM, then compile")
+    gen.add_argument("--skills", help="comma-separated stack, e.g. 'Python, React, AWS'")
+    gen.add_argument("--top", type=int, help="the N most common skills among recorded candidates")
+    gen.add_argument("--per-group", type=int, default=8, help="questions per (skill, tier)")
+    commands.add_parser("compile", help="compile the JSONL source into the binary bank")
+    commands.add_parser("stats", help="questions per skill and tier")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        if args.top:
+            from candidates import get_candidate_index
+
+            skills = get_candidate_index().top_skills(args.top)
+        else:
+            skills = normalize_stack(args.skills or "")
+        if not skills:
+            parser.error("no known skills: pass --skills or --top")
+        added = generate(skills, args.per_group, os.getenv("GROQ_API_KEY"))
+        print(f"added {added} questions")
+    if args.command in ("generate", "compile"):
+        bank = write_bank()
+        print(f"{BANK_PATH}: {len(bank)} questions, {len(bank.skills)} skills, {os.path.getsize(BANK_PATH):,} bytes")
+    if args.command == "stats":
+        bank = get_question_bank()
+        for skill in bank.skills:
+            print(f"{skill:<16} " + "  ".join(f"{tier}: {len(bank._groups[skill][t])}" for t, tier in enumerate(TIERS)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# roadmap_cache.py
+# Two-tier cache for Career Roadmap answers: an in-memory LRU in front of a SQLite
+# file that survives restarts. Entries expire after a TTL and both tiers are
+# size-bounded. Only bare role requests ("DevOps Engineer") are cached, keyed on a
+# normalized role name so "devops eng", "DevOps  Engineer" and "Roadmap for a
+# DevOps engineer" share one entry.
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_PATH = os.getenv("ROADMAP_CACHE_PATH", os.path.join(".cache", "roadmaps.sqlite3"))
+TTL_SECONDS = 7 * 24 * 3600
+MEMORY_ENTRIES = 64
+DISK_ENTRIES = 1000
+MAX_ROLE_WORDS = 6
+
+# --- ROLE NORMALIZATION ---
+_FILLER_RE = re.compile(
+    r"^(?:(?:please|pls)\s+)?(?:(?:give me|show me|generate|create|i want|i'd like)\s+)?"
+    r"(?:(?:a|the|my)\s+)?(?:(?:career\s+)?(?:roadmap|path|guide|plan)\s+(?:for|to)\s+)?"
+    r"(?:(?:how to become|become|to become|i want to be|to be)\s+)?(?:(?:a|an)\s+)?",
+    re.I,
+)
+_PUNCT_RE = re.compile(r"[^\w\s+#/]")
+_SPACE_RE = re.compile(r"\s+")
+
+WORD_SYNONYMS = {
+    "dev": "developer", "devs": "developer", "eng": "engineer", "engg": "engineer",
+    "sr": "senior", "jr": "junior", "mgr": "manager", "ml": "machine learning",
+    "fullstack": "full stack", "js": "javascript", "programmer": "developer",
+}
+ROLE_SYNONYMS = {
+    "sde": "software engineer",
+    "swe": "software engineer",
+    "software developer": "software engineer",
+    "software development engineer": "software engineer",
+    "full stack engineer": "full stack developer",
+    "full stack web developer": "full stack developer",
+    "front end developer": "frontend developer",
+    "frontend engineer": "frontend developer",
+    "front end engineer": "frontend developer",
+    "backend engineer": "backend developer",
+    "back end developer": "backend developer",
+    "devops": "devops engineer",
+    "dev ops engineer": "devops engineer",
+    "sre": "site reliability engineer",
+    "data science": "data scientist",
+    "machine learning": "machine learning engineer",
+    "mle": "machine learning engineer",
+    "data analytics": "data analyst",
+    "cloud architect": "cloud engineer",
+    "android developer": "mobile developer",
+    "ios developer": "mobile developer",
+    "qa": "qa engineer",
+    "tester": "qa engineer",
+    "software tester": "qa engineer",
+}
+# A cacheable request has to end in one of these, which keeps follow-up questions
+# ("what about salaries") out of the cache.
+ROLE_NOUNS = {
+    "engineer", "developer", "scientist", "analyst", "architect", "designer", "manager",
+    "administrator", "specialist", "consultant", "researcher", "tester", "lead", "intern",
+}
+
+
+def normalize_role(text):
+    # Returns the canonical role string, or None if the text isn't a bare role request.
+    if "?" in text:
+        return None
+    role = _FILLER_RE.sub("", text.strip())
+    role = _PUNCT_RE.sub(" ", role.lower())
+    words = []
+    for word in _SPACE_RE.split(role.strip()):
+        if word:
+            words.extend(WORD_SYNONYMS.get(word, word).split())
+    if not words or len(words) > MAX_ROLE_WORDS or not all(w.replace("+", "").replace("#", "").isalnum() for w in words):
+        return None
+    role = " ".join(words)
+    role = ROLE_SYNONYMS.get(role, role)
+    return role if role.rsplit(" ", 1)[-1] in ROLE_NOUNS else None
+
+
+def cache_key(role, prompt, model):
+    # Prompt and model are part of the key so editing CAREER_GUIDE_PROMPT or switching
+    # models never serves stale roadmaps.
+    digest = hashlib.sha1(f"{model}\0{prompt}".encode("utf-8")).hexdigest()[:12]
+    return f"{digest}:{role}"
+
+
+class RoadmapCache:
+    def __init__(self, path=CACHE_PATH, ttl=TTL_SECONDS, memory_entries=MEMORY_ENTRIES, disk_entries=DISK_ENTRIES):
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS roadmaps ("
+            " key TEXT PRIMARY KEY, content TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS roadmaps_accessed ON roadmaps (accessed)")
+        self._db.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] < self.ttl:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[0]
+            self._memory.pop(key, None)
+
+            row = self._db.execute("SELECT content, created FROM roadmaps WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] >= self.ttl:
+                if row is not None:
+                    self._db.execute("DELETE FROM roadmaps WHERE key = ?", (key,))
+                    self._db.commit()
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE roadmaps SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self._remember(key, row[0], row[1])
+            self.disk_hits += 1
+            return row[0]
+
+    def put(self, key, content):
+        now = time.time()
+        with self._lock:
+            self._remember(key, content, now)
+            self._db.execute(
+                "INSERT OR REPLACE INTO roadmaps (key, content, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, content, now, now),
+            )
+            self._evict_disk(now)
+            self._db.commit()
+
+    def _remember(self, key, content, created):
+        self._memory[key] = (content, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now):
+        self._db.execute("DELETE FROM roadmaps WHERE created < ?", (now - self.ttl,))
+        self._db.execute(
+            "DELETE FROM roadmaps WHERE key IN ("
+            " SELECT key FROM roadmaps ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.disk_entries,),
+        )
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            disk_entries = self._db.execute("SELECT COUNT(*) FROM roadmaps").fetchone()[0]
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_roadmap_cache():
+    # One cache per process, shared by every Streamlit session.
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = RoadmapCache()
+    return _cache
+
+
+def iter_chunks(text):
+    # Replays a cached answer through st.write_stream word by word.
+    for match in re.finditer(r"\S+\s*", text):
+        yield match.group(0)
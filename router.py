@@ -0,0 +1,93 @@
+# router.py
+# Sends each turn to a small fast model or the 70B model depending on what the turn
+# has to do. Turns are classified into per-mode routes; ROUTES maps each route to a
+# model tier and can be overridden with TALENTSCOUT_ROUTES, e.g.
+#   TALENTSCOUT_ROUTES='{"mock.feedback": "large", "screening.phase1": "fast"}'
+# Latency and token usage are accounted per route so the mapping can be tuned.
+import json
+import os
+import threading
+
+from prompt_builder import detect_phase
+
+MODEL_TIERS = {
+    "fast": os.getenv("GROQ_FAST_MODEL", "llama-3.1-8b-instant"),
+    "large": os.getenv("GROQ_LARGE_MODEL", "llama-3.3-70b-versatile"),
+}
+
+ROUTES = {
+    "screening": {
+        "phase1": "fast",     # acknowledge / re-ask a Phase 1 field
+        "phase2": "large",    # technical question generation
+        "closing": "fast",    # summary and sign-off
+    },
+    "mock": {
+        "question": "large",  # role/stack setup, then each next question
+        "feedback": "fast",   # the short Weak/Good/Strong verdict on an answer
+        "grading": "fast",    # end-of-interview report, one call per answer
+    },
+    "role_insight": {
+        "roadmap": "large",   # full roadmap for a role
+        "followup": "large",  # questions about a roadmap already given
+    },
+}
+
+
+def _apply_overrides():
+    overrides = json.loads(os.getenv("TALENTSCOUT_ROUTES", "{}") or "{}")
+    for name, tier in overrides.items():
+        mode, route = name.split(".", 1)
+        if tier not in MODEL_TIERS:
+            raise ValueError(f"Unknown model tier {tier!r} for route {name!r}")
+        ROUTES.setdefault(mode, {})[route] = tier
+
+
+_apply_overrides()
+
+
+def classify_turn(mode, candidate_data=None, closed=False, is_role_request=False):
+    if mode == "screening":
+        return detect_phase(candidate_data or {}, closed)
+    if mode == "role_insight":
+        return "roadmap" if is_role_request else "followup"
+    return "question"
+
+
+def model_for(mode, route):
+    return MODEL_TIERS[ROUTES[mode][route]]
+
+
+class RouteStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, label, model, latency, ttft, prompt_tokens, completion_tokens):
+        with self._lock:
+            s = self._routes.setdefault(label, {
+                "calls": 0, "latency_s": 0.0, "ttft_s": 0.0, "prompt_tokens": 0, "completion_tokens": 0,
+            })
+            s["model"] = model
+            s["calls"] += 1
+            s["latency_s"] += latency
+            s["ttft_s"] += ttft
+            s["prompt_tokens"] += prompt_tokens
+            s["completion_tokens"] += completion_tokens
+
+    def snapshot(self):
+        with self._lock:
+            out = {}
+            for label, s in self._routes.items():
+                calls = s["calls"]
+                out[label] = {
+                    "calls": calls,
+                    "model": s.get("model"),
+                    "avg_latency_s": round(s["latency_s"] / calls, 3),
+                    "avg_ttft_s": round(s["ttft_s"] / calls, 3),
+                    "prompt_tokens": s["prompt_tokens"],
+                    "completion_tokens": s["completion_tokens"],
+                }
+            return out
+
+
+route_stats = RouteStats()
@@ -0,0 +1,192 @@
+# scheduler.py
+# Process-wide gate in front of Groq. Two token buckets (requests/min and
+# tokens/min) are sized to the account quota, and callers wait in strict priority
+# order: live screening, then mock interviews, then roadmap generation, then
+# speculative work nobody is waiting on yet. 429s, and the transient errors the Groq
+# SDK would otherwise retry itself (connection resets, timeouts, 408/409/5xx), are
+# retried with jittered exponential backoff so sessions don't retry in lockstep. A
+# request made with a Ticket can be withdrawn while it is still waiting for quota.
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+
+PRIORITIES = {"screening": 0, "mock": 1, "role_insight": 2, "speculative": 3}
+DEFAULT_PRIORITY = 1
+
+REQUESTS_PER_MINUTE = int(os.getenv("GROQ_RPM", "30"))
+TOKENS_PER_MINUTE = int(os.getenv("GROQ_TPM", "12000"))
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 20.0
+
+
+class TokenBucket:
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        # Seconds until `amount` is available; requests bigger than the bucket only
+        # wait for a full bucket.
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+
+def is_rate_limit(exc):
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    return status == 429 or type(exc).__name__ == "RateLimitError"
+
+
+def is_transient(exc):
+    # The Groq SDK's own retry set, minus 429 (is_rate_limit): the client is built
+    # with max_retries=0 so that every retry goes back through the buckets.
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    if status is not None:
+        return status in (408, 409) or status >= 500
+    return type(exc).__name__ in ("APIConnectionError", "APITimeoutError") or isinstance(
+        exc, (ConnectionError, TimeoutError))
+
+
+def retry_after(exc):
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class Withdrawn(Exception):
+    pass
+
+
+class Ticket:
+    # Handle on one queued request: GroqScheduler.withdraw(ticket) takes it out of the
+    # queue if it hasn't been granted yet, and its acquire() raises Withdrawn.
+    def __init__(self):
+        self.granted = False
+        self.withdrawn = False
+
+
+class GroqScheduler:
+    def __init__(self, rpm=REQUESTS_PER_MINUTE, tpm=TOKENS_PER_MINUTE):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._cond = threading.Condition()
+        self._queue = []
+        self._seq = itertools.count()
+        self.granted = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.transient_errors = 0
+        self.total_wait = 0.0
+        self.max_queue_depth = 0
+
+    def acquire(self, mode, est_tokens, ticket=None):
+        priority = PRIORITIES.get(mode, DEFAULT_PRIORITY)
+        entry = (priority, next(self._seq))
+        start = time.monotonic()
+        with self._cond:
+            if ticket is not None and ticket.withdrawn:
+                raise Withdrawn()
+            heapq.heappush(self._queue, entry)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+            try:
+                while True:
+                    if ticket is not None and ticket.withdrawn:
+                        raise Withdrawn()
+                    if self._queue[0] == entry:
+                        now = time.monotonic()
+                        wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(est_tokens, now))
+                        if wait <= 0:
+                            self.requests.take(1)
+                            self.tokens.take(est_tokens)
+                            if ticket is not None:
+                                ticket.granted = True
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+            finally:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+            self.granted += 1
+            self.total_wait += time.monotonic() - start
+
+    def withdraw(self, ticket):
+        # -> True if the request hadn't been granted (it will never be sent), else False.
+        with self._cond:
+            if ticket.granted:
+                return False
+            ticket.withdrawn = True
+            self._cond.notify_all()
+            return True
+
+    def stream(self, mode, est_tokens, factory, ticket=None):
+        # factory() starts one upstream call and returns its chunk iterator. A 429 or
+        # transient error is only retried before the first chunk; once text has been
+        # shown it can't be replayed, so later errors propagate.
+        for attempt in range(MAX_RETRIES + 1):
+            self.acquire(mode, est_tokens, ticket)
+            chunks = factory()
+            try:
+                first = next(chunks, None)
+            except Exception as exc:
+                limited = is_rate_limit(exc)
+                if not (limited or is_transient(exc)) or attempt == MAX_RETRIES:
+                    raise
+                with self._cond:
+                    if limited:
+                        self.rate_limited += 1
+                    else:
+                        self.transient_errors += 1
+                    self.retries += 1
+                delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.5)
+                time.sleep(max(delay, retry_after(exc) or 0.0))
+                continue
+            try:
+                if first is not None:
+                    yield first
+                yield from chunks
+            finally:
+                if hasattr(chunks, "close"):
+                    chunks.close()
+            return
+
+    def queue_depth(self):
+        with self._cond:
+            depth = {mode: 0 for mode in PRIORITIES}
+            for priority, _ in self._queue:
+                for mode, p in PRIORITIES.items():
+                    if p == priority:
+                        depth[mode] += 1
+            return depth
+
+    def stats(self):
+        depth = self.queue_depth()
+        with self._cond:
+            return {
+                "requests_per_minute": int(self.requests.capacity),
+                "tokens_per_minute": int(self.tokens.capacity),
+                "queue_depth": sum(depth.values()),
+                "queue_depth_by_mode": depth,
+                "max_queue_depth": self.max_queue_depth,
+                "granted": self.granted,
+                "rate_limited": self.rate_limited,
+                "retries": self.retries,
+                "transient_errors": self.transient_errors,
+                "avg_wait_s": round(self.total_wait / self.granted, 3) if self.granted else 0.0,
+            }
@@ -0,0 +1,156 @@
+# sentiment.py
+# Candidate "vibe" scoring. The nervous/confident trigger phrases are compiled into
+# one word-boundary-aware regex, so a message is scanned once and "um" no longer
+# fires inside "maximum". TextBlob (~0.3 s to import, plus its lexicon) is only
+# loaded the first time a message has no trigger and needs a polarity score.
+import re
+import threading
+from array import array
+
+NERVOUS_TRIGGERS = ["maybe", "i think", "not sure", "i guess", "probably", "um", "uh", "sort of", "little bit", "struggle", "confused"]
+CONFIDENT_TRIGGERS = ["expert", "led", "built", "deployed", "highly proficient", "mastered", "definitely", "absolutely", "specialist", "managed", "created"]
+
+NERVOUS, CONFIDENT, NEUTRAL = "Nervous 😟", "Confident 🚀", "Neutral 😐"
+CONFIDENT_POLARITY = 0.15
+NERVOUS_POLARITY = 0.0
+
+
+def _alternation(phrases):
+    # Longest first so "i think" wins over a shorter overlapping phrase; spaces match
+    # any run of whitespace.
+    ordered = sorted(phrases, key=len, reverse=True)
+    return "|".join(r"\s+".join(map(re.escape, p.split())) for p in ordered)
+
+
+# Matched against lowercased text; that is cheaper than a case-insensitive pattern.
+_TRIGGERS = re.compile(
+    rf"\b(?:(?P<nervous>{_alternation(NERVOUS_TRIGGERS)})|(?P<confident>{_alternation(CONFIDENT_TRIGGERS)}))\b"
+)
+
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+
+def _polarity_analyzer():
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                from textblob.en.sentiments import PatternAnalyzer
+                _analyzer = PatternAnalyzer()
+    return _analyzer
+
+
+def polarity(text):
+    return _polarity_analyzer().analyze(text)[0]
+
+
+def trigger_counts(text):
+    nervous = confident = 0
+    for match in _TRIGGERS.finditer(text.lower()):
+        if match.lastgroup == "nervous":
+            nervous += 1
+        else:
+            confident += 1
+    return nervous, confident
+
+
+def score(text):
+    # Returns (label, polarity, nervous_hits, confident_hits). Polarity is only
+    # computed when no trigger decides the label, and is None otherwise.
+    nervous, confident = trigger_counts(text)
+    if nervous:
+        return NERVOUS, None, nervous, confident
+    if confident:
+        return CONFIDENT, None, nervous, confident
+    value = polarity(text)
+    if value > CONFIDENT_POLARITY:
+        return CONFIDENT, value, 0, 0
+    if value < NERVOUS_POLARITY:
+        return NERVOUS, value, 0, 0
+    return NEUTRAL, value, 0, 0
+
+
+def get_sentiment(text):
+    return score(text)[0]
+
+
+def score_transcript(texts):
+    # Scores a whole transcript in one call; the polarity backend is loaded at most
+    # once and only if some message has no trigger.
+    return [score(text) for text in texts]
+
+
+# --- ROLLING SESSION TRACKER ---
+EWMA_ALPHA = 0.3
+
+
+def message_score(value, nervous, confident):
+    # One number in [-1, 1] per message: trigger balance when triggers fired,
+    # polarity otherwise.
+    if nervous:
+        return max(-1.0, (confident - nervous - 1) / 2.0)
+    if confident:
+        return min(1.0, (confident + 1) / 2.0)
+    return value
+
+
+def label_for(value):
+    if value > CONFIDENT_POLARITY:
+        return CONFIDENT
+    if value < NERVOUS_POLARITY:
+        return NERVOUS
+    return NEUTRAL
+
+
+class SentimentTracker:
+    # Per-session sentiment history kept as compact numeric arrays. Each update is
+    # O(1): it appends one score and folds it into the EWMA and its phase's
+    # aggregate, so nothing is ever re-scored.
+    def __init__(self, alpha=EWMA_ALPHA):
+        self.alpha = alpha
+        self.scores = array("f")
+        self.polarity = array("f")   # NaN when a trigger decided the label
+        self.triggers = array("b")   # confident hits minus nervous hits, clamped
+        self.ewma = 0.0
+        self.last_label = NEUTRAL
+        self.phases = {}
+
+    def update(self, text, phase=None):
+        label, value, nervous, confident = score(text)
+        s = message_score(value, nervous, confident)
+        self.scores.append(s)
+        self.polarity.append(value if value is not None else float("nan"))
+        self.triggers.append(max(-127, min(127, confident - nervous)))
+        self.ewma = s if len(self.scores) == 1 else self.alpha * s + (1 - self.alpha) * self.ewma
+        self.last_label = label
+        if phase:
+            agg = self.phases.setdefault(phase, {"messages": 0, "score_sum": 0.0, "nervous": 0, "confident": 0})
+            agg["messages"] += 1
+            agg["score_sum"] += s
+            agg["nervous"] += nervous
+            agg["confident"] += confident
+        return label
+
+    @property
+    def label(self):
+        # The vibe card shows the smoothed trend, not just the latest message.
+        return label_for(self.ewma) if self.scores else NEUTRAL
+
+    def summary(self):
+        return {
+            "messages": len(self.scores),
+            "ewma": round(self.ewma, 3),
+            "label": self.label,
+            "last_label": self.last_label,
+            "series": [round(v, 3) for v in self.scores],
+            "phases": {
+                phase: {
+                    "messages": agg["messages"],
+                    "avg_score": round(agg["score_sum"] / agg["messages"], 3),
+                    "nervous": agg["nervous"],
+                    "confident": agg["confident"],
+                }
+                for phase, agg in self.phases.items()
+            },
+        }
@@ -0,0 +1,338 @@
+# session_store.py
+# Durable store for candidate sessions, so an in-progress screening survives a
+# redeploy and any replica can serve it (no sticky sessions). A session is keyed by
+# an opaque token (the ?sid= query param) and holds the candidate metadata plus the
+# three chat histories. Message appends are written behind: they are buffered and
+# flushed in one batch per interval, not one write per message. Resuming reads the
+# whole session at once - one indexed query on SQLite, one pipelined round trip on
+# Redis. A batch that fails to write is logged and re-queued for the next flush, with
+# backoff; after WRITE_RETRIES failed attempts in a row the pending rows are dropped.
+#   SESSION_STORE_URL=redis://host:6379/0   shared store for multiple replicas
+#   SESSION_STORE_PATH=.cache/sessions.sqlite3   local SQLite file (the default)
+import atexit
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+STORE_URL = os.getenv("SESSION_STORE_URL", "")
+STORE_PATH = os.getenv("SESSION_STORE_PATH", os.path.join(".cache", "sessions.sqlite3"))
+FLUSH_INTERVAL = 0.5   # seconds between write-behind flushes
+BATCH_SIZE = 64        # pending appends that trigger an early flush
+SESSION_TTL = 30 * 24 * 3600  # Redis only; SQLite rows are kept until deleted
+WRITE_RETRIES = 5      # failed flushes in a row before the pending rows are dropped
+RETRY_BACKOFF_CAP = 30.0  # seconds; the writer's interval doubles per failed flush
+
+log = logging.getLogger(__name__)
+
+_ROLES = {"human": HumanMessage, "ai": AIMessage}
+# The chat histories a session holds, as named in st.session_state.
+HISTORY_KEYS = ("messages", "mock_messages", "role_messages")
+
+
+def encode_message(msg):
+    return ("human" if isinstance(msg, HumanMessage) else "ai", msg.content)
+
+
+def decode_message(role, content):
+    return _ROLES[role](content=content)
+
+
+def new_token():
+    return secrets.token_urlsafe(16)
+
+
+@dataclass
+class StoredSession:
+    meta: dict
+    histories: dict = field(default_factory=dict)  # history key -> [(role, content), ...]
+
+
+class SessionStore:
+    # Write-behind buffering shared by the backends. Subclasses implement
+    # _write(appends, metas) and _read(token).
+    def __init__(self, flush_interval=FLUSH_INTERVAL, batch_size=BATCH_SIZE):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._appends = []   # (token, history, index, role, content)
+        self._metas = {}     # token -> meta; only the latest one is written
+        self._thread = None
+        self.appends = 0
+        self.batches = 0
+        self.rows_written = 0
+        self.write_errors = 0
+        self.dropped_rows = 0
+        self._failures = 0  # consecutive failed flushes
+        self.loads = 0
+        self.load_seconds = 0.0
+
+    def append(self, token, history, index, role, content):
+        # index is the message's position in its history, so replays are idempotent.
+        with self._lock:
+            self._appends.append((token, history, index, role, content))
+            self.appends += 1
+            full = len(self._appends) >= self.batch_size
+        self._ensure_writer()
+        if full:
+            self._wake.set()
+
+    def save_meta(self, token, meta):
+        with self._lock:
+            self._metas[token] = meta
+        self._ensure_writer()
+
+    def load(self, token):
+        # Flush first so a session resumed on this replica sees its own pending writes.
+        self.flush()
+        start = time.perf_counter()
+        session = self._read(token)
+        with self._lock:
+            self.loads += 1
+            self.load_seconds += time.perf_counter() - start
+        return session
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                appends, self._appends = self._appends, []
+                metas, self._metas = self._metas, {}
+            if not appends and not metas:
+                return
+            try:
+                self._write(appends, metas)
+            except Exception:
+                self._requeue(appends, metas)
+                raise
+            with self._lock:
+                self.batches += 1
+                self.rows_written += len(appends) + len(metas)
+                self._failures = 0
+
+    def _requeue(self, appends, metas):
+        # The failed batch goes back in front of whatever was queued since (a newer meta
+        # for the same session wins). Writes are idempotent, so retrying is safe.
+        rows = len(appends) + len(metas)
+        with self._lock:
+            self.write_errors += 1
+            self._failures += 1
+            failures = self._failures
+            if failures > WRITE_RETRIES:
+                self.dropped_rows += rows
+                self._failures = 0
+            else:
+                self._appends[:0] = appends
+                self._metas = {**metas, **self._metas}
+        if failures > WRITE_RETRIES:
+            log.error("Session store write failed %d times in a row; dropped %d rows", failures, rows, exc_info=True)
+        else:
+            log.warning("Session store write failed (attempt %d of %d); %d rows re-queued",
+                        failures, WRITE_RETRIES + 1, rows, exc_info=True)
+
+    def _ensure_writer(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._writer, daemon=True)
+                    self._thread.start()
+                    atexit.register(self.flush)
+
+    def _writer(self):
+        while True:
+            self._wake.wait(min(RETRY_BACKOFF_CAP, self.flush_interval * 2 ** self._failures))
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass  # logged and re-queued by flush(); keep the writer alive
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": type(self).__name__,
+                "appends": self.appends,
+                "pending": len(self._appends) + len(self._metas),
+                "batches": self.batches,
+                "avg_batch_rows": round(self.rows_written / self.batches, 1) if self.batches else 0.0,
+                "write_errors": self.write_errors,
+                "dropped_rows": self.dropped_rows,
+                "loads": self.loads,
+                "avg_load_ms": round(self.load_seconds / self.loads * 1000, 3) if self.loads else 0.0,
+            }
+
+
+class SQLiteSessionStore(SessionStore):
+    def __init__(self, path=STORE_PATH, **kwargs):
+        super().__init__(**kwargs)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (token TEXT PRIMARY KEY, meta TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        # WITHOUT ROWID clusters a session's messages together on the primary key,
+        # so resuming is one range scan.
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS session_messages ("
+            " token TEXT NOT NULL, history TEXT NOT NULL, idx INTEGER NOT NULL, role TEXT NOT NULL, content TEXT NOT NULL,"
+            " PRIMARY KEY (token, history, idx)) WITHOUT ROWID"
+        )
+        self._db.commit()
+
+    def _write(self, appends, metas):
+        now = time.time()
+        with self._db_lock, self._db:
+            if appends:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO session_messages (token, history, idx, role, content) VALUES (?, ?, ?, ?, ?)",
+                    appends,
+                )
+            if metas:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO sessions (token, meta, updated) VALUES (?, ?, ?)",
+                    [(token, json.dumps(meta), now) for token, meta in metas.items()],
+                )
+
+    def _read(self, token):
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT s.meta, m.history, m.role, m.content FROM sessions s"
+                " LEFT JOIN session_messages m ON m.token = s.token"
+                " WHERE s.token = ? ORDER BY m.history, m.idx",
+                (token,),
+            ).fetchall()
+        if not rows:
+            return None
+        session = StoredSession(meta=json.loads(rows[0][0]))
+        for _, history, role, content in rows:
+            if history is not None:
+                session.histories.setdefault(history, []).append((role, content))
+        return session
+
+
+class RedisSessionStore(SessionStore):
+    # One JSON meta string and one list per history per session. Works with any
+    # client exposing get/set/rpush/lrange/expire/pipeline, e.g. redis-py.
+    def __init__(self, client, prefix="talentscout", ttl=SESSION_TTL, **kwargs):
+        super().__init__(**kwargs)
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("SESSION_STORE_URL points at Redis but the redis package is not installed") from exc
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _key(self, token, part):
+        return f"{self.prefix}:{token}:{part}"
+
+    def _write(self, appends, metas):
+        pipe = self.client.pipeline()
+        touched = set()
+        # Appends arrive in order per history; the index is carried in the value so
+        # a replayed batch can be de-duplicated on read.
+        for token, history, index, role, content in appends:
+            pipe.rpush(self._key(token, f"h:{history}"), json.dumps([index, role, content]))
+            touched.add(self._key(token, f"h:{history}"))
+        for token, meta in metas.items():
+            pipe.set(self._key(token, "meta"), json.dumps(meta))
+            touched.add(self._key(token, "meta"))
+        for key in touched:
+            pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def _read(self, token):
+        pipe = self.client.pipeline()
+        pipe.get(self._key(token, "meta"))
+        for history in HISTORY_KEYS:
+            pipe.lrange(self._key(token, f"h:{history}"), 0, -1)
+        raw_meta, *lists = pipe.execute()
+        if raw_meta is None:
+            return None
+        session = StoredSession(meta=json.loads(raw_meta))
+        for history, items in zip(HISTORY_KEYS, lists):
+            by_index = {}
+            for item in items:
+                index, role, content = json.loads(item)
+                by_index[index] = (role, content)
+            if by_index:
+                session.histories[history] = [by_index[i] for i in sorted(by_index)]
+        return session
+
+
+class InMemoryRedis:
+    # Local stand-in for a Redis server: the subset of commands RedisSessionStore
+    # uses, for running without a server (development, benchmarks).
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+        self.round_trips = 0
+
+    def get(self, key):
+        return self._data.get(key)
+
+    def set(self, key, value):
+        self._data[key] = value
+
+    def rpush(self, key, *values):
+        self._data.setdefault(key, []).extend(values)
+
+    def lrange(self, key, start, end):
+        items = self._data.get(key, [])
+        return list(items[start:] if end == -1 else items[start:end + 1])
+
+    def expire(self, key, seconds):
+        pass
+
+    def pipeline(self):
+        return _InMemoryPipeline(self)
+
+
+class _InMemoryPipeline:
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self._calls.append((name, args))
+        return queue
+
+    def execute(self):
+        with self._client._lock:
+            self._client.round_trips += 1
+            return [getattr(self._client, name)(*args) for name, args in self._calls]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    # One store per process, shared by every Streamlit session.
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if STORE_URL.startswith(("redis://", "rediss://")):
+                    _store = RedisSessionStore.from_url(STORE_URL)
+                elif STORE_URL == "memory://":
+                    _store = RedisSessionStore(InMemoryRedis())
+                else:
+                    _store = SQLiteSessionStore()
+    return _store
@@ -0,0 +1,275 @@
+# skills.py
+# Canonical skill index. Free-text stacks ("k8s, ReactJS and golang") are mapped
+# onto canonical skill IDs through a token trie built from an alias table, so
+# multi-word aliases ("google cloud platform") and the longest match win. Each
+# candidate becomes a bit-packed skill vector, and ranking against a role profile
+# is one vectorized NumPy pass (AND + popcount) over the whole candidate matrix.
+# Text is matched per list item ("Python, Go and Docker"); aliases that are also
+# everyday words ("go", "rest", "c") only count when they are a whole item.
+import re
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+
+# canonical id -> aliases (the id itself always matches). New skills go at the end:
+# the order sets the bit positions in stored skill vectors (see SKILL_LAYOUT).
+SKILL_ALIASES = {
+    "python": ["py", "python3"],
+    "java": [],
+    "kotlin": [],
+    "scala": [],
+    "go": ["golang"],
+    "rust": [],
+    "c": [],
+    "c++": ["cpp"],
+    "c#": ["csharp", "c sharp"],
+    ".net": ["dotnet", "asp.net", ".net core"],
+    "javascript": ["js", "ecmascript", "es6"],
+    "typescript": ["ts"],
+    "ruby": [],
+    "rails": ["ruby on rails", "ror"],
+    "php": [],
+    "laravel": [],
+    "swift": [],
+    "objective-c": ["objc"],
+    "dart": [],
+    "flutter": [],
+    "react": ["reactjs", "react.js"],
+    "react native": ["react-native"],
+    "angular": ["angularjs", "angular.js"],
+    "vue": ["vuejs", "vue.js"],
+    "svelte": [],
+    "next.js": ["nextjs"],
+    "node": ["nodejs", "node.js"],
+    "express": ["expressjs", "express.js"],
+    "django": [],
+    "flask": [],
+    "fastapi": ["fast api"],
+    "spring": ["spring boot", "springboot"],
+    "html": ["html5"],
+    "css": ["css3"],
+    "tailwind": ["tailwindcss", "tailwind css"],
+    "graphql": [],
+    "rest": ["rest api", "rest apis", "restful"],
+    "grpc": [],
+    "sql": [],
+    "postgresql": ["postgres", "psql"],
+    "mysql": [],
+    "sqlite": [],
+    "mongodb": ["mongo"],
+    "redis": [],
+    "cassandra": [],
+    "elasticsearch": ["elastic search", "opensearch"],
+    "kafka": ["apache kafka"],
+    "rabbitmq": ["rabbit mq"],
+    "spark": ["apache spark", "pyspark"],
+    "hadoop": [],
+    "airflow": ["apache airflow"],
+    "dbt": [],
+    "snowflake": [],
+    "pandas": [],
+    "numpy": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "pytorch": ["torch"],
+    "tensorflow": ["tf", "keras"],
+    "machine learning": ["ml"],
+    "deep learning": ["dl"],
+    "nlp": ["natural language processing"],
+    "llm": ["llms", "large language models", "langchain"],
+    "computer vision": ["opencv"],
+    "statistics": ["stats"],
+    "tableau": [],
+    "power bi": ["powerbi"],
+    "excel": [],
+    "docker": ["containers"],
+    "kubernetes": ["k8s", "kube", "eks", "gke", "aks"],
+    "helm": [],
+    "terraform": ["tf cloud"],
+    "ansible": [],
+    "aws": ["amazon web services", "ec2", "s3", "lambda"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "azure": ["microsoft azure"],
+    "linux": ["unix", "bash", "shell scripting"],
+    "git": ["github", "gitlab"],
+    "ci/cd": ["ci", "cd", "cicd", "jenkins", "github actions", "gitlab ci"],
+    "prometheus": [],
+    "grafana": [],
+    "microservices": ["micro services"],
+    "system design": ["distributed systems"],
+    "selenium": [],
+    "cypress": [],
+    "jest": [],
+    "pytest": [],
+    "figma": [],
+}
+
+# Aliases that are also everyday words, or a single letter: matched only as a whole
+# list item ("Python, Go"), never inside prose ("I'd go with the rest of the team").
+PROSE_ALIASES = {
+    "go", "c", "rest", "stats", "ci", "cd", "tf", "dl", "lambda", "containers", "spring", "express",
+    "swift", "dart", "excel", "torch", "spark", "rust", "ruby", "flask", "helm", "jest",
+}
+
+SKILLS = list(SKILL_ALIASES)
+SKILL_INDEX = {skill: i for i, skill in enumerate(SKILLS)}
+WIDTH = len(SKILLS)
+PACKED_WIDTH = (WIDTH + 7) // 8
+# Identifies the bit layout; stored vectors written under another one are rebuilt.
+SKILL_LAYOUT = zlib.crc32("\n".join(SKILLS).encode()) & 0x7FFFFFFF
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#./-]*|\.[a-z]+|[+#]")
+# List item boundaries: separators, "and"/"or", and "Label:" prefixes.
+_ITEM_SPLIT = re.compile(r"[,;:/|&()\[\]\n]|\b(?:and|or)\b")
+_END = None  # trie key marking "an alias ends here"
+
+# Bits set in each byte value, for popcount over packed vectors.
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _tokens(text):
+    # Trailing dots are sentence punctuation ("I use Go."), leading ones are kept
+    # for ".net".
+    return [t.rstrip(".") if len(t) > 1 and not t.startswith(".") else t for t in _TOKEN.findall(text.lower())]
+
+
+def _build_trie():
+    trie = {}
+    for skill, aliases in SKILL_ALIASES.items():
+        for alias in [skill, *aliases]:
+            node = trie
+            for token in _tokens(alias):
+                node = node.setdefault(token, {})
+            node[_END] = (skill, alias in PROSE_ALIASES)
+    return trie
+
+
+_TRIE = _build_trie()
+
+
+def normalize_stack(text):
+    # Canonical skill ids in order of first mention, longest alias match first.
+    found = []
+    for item in _ITEM_SPLIT.split((text or "").lower()):
+        tokens = _tokens(item)
+        i = 0
+        while i < len(tokens):
+            node, match, end = _TRIE, None, i
+            for j in range(i, len(tokens)):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                if _END in node:
+                    match, end = node[_END], j + 1
+            if match is None or (match[1] and end - i != len(tokens)):
+                i += 1
+                continue
+            if match[0] not in found:
+                found.append(match[0])
+            i = end
+    return found
+
+
+def pack(skills):
+    bits = np.zeros(WIDTH, dtype=np.uint8)
+    bits[[SKILL_INDEX[s] for s in skills]] = 1
+    return np.packbits(bits)
+
+
+def unpack(packed):
+    bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), count=WIDTH)
+    return [SKILLS[i] for i in np.flatnonzero(bits)]
+
+
+@dataclass(frozen=True)
+class RoleProfile:
+    required: tuple
+    optional: tuple = ()
+
+
+NICE_TO_HAVE_WEIGHT = 0.25
+STACK_TITLE = "required tech stack"
+# A section title: a markdown heading, or a line (bullet) starting with **bold**.
+_TITLE = re.compile(r"^([ \t]*)(?:(#{1,6})[ \t]+|([-*+•]|\d+[.)])[ \t]+)?([^\w\s*#]*)\s*(\*\*)?")
+
+
+def _title_shape(line):
+    # -> (heading level or None, indent, bullet kind, decorated) for title lines, else None.
+    indent, hashes, bullet, decoration, bold = _TITLE.match(line).groups()
+    if not hashes and not bold:
+        return None
+    kind = "number" if bullet and bullet[0].isdigit() else bullet
+    return len(hashes) if hashes else None, len(indent.expandtabs(4)), kind, bool(decoration)
+
+
+def _ends_section(shape, title):
+    if shape is None:
+        return False
+    if title[0] is not None:  # a heading ends at the next heading of its level or above
+        return shape[0] is not None and shape[0] <= title[0]
+    # a bold title ends at any heading, at a shallower title, or at a sibling shaped like
+    # it ("- 🗺️ **Learning Path**" after "- 🛠️ **Required Tech Stack**", not "- **Languages**")
+    return shape[0] is not None or shape[1] < title[1] or shape[1:] == title[1:]
+
+
+def stack_section(text):
+    # The text of the "Required Tech Stack" section, including its sub-bullets, or None.
+    lines = text.splitlines()
+    for start, line in enumerate(lines):
+        if STACK_TITLE in line.lower():
+            break
+    else:
+        return None
+    title = _title_shape(lines[start]) or (None, 0, None, False)
+    section = [lines[start].lower().split(STACK_TITLE, 1)[1]]
+    for line in lines[start + 1:]:
+        if _ends_section(_title_shape(line), title):
+            break
+        section.append(line)
+    return "\n".join(section)
+
+
+def profile_from_roadmap(text):
+    # CareerGuide roadmaps have a "Required Tech Stack" section: skills listed there
+    # are required, skills mentioned elsewhere (learning path) are nice to have.
+    section = stack_section(text)
+    required = normalize_stack(section) if section else []
+    optional = [s for s in normalize_stack(text) if s not in required]
+    return RoleProfile(required=tuple(required), optional=tuple(optional))
+
+
+class SkillMatrix:
+    # Candidates as rows of bit-packed skill vectors (PACKED_WIDTH bytes each).
+    def __init__(self, capacity=1024):
+        self._rows = np.zeros((capacity, PACKED_WIDTH), dtype=np.uint8)
+        self.ids = []
+        self._position = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def set(self, candidate_id, packed):
+        row = self._position.get(candidate_id)
+        if row is None:
+            row = len(self.ids)
+            if row == len(self._rows):
+                self._rows = np.concatenate([self._rows, np.zeros_like(self._rows)])
+            self.ids.append(candidate_id)
+            self._position[candidate_id] = row
+        self._rows[row] = np.frombuffer(packed, dtype=np.uint8) if isinstance(packed, bytes) else packed
+
+    def rank(self, profile, top_k=50):
+        # score = share of required skills covered + NICE_TO_HAVE_WEIGHT * share of
+        # optional ones, for every candidate at once. Returns [(id, score)], best first.
+        rows = self._rows[:len(self.ids)]
+        if not len(rows) or not (profile.required or profile.optional):
+            return []
+        score = np.zeros(len(rows), dtype=np.float32)
+        for skills, weight in ((profile.required, 1.0), (profile.optional, NICE_TO_HAVE_WEIGHT)):
+            if skills:
+                hits = _POPCOUNT[rows & pack(skills)].sum(axis=1, dtype=np.uint16)
+                score += weight * hits / len(skills)
+        k = min(top_k, len(rows))
+        top = np.argpartition(-score, k - 1)[:k]
+        top = top[np.argsort(-score[top], kind="stable")]
+        return [(self.ids[i], float(score[i])) for i in top if score[i] > 0]
@@ -0,0 +1,58 @@
+# tests/test_candidates.py
+import sqlite3
+
+import pytest
+
+from candidates import CandidateIndex, parse_query
+
+GO_K8S = {"Name": "Lee Park", "Experience": "4", "Role": "SRE", "Stack": "Go, k8s"}
+
+
+def test_search_matches_skill_aliases(tmp_path):
+    index = CandidateIndex(str(tmp_path / "candidates.sqlite3"))
+    index.record("s1", GO_K8S, "")
+    assert [row["name"] for row in index.search("kubernetes")] == ["Lee Park"]
+    assert [row["name"] for row in index.search("Kubernetes AND Go, 3+ years")] == ["Lee Park"]
+    assert index.search("Kubernetes AND Go, 5+ years") == []
+
+
+def test_index_without_skills_column_is_rebuilt(tmp_path):
+    path = str(tmp_path / "candidates.sqlite3")
+    CandidateIndex(path).record("s1", GO_K8S, "")
+    db = sqlite3.connect(path)
+    db.executescript(
+        """
+        DROP TRIGGER candidates_ai; DROP TRIGGER candidates_ad; DROP TRIGGER candidates_au;
+        DROP TABLE candidates_fts;
+        CREATE VIRTUAL TABLE candidates_fts USING fts5(
+            name, role, stack, location, transcript, content='candidates', content_rowid='id'
+        );
+        INSERT INTO candidates_fts (candidates_fts) VALUES ('rebuild');
+        """
+    )
+    db.close()
+    index = CandidateIndex(path)
+    assert [row["name"] for row in index.search("kubernetes")] == ["Lee Park"]
+    index.record("s1", {**GO_K8S, "Stack": "Rust"}, "")
+    assert index.search("kubernetes") == []
+    assert [row["name"] for row in index.search("skills:rust")] == ["Lee Park"]
+
+
+@pytest.mark.parametrize("text, match", [
+    ("NOT go", '"go"'),
+    ("(go", '( "go" )'),
+    ("go)", '"go"'),
+    ("Go AND 3+ years", '"go"'),
+    ("go AND NOT rust", '"go" NOT "rust"'),
+    ("go (rust OR", '"go" AND ( "rust" )'),
+    ("AND ( ) OR", None),
+])
+def test_parse_query_is_well_formed(text, match):
+    assert parse_query(text).match == match
+
+
+@pytest.mark.parametrize("text", ["NOT go", "(go", "go)", "((go OR", "OR NOT (", ") AND go"])
+def test_search_accepts_malformed_queries(tmp_path, text):
+    index = CandidateIndex(str(tmp_path / "candidates.sqlite3"))
+    index.record("s1", GO_K8S, "")
+    assert [row["name"] for row in index.search(text)] == ["Lee Park"]
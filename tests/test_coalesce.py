@@ -0,0 +1,83 @@
+# tests/test_coalesce.py
+import gc
+import threading
+
+import pytest
+
+from coalesce import SingleFlight
+
+
+class Upstream:
+    # A producer whose chunks are released one at a time by the test.
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.calls = 0
+        self.gate = threading.Semaphore(0)
+        self.closed = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        return self._stream()
+
+    def _stream(self):
+        try:
+            for chunk in self.chunks:
+                assert self.gate.acquire(timeout=5)
+                yield chunk
+            if self.error is not None:
+                raise self.error
+        finally:
+            self.closed.set()
+
+    def release(self, n=None):
+        for _ in range(len(self.chunks) if n is None else n):
+            self.gate.release()
+
+
+def test_identical_requests_share_one_call():
+    flights, upstream = SingleFlight(), Upstream(["a", "b", "c"])
+    first = flights.stream("k", upstream)
+    second = flights.stream("k", upstream)
+    upstream.release()
+    assert list(first) == list(second) == ["a", "b", "c"]
+    assert upstream.calls == 1
+    assert flights.stats()["coalesced"] == 1
+
+
+def test_reader_closed_early_leaves_the_flight_to_the_others():
+    flights, upstream = SingleFlight(), Upstream(["a", "b", "c"])
+    first = flights.stream("k", upstream)
+    second = flights.stream("k", upstream)
+    upstream.release(1)
+    assert next(first) == "a"
+    first.close()
+    upstream.release(2)
+    assert list(second) == ["a", "b", "c"]
+    assert first._flight.subscribers == 0 and not first._flight.cancelled
+
+
+@pytest.mark.parametrize("drop", ["close", "del"])
+def test_reader_never_started_cancels_the_flight(drop):
+    flights, upstream = SingleFlight(), Upstream(["a", "b"])
+    reader = flights.stream("k", upstream)
+    flight = reader._flight
+    if drop == "close":
+        reader.close()
+    else:
+        del reader
+        gc.collect()
+    assert flight.subscribers == 0 and flight.cancelled
+    upstream.release()
+    assert upstream.closed.wait(5)
+
+
+def test_upstream_error_reaches_every_subscriber():
+    flights, upstream = SingleFlight(), Upstream(["a"], error=RuntimeError("upstream failed"))
+    readers = [flights.stream("k", upstream) for _ in range(3)]
+    upstream.release()
+    for reader in readers:
+        with pytest.raises(RuntimeError, match="upstream failed"):
+            list(reader)
+    assert readers[0]._flight.subscribers == 0
+    assert flights.stats()["in_flight"] == 0
@@ -0,0 +1,29 @@
+# tests/test_extractor.py
+import pytest
+
+from extractor import extract
+
+NAME = "Let's start with the basics – what's your full name?"
+PHONE = "Perfect! What's a good phone number where we can reach you?"
+ROLE = "Great! What position are you looking for? What role excites you?"
+LOCATION = "Wonderful! Where are you currently based?"
+
+
+@pytest.mark.parametrize("text, assistant, expected", [
+    ("IP 192.168.100.200", PHONE, {}),
+    ("order id 1234567890123", None, {}),
+    ("9876543210", PHONE, {"Phone": "9876543210"}),
+    ("my phone is 9876543210", None, {"Phone": "9876543210"}),
+    ("415.555.0134", None, {"Phone": "415.555.0134"}),
+    ("I work at Microsoft", NAME, {}),
+    ("I dont know", LOCATION, {}),
+    ("I am Interested in the Data Scientist role", ROLE, {}),
+    ("I'm Fine thanks", NAME, {}),
+    ("Priya Sharma", NAME, {"Name": "Priya Sharma"}),
+    ("My name is john smith", None, {"Name": "John Smith"}),
+    ("i'm priya sharma from Pune, India", None, {"Name": "Priya Sharma", "Location": "Pune, India"}),
+    ("I'm Sam McDonald", None, {"Name": "Sam McDonald"}),
+    ("I mostly use Go and k8s", "What technologies do you work with?", {"Stack": "I mostly use Go and k8s"}),
+])
+def test_extract(text, assistant, expected):
+    assert extract(text, assistant).updates() == expected
@@ -0,0 +1,20 @@
+# tests/test_phase1.py
+import pytest
+
+from phase1 import ACCEPT, EXPERIENCE_VAGUE, FALLBACK, HANDOFF, validate_experience
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("I graduated in 2019 and have 4 years", (ACCEPT, "4")),
+    ("4 years, mostly refreshing legacy apps", (ACCEPT, "4")),
+    ("None of your business", (FALLBACK, EXPERIENCE_VAGUE)),
+    ("five years", (ACCEPT, "5")),
+    ("0", (ACCEPT, "0")),
+    ("None", (ACCEPT, "0")),
+    ("I'm a fresher", (ACCEPT, "0")),
+    ("Fresh graduate, looking for my first job", (ACCEPT, "0")),
+    ("No professional experience yet", (ACCEPT, "0")),
+    ("2 or 3 years", (HANDOFF, None)),
+])
+def test_validate_experience(text, expected):
+    assert validate_experience(text, {}) == expected
@@ -0,0 +1,21 @@
+# tests/test_prompt_builder.py
+import pytest
+
+from prompt_builder import PENDING, PHASE1_FIELDS, PHASE2_AFTER_LLM_TURNS, build_system_prompt
+from prompts import PHASE2_SECTION
+
+
+def candidate(pending):
+    return {f: PENDING if f in pending else "x" for f in PHASE1_FIELDS}
+
+
+@pytest.mark.parametrize("pending, llm_turns, phase2", [
+    (("Role", "Stack"), 0, False),
+    (("Role", "Stack"), PHASE2_AFTER_LLM_TURNS - 1, False),
+    (("Role", "Stack"), PHASE2_AFTER_LLM_TURNS, True),
+    (("Stack",), 0, True),
+    ((), 0, True),
+])
+def test_phase2_section(pending, llm_turns, phase2):
+    prompt = build_system_prompt(candidate(pending), llm_turns=llm_turns).content
+    assert (PHASE2_SECTION in prompt) == phase2
@@ -0,0 +1,158 @@
+# tests/test_scheduler.py
+import threading
+import time
+
+import pytest
+
+import scheduler
+from scheduler import GroqScheduler, Ticket, Withdrawn
+
+
+class FakeTime:
+    # Stands in for the scheduler module's `time`: the buckets refill only when the
+    # test advances the clock, and backoff sleeps are recorded instead of slept.
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class Unavailable(Exception):
+    status_code = 503
+
+
+class BadRequest(Exception):
+    status_code = 400
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(scheduler, "time", fake)
+    return fake
+
+
+def advance(sched, clock, seconds):
+    clock.now += seconds
+    with sched._cond:
+        sched._cond.notify_all()
+
+
+def wait_until(predicate):
+    deadline = time.monotonic() + 5
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def start_acquire(sched, mode, tokens=1, ticket=None, granted=None):
+    outcome = {}
+
+    def run():
+        try:
+            sched.acquire(mode, tokens, ticket)
+            outcome["granted"] = True
+            if granted is not None:
+                granted.append(mode)
+        except Withdrawn:
+            outcome["withdrawn"] = True
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread, outcome
+
+
+def test_waiting_requests_are_granted_by_priority(clock):
+    sched = GroqScheduler(rpm=1, tpm=1_000_000)
+    sched.acquire("screening", 1)  # empties the request bucket
+    granted = []
+    threads = []
+    for n, mode in enumerate(["speculative", "role_insight", "mock", "screening"], 1):
+        threads.append(start_acquire(sched, mode, granted=granted)[0])
+        wait_until(lambda: len(sched._queue) == n)
+    for n in range(1, 5):
+        advance(sched, clock, 60)
+        wait_until(lambda: len(granted) == n)
+    assert granted == ["screening", "mock", "role_insight", "speculative"]
+
+
+def test_empty_buckets_throttle_until_refilled(clock):
+    sched = GroqScheduler(rpm=60, tpm=600)
+    sched.acquire("mock", 500)
+    thread, outcome = start_acquire(sched, "mock", tokens=400)
+    wait_until(lambda: len(sched._queue) == 1)
+    advance(sched, clock, 20)  # 100 + 200 tokens: still short of 400
+    time.sleep(0.05)
+    assert not outcome
+    advance(sched, clock, 10)  # 400
+    thread.join(5)
+    assert outcome == {"granted": True}
+
+
+def test_transient_error_before_the_first_chunk_is_retried(clock):
+    sched = GroqScheduler(rpm=1000, tpm=1_000_000)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise Unavailable()
+        yield from ["a", "b"]
+
+    assert list(sched.stream("screening", 10, factory)) == ["a", "b"]
+    assert len(calls) == 2 and len(clock.sleeps) == 1
+    assert sched.stats()["transient_errors"] == 1
+
+
+def test_error_after_the_first_chunk_is_not_retried(clock):
+    sched = GroqScheduler(rpm=1000, tpm=1_000_000)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        yield "a"
+        raise Unavailable()
+
+    chunks = sched.stream("screening", 10, factory)
+    assert next(chunks) == "a"
+    with pytest.raises(Unavailable):
+        next(chunks)
+    assert len(calls) == 1 and sched.stats()["retries"] == 0
+
+
+def test_non_transient_error_is_not_retried(clock):
+    sched = GroqScheduler(rpm=1000, tpm=1_000_000)
+
+    def factory():
+        raise BadRequest()
+        yield
+
+    with pytest.raises(BadRequest):
+        list(sched.stream("screening", 10, factory))
+    assert sched.stats()["retries"] == 0
+
+
+def test_withdrawn_ticket_leaves_the_queue(clock):
+    sched = GroqScheduler(rpm=1, tpm=1_000_000)
+    sched.acquire("screening", 1)
+    ticket = Ticket()
+    thread, outcome = start_acquire(sched, "speculative", ticket=ticket)
+    wait_until(lambda: len(sched._queue) == 1)
+    assert sched.withdraw(ticket)
+    thread.join(5)
+    assert outcome == {"withdrawn": True} and not sched._queue
+    with pytest.raises(Withdrawn):
+        sched.acquire("speculative", 1, ticket)
+
+
+def test_granted_ticket_cannot_be_withdrawn(clock):
+    sched = GroqScheduler(rpm=10, tpm=1_000_000)
+    ticket = Ticket()
+    sched.acquire("speculative", 1, ticket)
+    assert not sched.withdraw(ticket)
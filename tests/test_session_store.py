@@ -0,0 +1,93 @@
+# tests/test_session_store.py
+import pytest
+
+import session_store
+from session_store import InMemoryRedis, RedisSessionStore, SQLiteSessionStore
+
+SLOW = {"flush_interval": 3600}  # the writer thread never flushes on its own
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def open_store(request, tmp_path):
+    # -> a function returning a new store over the same data, like a restarted replica.
+    if request.param == "sqlite":
+        path = str(tmp_path / "sessions.sqlite3")
+        return lambda: SQLiteSessionStore(path, **SLOW)
+    client = InMemoryRedis()
+    return lambda: RedisSessionStore(client, **SLOW)
+
+
+def fill(store, token="t1", mode="screening"):
+    store.save_meta(token, {"mode": mode})
+    store.append(token, "messages", 0, "ai", "Hi! What's your name?")
+    store.append(token, "messages", 1, "human", "Priya")
+    store.append(token, "mock_messages", 0, "ai", "Question 1")
+
+
+def test_writes_are_buffered_until_flush(open_store):
+    store = open_store()
+    fill(store)
+    assert open_store().load("t1") is None
+    assert store.stats()["pending"] == 4
+    store.flush()
+    assert store.stats()["pending"] == 0 and store.stats()["batches"] == 1
+    assert open_store().load("t1") is not None
+
+
+def test_restore_after_restart(open_store):
+    store = open_store()
+    fill(store)
+    store.flush()
+    session = open_store().load("t1")
+    assert session.meta == {"mode": "screening"}
+    assert session.histories == {
+        "messages": [("ai", "Hi! What's your name?"), ("human", "Priya")],
+        "mock_messages": [("ai", "Question 1")],
+    }
+    assert open_store().load("missing") is None
+
+
+def test_load_sees_pending_writes_and_replays_are_idempotent(open_store):
+    store = open_store()
+    fill(store)
+    store.append("t1", "messages", 1, "human", "Priya")
+    assert store.load("t1").histories["messages"] == [("ai", "Hi! What's your name?"), ("human", "Priya")]
+
+
+def test_failed_write_is_requeued(open_store):
+    store = open_store()
+    write, failures = store._write, [RuntimeError("disk full")] * 2
+
+    def flaky(appends, metas):
+        if failures:
+            raise failures.pop()
+        write(appends, metas)
+
+    store._write = flaky
+    fill(store)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            store.flush()
+    store.save_meta("t1", {"mode": "mock"})  # queued while the write was failing
+    store.flush()
+    session = open_store().load("t1")
+    assert session.meta == {"mode": "mock"}
+    assert len(session.histories["messages"]) == 2
+    stats = store.stats()
+    assert (stats["write_errors"], stats["dropped_rows"], stats["pending"]) == (2, 0, 0)
+
+
+def test_rows_are_dropped_after_the_retry_limit(open_store, monkeypatch):
+    monkeypatch.setattr(session_store, "WRITE_RETRIES", 1)
+    store = open_store()
+
+    def broken(appends, metas):
+        raise RuntimeError("disk full")
+
+    store._write = broken
+    fill(store)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            store.flush()
+    stats = store.stats()
+    assert (stats["write_errors"], stats["dropped_rows"], stats["pending"]) == (2, 4, 0)
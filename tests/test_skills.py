@@ -0,0 +1,35 @@
+# tests/test_skills.py
+import pytest
+
+from skills import normalize_stack, profile_from_roadmap
+
+BULLETED = """- 📋 **Job Description**: Builds and runs backend services.
+- 🛠️ **Required Tech Stack**:
+   - **Languages**: Go, Python
+   - **Infrastructure**: Docker, Kubernetes
+- 🗺️ **Learning Path**:
+   1. Linux and Git, then Prometheus"""
+
+HEADINGS = """### 🛠️ Required Tech Stack
+- **Languages**: Python, SQL
+- **Tools**: Airflow, Spark
+### 🗺️ Learning Path
+- **Beginner**: pandas"""
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("I'd go with the rest of the team, and C is a grade", []),
+    ("Python, Go and Docker; REST APIs, C", ["python", "go", "docker", "rest", "c"]),
+    ("k8s, ReactJS and golang", ["kubernetes", "react", "go"]),
+])
+def test_normalize_stack(text, expected):
+    assert normalize_stack(text) == expected
+
+
+@pytest.mark.parametrize("roadmap, required, optional", [
+    (BULLETED, ("go", "python", "docker", "kubernetes"), ("linux", "git", "prometheus")),
+    (HEADINGS, ("python", "sql", "airflow", "spark"), ("pandas",)),
+])
+def test_profile_from_roadmap(roadmap, required, optional):
+    profile = profile_from_roadmap(roadmap)
+    assert (profile.required, profile.optional) == (required, optional)
@@ -0,0 +1,142 @@
+# tokens.py
+# Local token accounting: prompt sizes for budgets and the scheduler, and per-session
+# token/cost totals. With tiktoken installed, counts use the cl100k_base encoding
+# (close to the Llama 3 tokenizer); without it, or if the encoding can't be loaded
+# (tiktoken downloads it on first use, so an offline host may not have it), roughly
+# 4 characters per token for English text. The encoding is loaded on the first count,
+# not at import, and a failed load is not retried.
+# Counting is cached: each system prompt's text is counted once per process, and each
+# chat message object once, so a turn only counts the messages it appended.
+import os
+import threading
+import weakref
+from functools import lru_cache
+
+from langchain_core.messages import SystemMessage
+
+TOKENIZER = os.getenv("TOKENIZER", "cl100k_base")  # "chars" forces the estimate
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD = 4  # role/separator tokens added per chat message
+STATIC_CACHE_SIZE = 512  # distinct system prompt texts (phase variants, plan sections)
+
+# Groq list prices in USD per million (prompt, completion) tokens.
+PRICES = {
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+}
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if TOKENIZER == "chars":
+        return None
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(TOKENIZER)
+    except Exception:  # not installed, or the encoding file can't be fetched
+        return None
+
+
+def tokenizer_name():
+    return TOKENIZER if _encoding() is not None else "chars"
+
+
+def estimate_tokens(text):
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@lru_cache(maxsize=STATIC_CACHE_SIZE)
+def static_tokens(text):
+    # System prompts are a small set of module-level strings shared by every session.
+    return estimate_tokens(text)
+
+
+_counts = {}  # id(message) -> (weakref, tokens)
+
+
+def message_tokens(message):
+    entry = _counts.get(id(message))
+    if entry is not None and entry[0]() is message:
+        return entry[1]
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    tokens = (static_tokens(content) if isinstance(message, SystemMessage) else estimate_tokens(content)) + MESSAGE_OVERHEAD
+    key = id(message)
+    _counts[key] = (weakref.ref(message, lambda _, key=key: _counts.pop(key, None)), tokens)
+    return tokens
+
+
+def messages_tokens(messages):
+    return sum(message_tokens(m) for m in messages)
+
+
+def clip_text(text, max_tokens):
+    # Rough cut to about max_tokens, for keeping an oversized message in a transcript.
+    limit = max_tokens * CHARS_PER_TOKEN
+    return text if len(text) <= limit else text[:limit].rstrip() + " …"
+
+
+# --- BUDGETS ---
+class PromptTooLarge(ValueError):
+    def __init__(self, tokens, limit):
+        super().__init__(f"Prompt is {tokens} tokens; the limit is {limit}")
+        self.tokens = tokens
+        self.limit = limit
+
+
+def fit(messages, limit):
+    # -> (messages, tokens, dropped). Drops the oldest non-system messages until the
+    # request fits; the leading system messages and the newest message are never
+    # dropped. Raises PromptTooLarge if those alone are over the limit.
+    tokens = messages_tokens(messages)
+    if tokens <= limit:
+        return messages, tokens, 0
+    head = 0
+    while head < len(messages) - 1 and isinstance(messages[head], SystemMessage):
+        head += 1
+    kept = list(messages)
+    dropped = 0
+    while tokens > limit and head < len(kept) - 1:
+        tokens -= message_tokens(kept.pop(head))
+        dropped += 1
+    if tokens > limit:
+        raise PromptTooLarge(tokens, limit)
+    return kept, tokens, dropped
+
+
+# --- PER-SESSION ACCOUNTING ---
+def cost(model, prompt_tokens, completion_tokens):
+    prompt_price, completion_price = PRICES.get(model, (0.0, 0.0))  # e.g. the local fake model
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+class SessionUsage:
+    # Tokens and cost of the LLM calls made for one session, counted locally. Replies
+    # served from a cache cost nothing; a reply shared by coalesced identical requests
+    # is counted for each session that asked. Stored with the session (session_meta).
+    FIELDS = ("calls", "prompt_tokens", "completion_tokens", "cost_usd", "trimmed", "refused")
+
+    def __init__(self, **totals):
+        self._lock = threading.Lock()  # grading and speculation add from worker threads
+        for name in self.FIELDS:
+            setattr(self, name, totals.get(name, 0))
+
+    def add(self, model, prompt_tokens, completion_tokens):
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cost_usd += cost(model, prompt_tokens, completion_tokens)
+
+    def count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def totals(self):
+        with self._lock:
+            totals = {name: getattr(self, name) for name in self.FIELDS}
+        totals["cost_usd"] = round(totals["cost_usd"], 6)
+        return totals